@@ -0,0 +1,159 @@
+from engine.pool import EnginePool
+from engine.registry import RESET, create_engine, get_engine_info
+from utils.metrics import SolverMetrics
+from utils.regression import median
+from typing import Any, Callable, Dict, List
+import argparse
+import csv
+import time
+
+
+def engine_factory(name: str) -> Callable[[int], Any]:
+    """get the function to create the engine
+
+    Args:
+        name (str): name of an engine in the registry
+    Returns:
+        (Callable[[int], Any]): function that takes n and returns an engine
+    """
+    if name.startswith('v6_k'):
+        # v6 with sampled column search, e.g. v6_k64 samples 64 columns at first
+        sample_size = int(name[len('v6_k'):])
+        return lambda n: create_engine('v6', n=n, sample_size=sample_size)
+    if name.startswith('parallel_w'):
+        # the parallel engine with the given number of workers, e.g. parallel_w4
+        workers = int(name[len('parallel_w'):])
+        return lambda n: create_engine('parallel', n=n, workers=workers, min_rows_per_worker=1)
+    if name.startswith('batch_b'):
+        # the batch engine solving the given number of boards at once, e.g. batch_b10000
+        boards = int(name[len('batch_b'):])
+        return lambda n: create_engine('batch', n=n, boards=boards)
+    # unknown engines are rejected here, before any engine is imported
+    get_engine_info(name)
+    return lambda n: create_engine(name, n=n)
+
+
+def reusable(name: str) -> bool:
+    """check if the engines of the name can be reset and reused
+
+    Args:
+        name (str): name of an engine in the registry, or of engine_factory
+    Returns:
+        (bool): True if the engine supports the reset mode
+    """
+    for prefix, base in [('v6_k', 'v6'), ('parallel_w', 'parallel'), ('batch_b', 'batch')]:
+        if name.startswith(prefix):
+            name = base
+    return RESET in get_engine_info(name).modes
+
+
+def benchmark(engine_names: List[str],
+              ns: List[int],
+              repeat: int = 1,
+              metrics: SolverMetrics = None,
+              reuse: bool = False) -> List[Dict[str, Any]]:
+    """measure how long solving problems take time
+
+    Args:
+        engine_names (List[str]): engine names
+        ns (List[int]): lengths of chess board
+        repeat (int): the number of runs for each (engine, n)
+        metrics (SolverMetrics): record each solve if given
+        reuse (bool): reset and reuse one engine over the runs of each (engine, n) if the engine supports it,
+            instead of constructing one per run. the measured duration does not include either
+    Returns:
+        rows (List[Dict[str, Any]]): engine, n, run, duration_seconds, steps, solved, count
+    """
+    rows = []
+    for engine_name in engine_names:
+        factory = engine_factory(engine_name)
+        pool = EnginePool(factory=lambda n, seed: factory(n), max_total_n=max(ns)) if reuse and reusable(engine_name) else None
+        for n in ns:
+            for run in range(repeat):
+                e = factory(n) if pool is None else pool.acquire(n=n)
+                if metrics is not None:
+                    metrics.started.inc(engine=engine_name)
+                start_time = time.perf_counter()
+                boards = e.solve()
+                duration_seconds = time.perf_counter() - start_time
+                count = getattr(e, 'solution_count', None)
+                # engines without has_solution, such as simple, return the boards found
+                solved = count is not None or (e.has_solution() if hasattr(e, 'has_solution') else bool(boards))
+                if metrics is not None:
+                    metrics.record(engine=e, engine_name=engine_name, n=n, duration_seconds=duration_seconds, solved=solved)
+                rows.append({
+                    'engine': engine_name,
+                    'n': n,
+                    'run': run,
+                    'duration_seconds': duration_seconds,
+                    'steps': getattr(e, 'debug_steps', 0),
+                    'solved': solved,
+                    'count': count,
+                })
+                throughput = f', boards_per_second: {e.debug_boards_per_second:.0f}' if hasattr(e, 'debug_boards_per_second') else ''
+                print(f'{engine_name} n: {n} run: {run} duration_seconds: {duration_seconds}, steps: {rows[-1]["steps"]}{throughput}')
+                if pool is not None:
+                    pool.release(e)
+    return rows
+
+
+def speedups(rows: List[Dict[str, Any]], baseline: str) -> List[Dict[str, Any]]:
+    """compare the median duration of each (engine, n) with the baseline engine
+
+    Args:
+        rows (List[Dict[str, Any]]): rows of benchmark
+        baseline (str): engine name of the baseline, e.g. v6
+    Returns:
+        (List[Dict[str, Any]]): engine, n, median_seconds and speedup (median of baseline / median of engine)
+    """
+    durations = {}
+    for row in rows:
+        durations.setdefault((row['engine'], row['n']), []).append(row['duration_seconds'])
+    results = []
+    for (engine_name, n), values in durations.items():
+        if engine_name == baseline or (baseline, n) not in durations:
+            continue
+        median_seconds = median(values)
+        results.append({
+            'engine': engine_name,
+            'n': n,
+            'median_seconds': median_seconds,
+            'speedup': median(durations[(baseline, n)]) / median_seconds if median_seconds > 0 else float('inf'),
+        })
+    return results
+
+
+def write_csv(rows: List[Dict[str, Any]], path: str) -> None:
+    """write rows as CSV, which can be read by pandas.read_csv in the notebook
+
+    Args:
+        rows (List[Dict[str, Any]]): rows
+        path (str): path of the output file
+    """
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['engine', 'n', 'run', 'duration_seconds', 'steps', 'solved', 'count'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmark engines')
+    parser.add_argument('--engine', nargs='+', default=['v6'], help='engine names')
+    parser.add_argument('--n', type=int, nargs='+', default=[8], help='lengths of chess board')
+    parser.add_argument('--repeat', type=int, default=1, help='the number of runs for each (engine, n)')
+    parser.add_argument('--output', default=None, help='write results to the CSV file if given')
+    parser.add_argument('--metrics', default=None, help='write solver metrics in the Prometheus text format to the file if given')
+    parser.add_argument('--reuse', action='store_true', help='reset and reuse engines between runs instead of constructing them')
+    parser.add_argument('--speedup-baseline', default=None, help='report speedups against this engine, e.g. v6')
+    args = parser.parse_args()
+
+    metrics = SolverMetrics() if args.metrics is not None else None
+    rows = benchmark(engine_names=args.engine, ns=args.n, repeat=args.repeat, metrics=metrics, reuse=args.reuse)
+    if args.speedup_baseline is not None:
+        for result in speedups(rows=rows, baseline=args.speedup_baseline):
+            print(f'{result["engine"]} n: {result["n"]} median_seconds: {result["median_seconds"]}, '
+                  f'speedup against {args.speedup_baseline}: {result["speedup"]:.2f}')
+    if args.output is not None:
+        write_csv(rows=rows, path=args.output)
+    if metrics is not None:
+        metrics.registry.write(path=args.metrics)
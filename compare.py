@@ -0,0 +1,23 @@
+from utils.regression import compare, format_report, load_results
+import argparse
+import sys
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='compare benchmark results with a baseline and fail on regressions')
+    parser.add_argument('baseline', help='CSV of the baseline, written by benchmark.py or in analysis/')
+    parser.add_argument('candidate', help='CSV of the candidate, written by benchmark.py or in analysis/')
+    parser.add_argument('--engine', default=None,
+                        help='compare only this engine. also the engine name of CSVs without the engine column')
+    parser.add_argument('--n', type=int, default=None, help='n of CSVs without the n column. Default the row number')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed relative increase of the median')
+    parser.add_argument('--resamples', type=int, default=1000, help='the number of bootstrap resamples')
+    args = parser.parse_args()
+
+    baseline = load_results(path=args.baseline, engine=args.engine, n=args.n)
+    candidate = load_results(path=args.candidate, engine=args.engine, n=args.n)
+    comparisons = compare(baseline=baseline, candidate=candidate, threshold=args.threshold, resamples=args.resamples)
+    if len(comparisons) == 0:
+        print('no (engine, n) found in both results. --engine may be needed for CSVs without the engine column')
+        sys.exit(2)
+    print(format_report(comparisons=comparisons))
+    sys.exit(1 if any(c.regressed for c in comparisons) else 0)
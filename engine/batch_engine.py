@@ -0,0 +1,232 @@
+from models.model import Engine, SolveResult
+from typing import List, Tuple
+import numpy as np
+import time
+
+
+class BatchMinConflictsEngine(Engine):
+    """solve many independent boards of the same n by min-conflicts, one vectorized step for all boards at once
+
+    Up to `batch_size` boards are held as rows of 2-D NumPy arrays: the column of the queen on each row,
+    and the number of queens on each column and diagonal of each board. Each iteration computes
+    the conflicts of every queen of every board, retires the solved boards and the ones that have used
+    up max_steps through a mask, refills the batch with new boards, and moves one conflicted queen of
+    each remaining board to its best column. Refilling keeps the batch full, so a few slow boards
+    do not leave the vectorized steps running on almost nothing.
+
+    Boards start from random permutations, which have no column conflicts. With probability `noise`
+    a queen moves to a random column instead of the best one, which gets boards off plateaus.
+    """
+
+    def __init__(self,
+                 n: int,
+                 boards: int = 1,
+                 seed: int = None,
+                 noise: float = 0.05,
+                 batch_size: int = 4096,
+                 max_steps: int = None) -> None:
+        """initialize instance
+
+        Args:
+            n (int): length of chess board
+            boards (int): the number of boards to solve
+            seed (int): seed of the random generator. the results are reproducible if given
+            noise (float): probability of moving a queen to a random column instead of the best one
+            batch_size (int): the maximum number of boards advanced together, which bounds the memory
+            max_steps (int): the maximum number of steps of each board. Default n * 100 as in the v6 engine
+        """
+        if boards < 1:
+            raise ValueError(f'boards must be positive: {boards}')
+        if batch_size < 1:
+            raise ValueError(f'batch_size must be positive: {batch_size}')
+        self.n: int = n
+        self.boards: int = boards
+        self.seed: int = seed
+        self.noise: float = noise
+        self.batch_size: int = batch_size
+        self.max_steps: int = max_steps if max_steps is not None else n * 100
+        self.random: np.random.Generator = np.random.default_rng(seed)
+
+        # results of all boards after solve: columns[board][row], steps and whether solved
+        self.solutions: np.ndarray = np.empty((0, n), dtype=np.int32)
+        self.steps: np.ndarray = np.empty(0, dtype=np.int64)
+        self.solved: np.ndarray = np.empty(0, dtype=bool)
+
+        # variables for debug
+        self.debug_duration_seconds: float = 0
+        self.debug_steps: int = 0
+        self.debug_iterations: int = 0
+        self.debug_boards_per_second: float = 0
+
+    def solve(self, enable_print: bool = False) -> SolveResult:
+        """solve all boards
+
+        Args:
+            enable_print (bool): build the board of the result now if True, otherwise it is built on access
+        Returns:
+            result (SolveResult): the first board, so that a batch of one works like the other engines.
+                all boards are in solutions, steps and solved, or in results()
+        """
+        start_time = time.time()
+        n = self.n
+        self.solutions = np.empty((self.boards, n), dtype=np.int32)
+        self.steps = np.full(self.boards, self.max_steps, dtype=np.int64)
+        self.solved = np.zeros(self.boards, dtype=bool)
+
+        # state of the boards in the batch. index is the number of each board in the results
+        index = np.empty(0, dtype=np.int64)
+        board_steps = np.empty(0, dtype=np.int64)
+        columns = np.empty((0, n), dtype=np.intp)
+        column_counts = np.empty((0, n), dtype=np.int32)
+        diag_up_counts = np.empty((0, max(2 * n - 1, 0)), dtype=np.int32)
+        diag_down_counts = np.empty((0, max(2 * n - 1, 0)), dtype=np.int32)
+
+        rows = np.arange(n)
+        next_board = 0
+        iterations = 0
+        while True:
+            # refill the batch with new boards
+            count = min(self.batch_size - len(index), self.boards - next_board)
+            if count > 0:
+                new_columns, new_column_counts, new_diag_up_counts, new_diag_down_counts = self.new_boards(count=count)
+                index = np.concatenate([index, np.arange(next_board, next_board + count)])
+                board_steps = np.concatenate([board_steps, np.zeros(count, dtype=np.int64)])
+                columns = np.concatenate([columns, new_columns])
+                column_counts = np.concatenate([column_counts, new_column_counts])
+                diag_up_counts = np.concatenate([diag_up_counts, new_diag_up_counts])
+                diag_down_counts = np.concatenate([diag_down_counts, new_diag_down_counts])
+                next_board += count
+            if len(index) == 0:
+                break
+
+            # conflicts of each queen, excluding the queen itself
+            b = np.arange(len(index))[:, None]
+            conflicted = (column_counts[b, columns] + diag_up_counts[b, rows + columns]
+                          + diag_down_counts[b, rows - columns + (n - 1)] - 3) > 0
+            solved = ~conflicted.any(axis=1)
+
+            # retire solved boards and boards out of steps through the mask
+            retired = solved | (board_steps >= self.max_steps)
+            if retired.any():
+                done = index[retired]
+                self.solutions[done] = columns[retired]
+                self.steps[done] = board_steps[retired]
+                self.solved[done] = solved[retired]
+                kept = ~retired
+                index = index[kept]
+                board_steps = board_steps[kept]
+                columns = columns[kept]
+                column_counts = column_counts[kept]
+                diag_up_counts = diag_up_counts[kept]
+                diag_down_counts = diag_down_counts[kept]
+                conflicted = conflicted[kept]
+                if len(index) == 0:
+                    continue
+
+            # a random conflicted row of each board, whose score is at least 1
+            a = np.arange(len(index))
+            row = np.argmax(conflicted + self.random.random(conflicted.shape), axis=1)
+            current = columns[a, row]
+
+            # conflicts of the queen of the row on each column. the queen itself is counted on its own column
+            counts = (column_counts + diag_up_counts[a[:, None], row[:, None] + rows]
+                      + diag_down_counts[a[:, None], row[:, None] - rows + (n - 1)])
+            counts[a, current] -= 3
+            # counts are integers, so adding [0, 1) breaks ties randomly
+            best = np.argmin(counts + self.random.random(counts.shape), axis=1)
+            after = np.where(self.random.random(len(a)) < self.noise, self.random.integers(0, n, len(a)), best)
+
+            # move the queen and update counters. each board changes one item of each array, so no item is updated twice
+            column_counts[a, current] -= 1
+            diag_up_counts[a, row + current] -= 1
+            diag_down_counts[a, row - current + (n - 1)] -= 1
+            columns[a, row] = after
+            column_counts[a, after] += 1
+            diag_up_counts[a, row + after] += 1
+            diag_down_counts[a, row - after + (n - 1)] += 1
+            board_steps += 1
+            iterations += 1
+
+        self.debug_duration_seconds = time.time() - start_time
+        self.debug_steps = int(self.steps.sum())
+        self.debug_iterations = iterations
+        self.debug_boards_per_second = self.boards / self.debug_duration_seconds if self.debug_duration_seconds > 0 else 0
+        result = self.result(board=0)
+        if enable_print:
+            result.to_board()
+        return result
+
+    def reset(self, seed: int = None) -> None:
+        """forget the results and reseed, so that the engine can solve a new set of boards
+
+        Args:
+            seed (int): seed of the random generator. the results are reproducible if given
+        """
+        self.seed = seed
+        self.random = np.random.default_rng(seed)
+        self.solutions = np.empty((0, self.n), dtype=np.int32)
+        self.steps = np.empty(0, dtype=np.int64)
+        self.solved = np.empty(0, dtype=bool)
+        self.debug_duration_seconds = 0
+        self.debug_steps = 0
+        self.debug_iterations = 0
+        self.debug_boards_per_second = 0
+
+    def new_boards(self, count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """create boards of random permutations and their counters
+
+        Args:
+            count (int): the number of boards
+        Returns:
+            columns (np.ndarray): column of the queen on each row of each board
+            column_counts (np.ndarray): the number of queens on each column
+            diag_up_counts (np.ndarray): the number of queens on each diagonal of row + column
+            diag_down_counts (np.ndarray): the number of queens on each diagonal of row - column + n - 1
+        """
+        n = self.n
+        lines = max(2 * n - 1, 0)
+        columns = np.argsort(self.random.random((count, n)), axis=1)
+        rows = np.arange(n)
+        # the line of each queen offset by its board, so a single bincount counts all boards
+        offsets = np.arange(count)[:, None] * lines
+        diag_up_counts = np.bincount((offsets + rows + columns).ravel(), minlength=count * lines).reshape(count, lines)
+        diag_down_counts = np.bincount((offsets + rows - columns + (n - 1)).ravel(), minlength=count * lines).reshape(count, lines)
+        return (columns, np.ones((count, n), dtype=np.int32),
+                diag_up_counts.astype(np.int32), diag_down_counts.astype(np.int32))
+
+    def result(self, board: int) -> SolveResult:
+        """get the result of the board
+
+        Args:
+            board (int): number of the board
+        Returns:
+            (SolveResult): result
+        """
+        return SolveResult(n=self.n, columns=self.solutions[board].tolist(), steps=int(self.steps[board]),
+                           duration_seconds=self.debug_duration_seconds, seed=self.seed,
+                           conflicts=0 if self.solved[board] else None)
+
+    def results(self) -> List[SolveResult]:
+        """get the results of all boards
+
+        Returns:
+            (List[SolveResult]): results in the order of boards
+        """
+        return [self.result(board=board) for board in range(len(self.solved))]
+
+    @property
+    def columns(self) -> List[int]:
+        """the columns of the first board, as the engines of a single board have
+
+        Returns:
+            (List[int]): columns[row] is the column of the queen
+        """
+        return self.solutions[0].tolist() if len(self.solutions) != 0 else []
+
+    def has_solution(self) -> bool:
+        """check if all boards are solved
+
+        Returns:
+            (bool): True if every board is a solution
+        """
+        return len(self.solved) == self.boards and bool(self.solved.all())
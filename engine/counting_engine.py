@@ -0,0 +1,215 @@
+from models.model import Engine, Board
+from typing import List, Tuple
+import numpy as np
+import time
+
+# population count of uint64 arrays. numpy >= 2.0 has it built in
+if hasattr(np, 'bitwise_count'):
+    popcount = np.bitwise_count
+else:
+    def popcount(x: np.ndarray) -> np.ndarray:
+        """count bits of each item
+
+        Args:
+            x (np.ndarray): uint64 array
+        Returns:
+            (np.ndarray): the number of bits set in each item
+        """
+        x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+        x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+        x = (x + (x >> np.uint64(4))) & np.uint64(0x0f0f0f0f0f0f0f0f)
+        return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+class CountingEngine(Engine):
+    """count all solutions by recursive backtracking over bitmasks
+
+    Occupied columns and diagonals of the partial board are kept as bits of integers,
+    so the columns available on the next row are given by a few bitwise operations.
+    """
+
+    def __init__(self, n: int) -> None:
+        """initialize instance
+
+        Args:
+            n (int): length of chess board
+        """
+        self.n: int = n
+        self.mask: int = (1 << n) - 1
+        self.solution_count: int = 0
+
+        # variables for debug
+        self.debug_duration_seconds: float = 0
+
+    def solve(self) -> List[Board]:
+        """count solutions
+
+        Returns:
+            boards (List[Board]): always empty. the number of solutions is stored in solution_count
+        """
+        start_time = time.time()
+        self.solution_count = self.count()
+        self.debug_duration_seconds = time.time() - start_time
+        return []
+
+    def count(self) -> int:
+        """count solutions using the left-right symmetry of the board
+
+        Returns:
+            (int): the number of solutions
+        """
+        if self.n == 0:
+            return 1
+        half = 0
+        for column in range(self.n // 2):
+            half += self.count_from(*self.first_row(column=column))
+        middle = 0
+        if self.n % 2 == 1:
+            middle = self.count_from(*self.first_row(column=self.n // 2))
+        return 2 * half + middle
+
+    def first_row(self, column: int) -> Tuple[int, int, int, int]:
+        """get the masks after placing a queen on the first row
+
+        Args:
+            column (int): column of the queen on the first row
+        Returns:
+            depth (int): 1
+            cols (int): occupied columns
+            ld (int): diagonals attacking the next row from the right
+            rd (int): diagonals attacking the next row from the left
+        """
+        bit = 1 << column
+        return 1, bit, (bit << 1) & self.mask, bit >> 1
+
+    def count_from(self, depth: int, cols: int, ld: int, rd: int) -> int:
+        """count solutions below the partial board
+
+        Args:
+            depth (int): the number of rows already filled
+            cols (int): occupied columns
+            ld (int): diagonals attacking the next row from the right
+            rd (int): diagonals attacking the next row from the left
+        Returns:
+            (int): the number of solutions
+        """
+        if depth == self.n:
+            return 1
+        count = 0
+        available = ~(cols | ld | rd) & self.mask
+        while available:
+            bit = available & -available
+            available ^= bit
+            count += self.count_from(depth + 1, cols | bit, ((ld | bit) << 1) & self.mask, (rd | bit) >> 1)
+        return count
+
+
+class NumpyCountingEngine(CountingEngine):
+    """count all solutions advancing many partial boards in lockstep
+
+    A frontier of partial boards at the same depth is kept as NumPy arrays of masks and
+    expanded to the next depth with vectorized bitwise operations. Frontiers are kept on
+    an explicit stack and split into batches, so the memory is bounded and the Python
+    overhead is amortized over the batch.
+    """
+
+    def __init__(self, n: int, batch_size: int = 1 << 16) -> None:
+        """initialize instance
+
+        Args:
+            n (int): length of chess board, up to 64
+            batch_size (int): the maximum number of partial boards expanded at once
+        """
+        if n > 64:
+            raise ValueError(f'n must be up to 64: {n}')
+        super().__init__(n=n)
+        self.batch_size: int = batch_size
+
+        # variables for debug
+        self.debug_expanded_boards: int = 0
+
+    def count(self) -> int:
+        """count solutions using the left-right symmetry of the board
+
+        Returns:
+            (int): the number of solutions
+        """
+        if self.n == 0:
+            return 1
+        half_columns = [column for column in range(self.n // 2)]
+        half = self.count_frontier(*self.first_rows(columns=half_columns))
+        middle = 0
+        if self.n % 2 == 1:
+            middle = self.count_frontier(*self.first_rows(columns=[self.n // 2]))
+        return 2 * half + middle
+
+    def first_rows(self, columns: List[int]) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        """get the frontier after placing a queen on the first row
+
+        Args:
+            columns (List[int]): columns of the queen on the first row
+        Returns:
+            depth (int): 1
+            cols (np.ndarray): occupied columns of each board
+            ld (np.ndarray): diagonals attacking the next row from the right
+            rd (np.ndarray): diagonals attacking the next row from the left
+        """
+        bits = np.left_shift(np.uint64(1), np.array(columns, dtype=np.uint64))
+        mask = np.uint64(self.mask)
+        return 1, bits, (bits << np.uint64(1)) & mask, bits >> np.uint64(1)
+
+    def count_frontier(self, depth: int, cols: np.ndarray, ld: np.ndarray, rd: np.ndarray) -> int:
+        """count solutions below the partial boards
+
+        Args:
+            depth (int): the number of rows already filled, which is common to all boards
+            cols (np.ndarray): occupied columns of each board
+            ld (np.ndarray): diagonals attacking the next row from the right
+            rd (np.ndarray): diagonals attacking the next row from the left
+        Returns:
+            (int): the number of solutions
+        """
+        mask = np.uint64(self.mask)
+        one = np.uint64(1)
+        count = 0
+
+        # explicit stack of frontiers instead of recursion
+        stack = [(depth, cols, ld, rd)]
+        while len(stack) != 0:
+            depth, cols, ld, rd = stack.pop()
+            if len(cols) > self.batch_size:
+                for start in range(0, len(cols), self.batch_size):
+                    end = start + self.batch_size
+                    stack.append((depth, cols[start:end], ld[start:end], rd[start:end]))
+                continue
+            self.debug_expanded_boards += len(cols)
+
+            available = ~(cols | ld | rd) & mask
+            if depth == self.n:
+                count += len(cols)
+                continue
+            if depth == self.n - 1:
+                # every available column on the last row is a solution
+                count += int(popcount(available).sum())
+                continue
+
+            # expand each board by taking the lowest available bit until no bit remains
+            children_cols, children_ld, children_rd = [], [], []
+            while True:
+                remaining = available != 0
+                if not remaining.all():
+                    available = available[remaining]
+                    cols, ld, rd = cols[remaining], ld[remaining], rd[remaining]
+                if len(available) == 0:
+                    break
+                bit = available & (~available + one)
+                available = available ^ bit
+                children_cols.append(cols | bit)
+                children_ld.append(((ld | bit) << one) & mask)
+                children_rd.append((rd | bit) >> one)
+            if len(children_cols) != 0:
+                stack.append((depth + 1,
+                              np.concatenate(children_cols),
+                              np.concatenate(children_ld),
+                              np.concatenate(children_rd)))
+        return count
@@ -0,0 +1,253 @@
+from models.model import Engine, SolveResult
+from typing import List, Tuple
+import random
+import time
+
+
+class DFSEngine(Engine):
+    """find a solution by depth-first search with MRV and forward checking
+
+    The domain of each row (columns still legal for the queen on the row) is kept as a bitset.
+    On each node, the unassigned row with the fewest legal columns is chosen (MRV), and the
+    domains of the other rows are narrowed right after the assignment (forward checking).
+    Changes of domains are recorded on a trail, so undo only restores what has been changed.
+
+    Columns are tried from the center by default. Ordering them by how few columns they remove
+    from the other rows (LCV) is also available, but it costs O(n) per column and was slower
+    for n up to 200. The search is iterative and restarted with a growing node limit and
+    slightly different tie-breaks to cut heavy tails. The tie-breaks of each attempt are derived
+    from the attempt number, so the search is deterministic.
+    """
+    CENTER = 'center'
+    LCV = 'lcv'
+
+    def __init__(self, n: int, value_order: str = CENTER) -> None:
+        """initialize instance
+
+        Args:
+            n (int): length of chess board
+            value_order (str): order of columns tried on a row, CENTER or LCV
+        """
+        if value_order not in [DFSEngine.CENTER, DFSEngine.LCV]:
+            raise ValueError(f'unknown value order: {value_order}')
+        self.n: int = n
+        self.mask: int = (1 << n) - 1
+        self.value_order: str = value_order
+
+        # priority to break ties of rows on MRV and of columns. the smaller, the earlier
+        self.row_priority: List[float] = []
+        self.column_priority: List[float] = []
+
+        # the maximum number of nodes of the current attempt
+        self.node_limit: int = 0
+
+        # bitset of legal columns for each row
+        self.domains: List[int] = [self.mask for _ in range(self.n)]
+        # column of the queen on each row. -1 if not assigned
+        self.columns: List[int] = [-1 for _ in range(self.n)]
+        # (row, previous domain) for each change of domains
+        self.trail: List[Tuple[int, int]] = []
+        self.unassigned: int = self.n
+
+        # variables for debug
+        self.debug_duration_seconds: float = 0
+        self.debug_nodes: int = 0
+        self.debug_backtracks: int = 0
+        self.debug_restarts: int = 0
+
+    def solve(self) -> SolveResult:
+        """solve problem
+
+        Returns:
+            result (SolveResult): the solution, which also works as the list that has the solution board.
+                no row has a queen if there is no solution
+        """
+        start_time = time.time()
+        self.restart_search()
+        self.debug_duration_seconds = time.time() - start_time
+        return SolveResult(n=self.n, columns=self.columns, steps=self.debug_nodes, duration_seconds=self.debug_duration_seconds)
+
+    def has_solution(self) -> bool:
+        """check if the queens on the board are a solution
+
+        Returns:
+            (bool): True if all rows have a queen
+        """
+        return self.unassigned == 0
+
+    def restart_search(self, initial_node_limit: int = None, growth: float = 1.5) -> bool:
+        """repeat search with a growing node limit until it completes
+
+        Args:
+            initial_node_limit (int): the node limit of the first attempt. Default 2n
+            growth (float): the node limit is multiplied by it on each restart
+        Returns:
+            (bool): True if a solution is found, then it is stored in columns
+        """
+        node_limit = initial_node_limit if initial_node_limit is not None else max(2 * self.n, 16)
+        attempt = 0
+        while True:
+            self.reset(attempt=attempt, node_limit=node_limit)
+            result = self.search()
+            if result is not None:
+                return result
+            attempt += 1
+            self.debug_restarts += 1
+            node_limit = max(node_limit + 1, int(node_limit * growth))
+
+    def reset(self, attempt: int, node_limit: int) -> None:
+        """clear the board and set tie-breaks for the attempt
+
+        Args:
+            attempt (int): the number of the attempt. tie-breaks are perturbed from the second attempt
+            node_limit (int): the maximum number of nodes of the attempt
+        """
+        self.domains = [self.mask for _ in range(self.n)]
+        self.columns = [-1 for _ in range(self.n)]
+        self.trail = []
+        self.unassigned = self.n
+        self.node_limit = self.debug_nodes + node_limit
+
+        # rows and columns near the center first
+        center = (self.n - 1) / 2
+        self.row_priority = [abs(i - center) for i in range(self.n)]
+        self.column_priority = [abs(i - center) for i in range(self.n)]
+        if attempt != 0:
+            r = random.Random(attempt)
+            self.row_priority = [p + r.random() * self.n / 4 for p in self.row_priority]
+            self.column_priority = [p + r.random() * self.n / 4 for p in self.column_priority]
+
+    def search(self) -> bool:
+        """search a solution within the node limit
+
+        Returns:
+            (bool): True if a solution is found, then it is stored in columns. False if there is no solution.
+                None if the node limit is reached
+        """
+        if self.n == 0:
+            return True
+
+        # explicit stack of [row, ordered columns, index of the next column, length of trail]
+        row = self.select_row()
+        stack = [[row, self.order_columns(row=row), 0, len(self.trail)]]
+        while len(stack) != 0:
+            frame = stack[-1]
+            row, columns, i, mark = frame
+
+            # undo the previous assignment on this row
+            if self.columns[row] != -1:
+                self.unassign(row=row, mark=mark)
+
+            if i == len(columns):
+                self.debug_backtracks += 1
+                stack.pop()
+                continue
+            frame[2] = i + 1
+
+            self.debug_nodes += 1
+            if self.debug_nodes > self.node_limit:
+                return None
+            if not self.assign(row=row, column=columns[i]):
+                continue
+            if self.unassigned == 0:
+                return True
+
+            next_row = self.select_row()
+            stack.append([next_row, self.order_columns(row=next_row), 0, len(self.trail)])
+        return False
+
+    def select_row(self) -> int:
+        """choose the unassigned row with the fewest legal columns (MRV)
+
+        Returns:
+            (int): row
+        """
+        selected_row = -1
+        min_key = (self.n + 1, 0)
+        for row in range(self.n):
+            if self.columns[row] != -1:
+                continue
+            key = (bin(self.domains[row]).count('1'), self.row_priority[row])
+            if key < min_key:
+                selected_row = row
+                min_key = key
+        return selected_row
+
+    def order_columns(self, row: int) -> List[int]:
+        """order legal columns of the row
+
+        Args:
+            row (int): row
+        Returns:
+            (List[int]): columns in the order to be tried
+        """
+        domain = self.domains[row]
+        columns = [column for column in range(self.n) if domain >> column & 1]
+        if len(columns) <= 1:
+            return columns
+        if self.value_order == DFSEngine.CENTER:
+            return sorted(columns, key=lambda column: self.column_priority[column])
+
+        # LCV: the least number of columns removed from the other rows first
+        others = [(r, self.domains[r]) for r in range(self.n) if r != row and self.columns[r] == -1]
+        costs = []
+        for column in columns:
+            cost = 0
+            for r, d in others:
+                cost += bin(d & self.attacks(row=row, column=column, target_row=r)).count('1')
+            costs.append((cost, self.column_priority[column], column))
+        costs.sort()
+        return [column for _, _, column in costs]
+
+    def attacks(self, row: int, column: int, target_row: int) -> int:
+        """get columns on the target row attacked by the queen
+
+        Args:
+            row (int): row of the queen
+            column (int): column of the queen
+            target_row (int): row to be checked
+        Returns:
+            (int): bitset of attacked columns
+        """
+        distance = abs(target_row - row)
+        bits = 1 << column
+        bits |= (1 << (column + distance)) & self.mask
+        if column - distance >= 0:
+            bits |= 1 << (column - distance)
+        return bits
+
+    def assign(self, row: int, column: int) -> bool:
+        """place the queen and narrow the domains of unassigned rows (forward checking)
+
+        Args:
+            row (int): row
+            column (int): column
+        Returns:
+            (bool): False if some row has no legal column anymore
+        """
+        self.columns[row] = column
+        self.unassigned -= 1
+        for r in range(self.n):
+            if self.columns[r] != -1:
+                continue
+            domain = self.domains[r]
+            narrowed = domain & ~self.attacks(row=row, column=column, target_row=r)
+            if narrowed != domain:
+                self.trail.append((r, domain))
+                self.domains[r] = narrowed
+                if narrowed == 0:
+                    return False
+        return True
+
+    def unassign(self, row: int, mark: int) -> None:
+        """remove the queen and restore domains changed after the mark of the trail
+
+        Args:
+            row (int): row
+            mark (int): length of the trail before the assignment
+        """
+        while len(self.trail) > mark:
+            r, domain = self.trail.pop()
+            self.domains[r] = domain
+        self.columns[row] = -1
+        self.unassigned += 1
@@ -1,7 +1,8 @@
-from models.model import Engine, Board
+from models.model import Engine, Board, SolveResult
+from utils.random_stream import RandomStream
 from utils.util import stop_watch
-from typing import Dict, List, Tuple, Set
-import random
+from typing import Dict, List, Tuple
+import numpy as np
 import datetime
 
 
@@ -13,16 +14,19 @@ class MinConflictsEngine(Engine):
     @stop_watch
     def __init__(self,
                  n: int,
-                 version: int = 1) -> None:
+                 version: int = 1,
+                 seed: int = None) -> None:
         """initialize instance
 
         Args:
             n (int): length of chess board
             max_steps (int): the maximum number of attempts within searching
             version (int): version
+            seed (int): seed of the random stream. the search is reproducible if given
         """
         self.n: int = n
         self.version: int = version
+        self.random: RandomStream = RandomStream(seed=seed)
 
         # constant
         self.all_list: List[int] = [i for i in range(self.n)]
@@ -35,12 +39,13 @@ class MinConflictsEngine(Engine):
         self.random_ratio = max(self.n, 100)
 
         # variables to manage conflicts count, which makes the time complexity O(n)
-        self.conflicts_table: List[List[int]] = [[0 for _ in range(self.n)] for _ in range(self.n)]
-        # TODO: いらんかも
-        self.conflicts_dict: Dict[int, Dict[int, Set[int]]] = {row: {attaks: set() for attaks in range(0, 7)} for row in range(self.n)}
-        for row in self.conflicts_dict.keys():
-            self.conflicts_dict[row][0] = {column for column in range(self.n)}
-        
+        # conflicts count is from 0 to 6 (two sides of three lines), so int8 is enough
+        self.conflicts_table: np.ndarray = np.zeros((self.n, self.n), dtype=np.int8)
+        # flat view of conflicts_table. a column or a diagonal is a strided slice of it
+        self.conflicts_flat: np.ndarray = self.conflicts_table.reshape(-1)
+        # queens on the board in the same layout as conflicts_flat, to find the nearest queens on a line
+        self.queens_flat: np.ndarray = np.zeros(self.n * self.n, dtype=np.bool_)
+
         # from version 6
         self.conflicts_num_dict: Dict[str, Dict[int, int]] = {MinConflictsEngine.COLUMN: {}, MinConflictsEngine.DIAG_UP: {}, MinConflictsEngine.DIAG_DOWN: {}}
         for column in range(self.n):
@@ -60,11 +65,11 @@ class MinConflictsEngine(Engine):
         self.debug_steps: int = 0
 
     @stop_watch
-    def solve(self) -> List[Board]:
+    def solve(self) -> SolveResult:
         """solve problem
 
         Returns:
-            boards (List[Boards]): the list of result boards
+            result (SolveResult): the current placement, which also works as the list of the result board
         """
         # for debug
         self.debug_start_time = datetime.datetime.now()
@@ -78,7 +83,7 @@ class MinConflictsEngine(Engine):
             # return the current board if it's already had a solution
             if self.has_solution():
                 self.debug_steps = step
-                return self.convert_to_boards()
+                return self.convert_to_result()
 
             # choose a unit that conflicts to the other one
             unit = self.choose_one_conflicts()
@@ -91,7 +96,7 @@ class MinConflictsEngine(Engine):
 
         # return the current board if step reaches max_steps
         self.debug_steps = self.max_steps
-        return self.convert_to_boards()
+        return self.convert_to_result()
 
     @stop_watch
     def choose_one_conflicts(self) -> Tuple[int, int]:
@@ -104,7 +109,8 @@ class MinConflictsEngine(Engine):
         rows = [i for i in range(self.n)]
         while len(rows) != 0:
             # randomly choose one from rows
-            row_num = random.choice(rows)
+            i = self.random.randrange(len(rows))
+            row_num = rows[i]
 
             # find column where a queen exists
             column_num = self.current_state[row_num].index(True)
@@ -116,8 +122,9 @@ class MinConflictsEngine(Engine):
             if conflicts_count != 0:
                 return (row_num, column_num)
 
-            # remove row_num from rows
-            rows.remove(row_num)
+            # remove row_num from rows by swapping it with the last one
+            rows[i] = rows[-1]
+            rows.pop()
 
     @stop_watch
     def search_next_unit(self, unit: Tuple[int, int], randomly: bool = True) -> Tuple[int, int]:
@@ -135,7 +142,7 @@ class MinConflictsEngine(Engine):
         if self.version >= 2 and randomly:
             # break ties randomly
             if self.break_ties_randomly():
-                column = random.randint(0, self.n - 1)
+                column = self.random.randint(0, self.n - 1)
                 return (given_row, column)
 
         if self.version < 5:
@@ -158,17 +165,18 @@ class MinConflictsEngine(Engine):
                 if current_count < min_count:
                     count_list.append((column, current_count))
                     min_count = current_count
-            random.shuffle(count_list)
-            for column, c in count_list:
+            # scan from a random offset instead of shuffling
+            offset = self.random.randrange(len(count_list)) if len(count_list) != 0 else 0
+            for i in range(len(count_list)):
+                column, c = count_list[(offset + i) % len(count_list)]
                 if c == min_count:
                     return (given_row, column)
             
         elif self.version >= 5:
-            min_conflict_count_ver5 = min(self.conflicts_table[given_row])
-            random.shuffle(self.all_list)
-            for column in self.all_list:
-                if self.conflicts_table[given_row][column] == min_conflict_count_ver5:
-                    return (given_row, column)
+            # randomly choose one from columns with the minimum conflicts count
+            conflicts_row = self.conflicts_table[given_row]
+            columns = np.flatnonzero(conflicts_row == conflicts_row.min())
+            return (given_row, int(columns[self.random.randrange(len(columns))]))
             # for i in range(self.n):
             #     column = (given_column + i) % self.n
             #     if self.conflicts_table[given_row][column] == min_conflict_count_ver5:
@@ -193,7 +201,7 @@ class MinConflictsEngine(Engine):
                 # choose arbitrarily one from the list in which items has conflicts
                 min_column_list = list(filter(lambda i: conflicts_count_list[i] == min_conflicts_count, range(len(conflicts_count_list))))
                 while len(min_column_list) != 0:
-                    column = random.choice(min_column_list)
+                    column = self.random.choice(min_column_list)
                     if column != given_column:
                         self.unit_on_next_step = None
                         return (given_row, column)
@@ -206,7 +214,7 @@ class MinConflictsEngine(Engine):
                         if self.version >= 3:
                             # randomly choose the next unit and store it into self.next_unit
                             if len(conflicts_unit_list[column_num]) != 0:
-                                self.unit_on_next_step = random.choice(conflicts_unit_list[column_num])
+                                self.unit_on_next_step = self.random.choice(conflicts_unit_list[column_num])
                         return (given_row, column_num)
 
         # return itself otherwise
@@ -242,7 +250,7 @@ class MinConflictsEngine(Engine):
         """
         if self.version >= 60:
             columns = [i for i in range(self.n)]
-            random.shuffle(columns)
+            self.random.shuffle(columns)
             for row in range(self.n):
                 self.put_queen(at=(row, columns[row]))
         elif self.version >= 50:
@@ -272,7 +280,7 @@ class MinConflictsEngine(Engine):
             for row in range(self.n):
 
                 # choose one from columns
-                column = random.choice(columns)
+                column = self.random.choice(columns)
 
                 # assign initial value using also min-conflicts
                 if self.version >= 5:
@@ -291,7 +299,7 @@ class MinConflictsEngine(Engine):
             column = None
             for row in range(self.n):
                 if column is None:
-                    column = random.choice([i for i in range(self.n)])
+                    column = self.random.choice([i for i in range(self.n)])
 
                 self.current_state[row][column] = True
 
@@ -308,7 +316,7 @@ class MinConflictsEngine(Engine):
             # about rows and columns
             columns = [i for i in range(self.n)]
             for row in range(self.n):
-                column = random.choice(columns)
+                column = self.random.choice(columns)
                 self.current_state[row][column] = True
                 columns.remove(column)
 
@@ -367,7 +375,7 @@ class MinConflictsEngine(Engine):
 
         if self.version >= 5:
             given_row, given_column = at
-            return self.conflicts_table[given_row][given_column], None
+            return int(self.conflicts_table[given_row, given_column]), None
 
         if self.version >= 4:
             given_row, given_column = at
@@ -461,25 +469,22 @@ class MinConflictsEngine(Engine):
             return conflict_count, conflict_items_on_different_row
 
     @stop_watch
-    def convert_to_boards(self) -> List[Board]:
-        """convert current state to Board
+    def convert_to_result(self) -> SolveResult:
+        """convert current state to SolveResult
 
         Returns:
-            boards (List[Board]): current state descirbed as Board
+            result (SolveResult): current state described by the column of the queen on each row
         Note:
-            it returns a list but its length is always 1
+            the board is not built here, which would take O(n^2) time
         """
         # for debug
         self.debug_end_time = datetime.datetime.now()
         if self.debug_start_time is not None:
             self.debug_duration_seconds = (self.debug_end_time - self.debug_start_time).seconds
 
-        b = Board(n=self.n)
-        for i in range(self.n):
-            for j in range(self.n):
-                if self.current_state[i][j] is True:
-                    b.set_queen(at=(i, j))
-        return [b]
+        columns = [row.index(True) if True in row else -1 for row in self.current_state]
+        return SolveResult(n=self.n, columns=columns, steps=self.debug_steps,
+                           duration_seconds=self.debug_duration_seconds, seed=self.random.seed)
 
     @stop_watch
     def break_ties_randomly(self) -> bool:
@@ -488,7 +493,7 @@ class MinConflictsEngine(Engine):
         Args:
             exponent (int): the indicator of uniform distribution
         """
-        if random.randint(0, self.random_ratio) == 0:
+        if self.random.randint(0, self.random_ratio) == 0:
             return True
         return False
 
@@ -512,23 +517,9 @@ class MinConflictsEngine(Engine):
             self.conflicts_num_dict[MinConflictsEngine.DIAG_DOWN][given_row - given_column] += 1
         else:
             # update conflicts table
-            items = self.get_updated_items(at=at)
-            for item in items:
-                row, column = item
-                # TODO
-                # count = self.conflicts_table[row][column]
-
-                # remove column from conflict_dict
-                # TODO:
-                # self.conflicts_dict[row][count].remove(column)
-
-                # update conflicts count
-                new_count = self.conflicts_table[row][column] + 1
-                self.conflicts_table[row][column] = new_count
-
-                # add column to conflict_dict
-                # TODO
-                # self.conflicts_dict[row][new_count].add(column)
+            self.queens_flat[given_row * self.n + given_column] = True
+            for segment in self.get_updated_segments(at=at):
+                self.conflicts_flat[segment] += 1
 
     @stop_watch
     def remove_queen(self, at: Tuple[int, int]) -> None:
@@ -553,126 +544,63 @@ class MinConflictsEngine(Engine):
             self.conflicts_num_dict[MinConflictsEngine.DIAG_DOWN][given_row - given_column] -= 1
         else:
             # update conflicts table
-            items = self.get_updated_items(at=at)
-            for item in items:
-                row, column = item
-                # TODO
-                # count = self.conflicts_table[row][column]
-
-                # remove column from conflict_dict
-                # TODO
-                # self.conflicts_dict[row][count].remove(column)
+            self.queens_flat[given_row * self.n + given_column] = False
+            for segment in self.get_updated_segments(at=at):
+                self.conflicts_flat[segment] -= 1
 
-                # update conflicts count
-                new_count = self.conflicts_table[row][column] - 1
-                self.conflicts_table[row][column] = new_count
-
-                # add column to conflict_dict
-                # TODO
-                # self.conflicts_dict[row][new_count].add(column)
-
-    def get_updated_items(self, at: Tuple[int, int]) -> List[Tuple[int, int]]:
-        """get items that have possiblity to be updated on conflicts table
+    def get_updated_segments(self, at: Tuple[int, int]) -> List[slice]:
+        """get segments of lines that have possiblity to be updated on conflicts table
 
         Args:
             at (Tuple[int, int]): the place to be putted
         Returns:
-            columns (List[Tuple[int, int]]): list of columns that might be updated on conflicts table
+            segments (List[slice]): slices of conflicts_flat, which never include the given place
         Note:
-            This function updates conflicts_table.
             There are only 3 situations when putting a new queen on a line (column or diagonals):
                 (1): no queen exists on each side
                 (2): a queen exists on one side
                 (3): two queens exist on each side
             When we put a new queen, we have to update conflicts table considering the above situations.
+            In (1), the whole line is updated. In (2), the items between the two queens including the other
+            queen are updated. In (3), nothing is updated.
         """
         given_row, given_column = at
-
-        # update conflicts_table
-        updated_items = []
-
-        # first, check items to be updated on the same column
-        conflicts_rows = []
-        for row in range(given_row - 1, -1, -1):
-            if self.current_state[row][given_column]:
-                conflicts_rows.append(row)
-                break
-        for row in range(given_row + 1, self.n):
-            if self.current_state[row][given_column]:
-                conflicts_rows.append(row)
-                break
-        if len(conflicts_rows) == 2:
-            # the queen is between two queens, so do nothing
-            pass
-        elif len(conflicts_rows) == 1:
-            target_row = conflicts_rows[0]
-            # there is a queen on one side, so update conflict table
-            updated_items += [(r, given_column) for r in range(min(given_row, target_row), max(given_row, target_row) + 1)]
-            updated_items.remove((given_row, given_column))
-        else:
-            # there is no queen before putting a new, so update conflict table
-            updated_items += [(r, given_column) for r in range(0, self.n)]
-            updated_items.remove((given_row, given_column))
-
-        # second, check items to be updated on the diag up
-        conflicts_rows_diag_up = []
         diag_up = given_row + given_column
-        for row in range(given_row - 1, -1, -1):
-            column = diag_up - row
-            if column < 0 or self.n <= column:
-                break
-            if self.current_state[row][column]:
-                conflicts_rows_diag_up.append(row)
-                break
-        for row in range(given_row + 1, self.n):
-            column = diag_up - row
-            if column < 0 or self.n <= column:
-                break
-            if self.current_state[row][column]:
-                conflicts_rows_diag_up.append(row)
-                break
-        if len(conflicts_rows_diag_up) == 2:
-            pass
-        elif len(conflicts_rows_diag_up) == 1:
-            target_row = conflicts_rows_diag_up[0]
-            updated_items += [(r, diag_up - r) for r in range(min(given_row, target_row), max(given_row, target_row) + 1)]
-            updated_items.remove((given_row, given_column))
-        else:
-            start_row = max(0, diag_up - self.n + 1)
-            end_row = min(diag_up, self.n - 1)
-            updated_items += [(r, diag_up - r) for r in range(start_row, end_row + 1)]
-            updated_items.remove((given_row, given_column))
-
-        # last, check items to be updated on the diag down
-        conflicts_rows_diag_down = []
         diag_down = given_row - given_column
-        for row in range(given_row - 1, -1, -1):
-            column = row - diag_down
-            if column < 0 or self.n <= column:
-                break
-            if self.current_state[row][column]:
-                conflicts_rows_diag_down.append(row)
-                break
-        for row in range(given_row + 1, self.n):
-            column = row - diag_down
-            if column < 0 or self.n <= column:
-                break
-            if self.current_state[row][column]:
-                conflicts_rows_diag_down.append(row)
-                break
-        if len(conflicts_rows_diag_down) == 2:
-            pass
-        elif len(conflicts_rows_diag_down) == 1:
-            target_row = conflicts_rows_diag_down[0]
-            updated_items += [(r, r - diag_down) for r in range(min(given_row, target_row), max(given_row, target_row) + 1)]
-            updated_items.remove((given_row, given_column))
-        else:
-            start_row = max(diag_down, 0)
-            end_row = min(diag_down + self.n, self.n)
-            updated_items += [(r, r - diag_down) for r in range(start_row, end_row)]
-            updated_items.remove((given_row, given_column))
 
-        return updated_items
+        # (the first row of the line, the last row of the line, the step of the line on conflicts_flat)
+        lines = [
+            (0, self.n - 1, self.n),
+            (max(0, diag_up - self.n + 1), min(diag_up, self.n - 1), self.n - 1),
+            (max(diag_down, 0), min(diag_down + self.n, self.n) - 1, self.n + 1),
+        ]
+        segments = []
+        for first_row, last_row, step in lines:
+            if first_row == last_row:
+                continue
+
+            # the index of the item on the row is origin + row * step on conflicts_flat
+            origin = given_row * self.n + given_column - given_row * step
+
+            # find the nearest queens on each side
+            upper_row = None
+            upper_rows = np.flatnonzero(self.queens_flat[origin + first_row * step:origin + given_row * step:step])
+            if len(upper_rows) != 0:
+                upper_row = first_row + int(upper_rows[-1])
+            lower_row = None
+            lower_rows = np.flatnonzero(self.queens_flat[origin + (given_row + 1) * step:origin + (last_row + 1) * step:step])
+            if len(lower_rows) != 0:
+                lower_row = given_row + 1 + int(lower_rows[0])
+
+            if upper_row is not None and lower_row is not None:
+                continue
+            start_row = upper_row if upper_row is not None else (first_row if lower_row is None else given_row)
+            end_row = lower_row if lower_row is not None else (last_row if upper_row is None else given_row)
+            if start_row < given_row:
+                segments.append(slice(origin + start_row * step, origin + given_row * step, step))
+            if given_row < end_row:
+                segments.append(slice(origin + (given_row + 1) * step, origin + (end_row + 1) * step, step))
+        return segments
 
     def print_conflicts_table(self):
         """Print conflicts table
@@ -1,4 +1,4 @@
-from models.model import Engine, Board
+from models.model import Engine, Board, SolveResult
 from utils.util import stop_watch
 from typing import Dict, List, Tuple, Set
 import random
@@ -61,11 +61,11 @@ class MinConflictsEngine(Engine):
         self.debug_steps: int = 0
 
     @stop_watch
-    def solve(self) -> List[Board]:
+    def solve(self) -> SolveResult:
         """solve problem
 
         Returns:
-            boards (List[Boards]): the list of result boards
+            result (SolveResult): the current placement, which also works as the list of the result board
         """
         # for debug
         self.debug_start_time = datetime.datetime.now()
@@ -79,7 +79,7 @@ class MinConflictsEngine(Engine):
             # return the current board if it's already had a solution
             if self.has_solution():
                 self.debug_steps = step
-                return self.convert_to_boards()
+                return self.convert_to_result()
 
             # choose a unit that conflicts to the other one
             unit = self.choose_one_conflicts()
@@ -92,7 +92,7 @@ class MinConflictsEngine(Engine):
 
         # return the current board if step reaches max_steps
         self.debug_steps = self.max_steps
-        return self.convert_to_boards()
+        return self.convert_to_result()
 
     @stop_watch
     def choose_one_conflicts(self) -> Tuple[int, int]:
@@ -214,25 +214,22 @@ class MinConflictsEngine(Engine):
         given_row, given_column = at
         return self.conflicts_table[given_row][given_column], None
 
-    def convert_to_boards(self) -> List[Board]:
-        """convert current state to Board
+    def convert_to_result(self) -> SolveResult:
+        """convert current state to SolveResult
 
         Returns:
-            boards (List[Board]): current state descirbed as Board
+            result (SolveResult): current state described by the column of the queen on each row
         Note:
-            it returns a list but its length is always 1
+            the board is not built here, which would take O(n^2) time
         """
         # for debug
         self.debug_end_time = datetime.datetime.now()
         if self.debug_start_time is not None:
             self.debug_duration_seconds = (self.debug_end_time - self.debug_start_time).seconds
 
-        b = Board(n=self.n)
-        for i in range(self.n):
-            for j in range(self.n):
-                if self.current_state[i][j] is True:
-                    b.set_queen(at=(i, j))
-        return [b]
+        columns = [row.index(True) if True in row else -1 for row in self.current_state]
+        return SolveResult(n=self.n, columns=columns, steps=self.debug_steps,
+                           duration_seconds=self.debug_duration_seconds)
 
     def break_ties_randomly(self) -> bool:
         """return True or False randomly
@@ -1,6 +1,13 @@
-from models.model import Engine, Board
-from typing import Dict, List, Tuple
-import random
+from models.model import Engine, Board, SolveResult, SolveStatus
+from utils.checkpoint import StopSignals, load_checkpoint, save_checkpoint
+from utils.random_stream import RandomStream
+from utils.restart import RestartPolicy
+from utils.observer import Observer
+from utils.tracer import Tracer
+from array import array
+from contextlib import nullcontext
+from itertools import chain, repeat
+from typing import AsyncIterator, Dict, List, Tuple
 import time
 from collections import deque
 
@@ -12,16 +19,25 @@ class MinConflictsEngine(Engine):
 
     def __init__(self,
                  n: int,
-                 version: int = 1) -> None:
+                 version: int = 1,
+                 seed: int = None,
+                 sample_size: int = None,
+                 breakout: bool = False,
+                 adaptive_noise: bool = False) -> None:
         """initialize instance
 
         Args:
             n (int): length of chess board
             max_steps (int): the maximum number of attempts within searching
             version (int): version
+            seed (int): seed of the random stream. the search is reproducible if given
+            sample_size (int): the initial number of columns sampled on each step. all columns are examined if None
+            breakout (bool): weight lines and raise the weights of lines where the search is stuck if True
+            adaptive_noise (bool): adapt the probability of random moves to the progress of the search if True
         """
         self.n: int = n
         self.version: int = version
+        self.random: RandomStream = RandomStream(seed=seed)
 
         # constant
         self.all_list: List[int] = [i for i in range(self.n)]
@@ -45,51 +61,586 @@ class MinConflictsEngine(Engine):
 
         self.queen_is: Dict[int, int] = {row: None for row in range(self.n)}
 
+        # the number of queens on the board and the number of extra queens on each column and diagonal,
+        # which make has_solution O(1)
+        self.queens_num: int = 0
+        self.conflicts_total: int = 0
+
+        # variables for the sampled search. sample_size adapts to the improvement of conflicts_total
+        # on every sample_window steps, and all columns are examined again when a few conflicts remain
+        self.sample_size: int = None if sample_size is None else max(1, min(sample_size, self.n))
+        self.min_sample_size: int = 1 if sample_size is None else self.sample_size
+        self.sample_window: int = 32
+        self.exact_conflicts: int = 8
+        self.window_conflicts_total: int = 0
+
+        # weights of lines for the breakout mode, indexed like the counters (diag_down shifted by n - 1).
+        # a line weighs more each time a queen on it is stuck at a local minimum
+        self.breakout: bool = breakout
+        self.column_weights: array = array('i', [1]) * self.n
+        self.diag_up_weights: array = array('i', [1]) * max(2 * self.n - 1, 0)
+        self.diag_down_weights: array = array('i', [1]) * max(2 * self.n - 1, 0)
+        if breakout:
+            # bound here instead of branching in the hottest function
+            self.get_conflicts_count = self.get_weighted_conflicts_count
+
+        # variables for the adaptive noise, as in adaptive WalkSAT. noise is the probability of moving the chosen queen
+        # to a random column. it starts from 0, rises toward max_noise when conflicts_total has not reached
+        # a new minimum for noise_window steps, and decays on each new minimum
+        self.adaptive_noise: bool = adaptive_noise
+        self.noise: float = 0.0
+        self.max_noise: float = 0.05
+        self.noise_theta: float = 1 / 6
+        self.noise_phi: float = 0.2
+        self.noise_window: int = 1
+        self.best_conflicts_total: int = 0
+        self.best_conflicts_step: int = 0
+
         self.history: List[Tuple[int, int]] = []
         self.history_offset_dict: Dict[int, int] = {row: 0 for row in range(self.n)}
 
         r = [i for i in range(self.n)]
-        random.shuffle(r)
+        self.random.shuffle(r)
         self.queue: deque = deque(r)
 
+        # queue of columns used in initialization
+        self.initial_queue: deque = None
+
+        # the steps on which the tracer records and the observer is called next
+        self.next_trace_step: int = 0
+        self.next_observe_step: int = 0
+
+        # variables for checkpoint
+        self.checkpoint_path: str = None
+        self.checkpoint_interval: int = max(self.n, 100)
+        self.next_checkpoint_step: int = 0
+        self.searching: bool = False
+        self.stop_requested: bool = False
+
         # variables for debug
         self.debug_start_time: float = None
         self.debug_end_time: float = None
         self.debug_duration_seconds: float = 0
         self.debug_steps: int = 0
-
-    def solve(self, enable_print: bool = False) -> List[Board]:
+        self.debug_random_walks: int = 0
+        self.debug_solutions_per_second: float = 0
+        self.debug_max_sample_size: int = 0 if sample_size is None else self.sample_size
+        self.debug_weight_increases: int = 0
+        self.debug_noise_moves: int = 0
+        self.debug_restarts: int = 0
+        self.debug_max_noise: float = 0.0
+
+    def solve(self,
+              enable_print: bool = False,
+              tracer: Tracer = None,
+              resume_from: str = None,
+              checkpoint_path: str = None,
+              checkpoint_interval: int = None,
+              restart: RestartPolicy = None,
+              observer: Observer = None) -> SolveResult:
         """solve problem
 
+        Args:
+            enable_print (bool): build the result board if True
+            tracer (Tracer): record the trajectory of the search if given
+            resume_from (str): path of the checkpoint file to resume the search from
+            checkpoint_path (str): path of the checkpoint file. the state is saved periodically if given
+            checkpoint_interval (int): save the state every `checkpoint_interval` steps. Default max(n, 100),
+                which keeps saving the O(n) state O(1) per step on average
+            restart (RestartPolicy): restart from a new initialization by the policy if given. max_steps is
+                the budget of all runs
+            observer (Observer): notify the progress of the search if given. it can stop the search early
         Returns:
-            boards (List[Boards]): the list of result boards
+            result (SolveResult): the current placement, which also works as the list of the result board
+        Note:
+            when checkpoint_path is given, SIGINT and SIGTERM during the search save the state
+            before interrupting the process. a resumed search is the same as the uninterrupted one,
+            except that a restart policy starts the run of the resumed step from its beginning
         """
         # for debug
         self.debug_start_time = time.time()
 
-        # initialize current board
-        self.initialize_current_board()
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval if checkpoint_interval is not None else max(self.n, 100)
+        self.stop_requested = False
+        signals = nullcontext()
+        if checkpoint_path is not None:
+            signals = StopSignals(deferred=lambda: self.searching, on_signal=self.request_stop)
+
+        with signals:
+            if resume_from is not None:
+                start_step = self.restore(path=resume_from)
+            else:
+                # initialize current board
+                self.initialize_current_board()
+                start_step = 0
+                self.reset_noise(step=start_step)
+
+            # loop for searching a solution until step reaches max_steps
+            self.next_trace_step = start_step
+            self.next_observe_step = start_step
+            self.next_checkpoint_step = start_step
+            self.searching = True
+            try:
+                if restart is not None:
+                    self.search_with_restarts(start_step=start_step, policy=restart, tracer=tracer, observer=observer)
+                else:
+                    self.search(start_step=start_step, end_step=self.max_steps, tracer=tracer, observer=observer)
+            finally:
+                self.searching = False
+            if self.stop_requested:
+                signals.raise_stop()
+        if observer is not None:
+            phase = SolveStatus.SOLVED if self.has_solution() else SolveStatus.FAILED
+            observer.finish(self.status(phase=phase, placed_rows=self.n, step=self.debug_steps))
+        return self.convert_to_result(enable_print=enable_print)
+
+    def sample_solutions(self, k: int, perturbed_rows: int = 4, max_attempts: int = None) -> List[List[int]]:
+        """find k distinct solutions
+
+        After the first solution, counters are kept alive and each next solution is searched
+        from the previous one by shuffling the queens on some random rows and repairing the board.
+
+        Args:
+            k (int): the number of solutions
+            perturbed_rows (int): the number of rows shuffled before each repair
+            max_attempts (int): the maximum number of repairs. Default 10 * k
+        Returns:
+            solutions (List[List[int]]): distinct solutions. solution[row] is the column of the queen.
+                it can be shorter than k if there are not enough solutions or attempts
+        """
+        perturbed_rows = min(perturbed_rows, self.n)
+        if max_attempts is None:
+            max_attempts = 10 * k
+
+        start_time = time.time()
+        solutions = []
+        seen = set()
+
+        # start from the current board if it has already been solved
+        if self.n == 0 or self.queen_is[0] is None:
+            self.solve()
+        for _ in range(max_attempts):
+            if self.has_solution():
+                columns = [self.queen_is[row] for row in range(self.n)]
+                # reject exact duplicates by the packed permutation, 4n bytes, which can not collide like a hash
+                key = array('i', columns).tobytes()
+                if key not in seen:
+                    seen.add(key)
+                    solutions.append(columns)
+                    if len(solutions) == k:
+                        break
+            self.perturb(rows=perturbed_rows)
+            self.reset_noise(step=0)
+            self.search(start_step=0, end_step=self.max_steps)
+
+        duration_seconds = time.time() - start_time
+        self.debug_solutions_per_second = len(solutions) / duration_seconds if duration_seconds > 0 else 0
+        return solutions
+
+    def perturb(self, rows: int) -> None:
+        """shuffle the queens among randomly chosen rows
+
+        Args:
+            rows (int): the number of rows to be shuffled
+        """
+        chosen_rows = self.random.sample(range(self.n), rows)
+        columns = [self.queen_is[row] for row in chosen_rows]
+        self.random.shuffle(columns)
+        for row, column in zip(chosen_rows, columns):
+            self.move(previous=(row, self.queen_is[row]), after=(row, column))
+
+    def request_stop(self) -> None:
+        """stop the search at the next step after saving the checkpoint
+        """
+        self.stop_requested = True
+
+    def checkpoint(self, step: int) -> None:
+        """save the state to resume the same search from the given step
+
+        Args:
+            step (int): the current step
+        """
+        save_checkpoint(path=self.checkpoint_path, state={
+            'n': self.n,
+            'step': step,
+            'columns': array('i', [self.queen_is[row] for row in range(self.n)]),
+            'random_state': self.random.getstate(),
+            'random_walks': self.debug_random_walks,
+            # rows in the order of the queue, and the removed units flattened as row, column, row, ...
+            'queue': array('i', self.queue),
+            'history': array('i', chain.from_iterable(self.history)),
+            'history_offsets': array('q', [self.history_offset_dict[row] for row in range(self.n)]),
+            'weights': (self.column_weights, self.diag_up_weights, self.diag_down_weights),
+            'noise': self.noise,
+            'noise_window': (self.noise_window, self.best_conflicts_total, self.best_conflicts_step),
+            'sample_size': (self.sample_size, self.window_conflicts_total),
+            'restarts': self.debug_restarts,
+            'elapsed_seconds': time.time() - self.debug_start_time,
+        })
+
+    def restore(self, path: str) -> int:
+        """restore the state from the checkpoint file
+
+        Counters are recomputed from the placement of queens in O(n).
+
+        Args:
+            path (str): path of the checkpoint file
+        Returns:
+            step (int): the step to resume from
+        """
+        state = load_checkpoint(path)
+        if state['n'] != self.n:
+            raise ValueError(f'the checkpoint is for n = {state["n"]}, not {self.n}')
+        for row, column in enumerate(state['columns']):
+            self.put_queen(at=(row, column))
+        self.random.setstate(state['random_state'])
+        self.debug_random_walks = state['random_walks']
+        if 'queue' in state:
+            self.queue = deque(state['queue'])
+            history = iter(state['history'])
+            self.history = list(zip(history, history))
+            self.history_offset_dict.update(enumerate(state['history_offsets']))
+        if 'weights' in state:
+            self.column_weights, self.diag_up_weights, self.diag_down_weights = state['weights']
+        if 'noise' in state:
+            self.noise = state['noise']
+        if 'noise_window' in state:
+            self.noise_window, self.best_conflicts_total, self.best_conflicts_step = state['noise_window']
+        else:
+            self.reset_noise(step=state['step'])
+        if 'sample_size' in state:
+            self.sample_size, self.window_conflicts_total = state['sample_size']
+        self.debug_restarts = state.get('restarts', 0)
+        self.debug_start_time = time.time() - state['elapsed_seconds']
+        return state['step']
+
+    async def solve_async(self,
+                          enable_print: bool = False,
+                          tracer: Tracer = None,
+                          chunk_steps: int = 1000,
+                          yield_seconds: float = 0.05) -> SolveResult:
+        """solve problem without blocking the event loop
+
+        Args:
+            enable_print (bool): build the result board if True
+            tracer (Tracer): record the trajectory of the search if given
+            chunk_steps (int): the maximum number of steps (or rows on initialization) between yields
+            yield_seconds (float): the target interval of yielding to the event loop
+        Returns:
+            result (SolveResult): the current placement, which also works as the list of the result board
+        Note:
+            the engine is always in a consistent state when it yields, so cancelling the task
+            raises asyncio.CancelledError at the next yield
+        """
+        async for _ in self.progress(tracer=tracer, chunk_steps=chunk_steps, yield_seconds=yield_seconds):
+            pass
+        return self.convert_to_result(enable_print=enable_print)
+
+    async def progress(self,
+                       tracer: Tracer = None,
+                       chunk_steps: int = 1000,
+                       yield_seconds: float = 0.05) -> AsyncIterator[SolveStatus]:
+        """solve problem chunk by chunk, yielding a status snapshot between chunks
+
+        Args:
+            tracer (Tracer): record the trajectory of the search if given
+            chunk_steps (int): the maximum number of steps (or rows on initialization) between yields
+            yield_seconds (float): the target interval of yielding to the event loop
+        Yields:
+            status (SolveStatus): the status after each chunk
+        Note:
+            the chunk size is adapted so that each chunk takes about `yield_seconds`
+        """
+        # asyncio is imported here, so that the synchronous solve does not pay for it
+        import asyncio
+
+        # for debug
+        self.debug_start_time = time.time()
+        self.next_trace_step = 0
+        self.next_checkpoint_step = 0
+
+        # initialize current board row by row
+        self.initialize_queue()
+        size = 1
+        row = 0
+        while row < self.n:
+            end_row = min(row + size, self.n)
+            chunk_start_time = time.time()
+            self.initialize_rows(start_row=row, end_row=end_row)
+            size = self.adapt_chunk_size(size=size, max_size=chunk_steps, duration=time.time() - chunk_start_time,
+                                         yield_seconds=yield_seconds)
+            row = end_row
+            yield self.status(phase=SolveStatus.INITIALIZING, placed_rows=row, step=0)
+            await asyncio.sleep(0)
+
+        # search step by step
+        size = 1
+        step = 0
+        self.reset_noise(step=step)
+        while step < self.max_steps:
+            end_step = min(step + size, self.max_steps)
+            chunk_start_time = time.time()
+            solved = self.search(start_step=step, end_step=end_step, tracer=tracer)
+            size = self.adapt_chunk_size(size=size, max_size=chunk_steps, duration=time.time() - chunk_start_time,
+                                         yield_seconds=yield_seconds)
+            if solved:
+                self.stop_timer()
+                yield self.status(phase=SolveStatus.SOLVED, placed_rows=self.n, step=self.debug_steps)
+                return
+            step = end_step
+            yield self.status(phase=SolveStatus.SEARCHING, placed_rows=self.n, step=step)
+            await asyncio.sleep(0)
+
+        self.stop_timer()
+        yield self.status(phase=SolveStatus.FAILED, placed_rows=self.n, step=self.max_steps)
+
+    def adapt_chunk_size(self, size: int, max_size: int, duration: float, yield_seconds: float) -> int:
+        """get the next chunk size so that a chunk takes about yield_seconds
+
+        Args:
+            size (int): the current chunk size
+            max_size (int): the upper limit of the chunk size
+            duration (float): seconds the current chunk took
+            yield_seconds (float): the target duration of a chunk
+        Returns:
+            (int): the next chunk size
+        """
+        if duration <= 0:
+            return min(size * 2, max_size)
+        # do not grow too fast because a single step can suddenly become slow
+        return max(1, min(int(size * yield_seconds / duration), size * 2, max_size))
+
+    def status(self, phase: str, placed_rows: int, step: int) -> SolveStatus:
+        """get a snapshot of the current status
+
+        Args:
+            phase (str): the current phase
+            placed_rows (int): the number of rows where a queen has been placed
+            step (int): the current step
+        Returns:
+            (SolveStatus): status
+        """
+        return SolveStatus(phase=phase,
+                           n=self.n,
+                           placed_rows=placed_rows,
+                           step=step,
+                           max_steps=self.max_steps,
+                           random_walks=self.debug_random_walks,
+                           elapsed_seconds=time.time() - self.debug_start_time,
+                           conflicts=self.conflicts_total)
+
+    def search(self, start_step: int, end_step: int, tracer: Tracer = None, observer: Observer = None) -> bool:
+        """repeat min-conflicts steps from start_step until end_step
 
-        # loop for searching a solution until step reaches max_steps
-        for step in range(self.max_steps):
+        Args:
+            start_step (int): the first step
+            end_step (int): the step where the search stops
+            tracer (Tracer): record the trajectory of the search if given
+            observer (Observer): notify the progress of the search if given
+        Returns:
+            (bool): True if a solution is found
+        """
+        # the steps on which the tracer records, the observer is called and the state is saved next.
+        # they never match if not enabled
+        next_trace_step = self.next_trace_step if tracer is not None else -1
+        next_observe_step = self.next_observe_step if observer is not None else -1
+        next_checkpoint_step = self.next_checkpoint_step if self.checkpoint_path is not None else -1
+
+        for step in range(start_step, end_step):
 
             # return the current board if it's already had a solution
             if self.has_solution():
                 self.debug_steps = step
-                return self.convert_to_boards(enable_print=enable_print)
+                if tracer is not None:
+                    self.trace(tracer=tracer, step=step)
+                return True
+
+            if step == next_trace_step:
+                self.trace(tracer=tracer, step=step)
+                next_trace_step = step + tracer.interval
+
+            if step == next_observe_step:
+                next_observe_step = observer.observe(self.status(phase=SolveStatus.SEARCHING, placed_rows=self.n, step=step))
+                if observer.stop_requested:
+                    self.next_trace_step = next_trace_step
+                    self.next_observe_step = next_observe_step
+                    self.debug_steps = step
+                    return False
+
+            if step == next_checkpoint_step or self.stop_requested:
+                self.checkpoint(step=step)
+                next_checkpoint_step = step + self.checkpoint_interval
+                if self.stop_requested:
+                    self.debug_steps = step
+                    return False
 
             # choose a unit that conflicts to the other one
             unit = self.choose_one_conflicts()
 
-            # search the unit that has the minimum conflicts count to the other
-            next_unit = self.search_next_unit(unit=unit)
+            # search the unit that has the minimum conflicts count to the other, or take a random one by the noise
+            if self.adaptive_noise and self.random.random() < self.noise:
+                next_unit = (unit[0], self.random.randrange(self.n))
+                self.debug_noise_moves += 1
+            else:
+                next_unit = self.search_next_unit(unit=unit)
 
             # move to the next
-            self.move(previous=unit, after=next_unit)
+            if self.breakout:
+                self.breakout_move(previous=unit, after=next_unit)
+            else:
+                self.move(previous=unit, after=next_unit)
+
+            if self.sample_size is not None and step % self.sample_window == 0:
+                self.adapt_sample_size()
 
-        # return the current board if step reaches max_steps
-        self.debug_steps = self.max_steps
-        return self.convert_to_boards(enable_print=enable_print)
+            if self.adaptive_noise:
+                self.adapt_noise(step=step)
+
+        self.next_trace_step = next_trace_step
+        self.next_observe_step = next_observe_step
+        self.next_checkpoint_step = next_checkpoint_step
+        self.debug_steps = end_step
+
+        # record the last state if step reaches max_steps
+        if tracer is not None and end_step == self.max_steps:
+            self.trace(tracer=tracer, step=self.max_steps)
+        return False
+
+    def search_with_restarts(self, start_step: int, policy: RestartPolicy, tracer: Tracer = None, observer: Observer = None) -> bool:
+        """search until max_steps, restarting from a new initialization when the policy ends a run
+
+        Args:
+            start_step (int): the first step
+            policy (RestartPolicy): restart policy
+            tracer (Tracer): record the trajectory of the search if given
+            observer (Observer): notify the progress of the search if given
+        Returns:
+            (bool): True if a solution is found
+        """
+        step = start_step
+        while True:
+            run_end = min(step + policy.run_steps(self.debug_restarts), self.max_steps)
+            best_conflicts_total = None
+            while step < run_end:
+                end_step = run_end if policy.window is None else min(step + policy.window, run_end)
+                if self.search(start_step=step, end_step=end_step, tracer=tracer, observer=observer):
+                    return True
+                if self.stop_requested or (observer is not None and observer.stop_requested):
+                    return False
+                step = end_step
+                # the run has stagnated if conflicts have not reached a new minimum in the window
+                if policy.window is not None:
+                    if best_conflicts_total is not None and self.conflicts_total >= best_conflicts_total:
+                        break
+                    best_conflicts_total = self.conflicts_total
+            # the last step of the run may have solved it
+            if step >= self.max_steps or self.has_solution():
+                return self.has_solution()
+            self.restart()
+            self.reset_noise(step=step)
+            self.debug_restarts += 1
+
+    def restart(self) -> None:
+        """remove all queens and initialize the board again, reusing the counters
+
+        the weights of the breakout mode are kept, since they describe lines that are hard on any placement
+        """
+        self.clear_board()
+        self.initialize_current_board()
+
+    def reset(self, seed: int = None) -> None:
+        """return to the state just after the construction with a new seed, reusing the allocated counters
+
+        the options given to the constructor are kept. a reset engine searches exactly like a new one with the same seed
+
+        Args:
+            seed (int): seed of the random stream. the search is reproducible if given
+        """
+        self.clear_board()
+        self.random = RandomStream(seed=seed, buffer_size=self.random.buffer_size)
+        self.result_boards = []
+        self.snapshot_state = None
+
+        if self.sample_size is not None:
+            self.sample_size = self.min_sample_size
+        self.window_conflicts_total = 0
+        if self.breakout:
+            for weights in (self.column_weights, self.diag_up_weights, self.diag_down_weights):
+                weights[:] = array('i', [1]) * len(weights)
+        self.noise = 0.0
+        self.noise_window = 1
+        self.best_conflicts_total = 0
+        self.best_conflicts_step = 0
+
+        # drawn in the same order as the constructor, so that the same seed gives the same search
+        r = [i for i in range(self.n)]
+        self.random.shuffle(r)
+        self.queue = deque(r)
+        self.initial_queue = None
+
+        self.next_trace_step = 0
+        self.next_observe_step = 0
+        self.checkpoint_path = None
+        self.checkpoint_interval = max(self.n, 100)
+        self.next_checkpoint_step = 0
+        self.searching = False
+        self.stop_requested = False
+
+        self.debug_start_time = None
+        self.debug_end_time = None
+        self.debug_duration_seconds = 0
+        self.debug_steps = 0
+        self.debug_random_walks = 0
+        self.debug_solutions_per_second = 0
+        self.debug_max_sample_size = 0 if self.sample_size is None else self.sample_size
+        self.debug_weight_increases = 0
+        self.debug_noise_moves = 0
+        self.debug_restarts = 0
+        self.debug_max_noise = 0.0
+
+    def clear_board(self) -> None:
+        """remove all queens and zero the counters in place, which keeps the dicts allocated
+        """
+        for counts in self.conflicts_num_dict.values():
+            counts.update(zip(counts, repeat(0)))
+        self.queen_is.update(zip(self.queen_is, repeat(None)))
+        self.history_offset_dict.update(zip(self.history_offset_dict, repeat(0)))
+        self.queens_num = 0
+        self.conflicts_total = 0
+        self.history.clear()
+
+    def trace(self, tracer: Tracer, step: int) -> None:
+        """record the current state to the tracer
+
+        Args:
+            tracer (Tracer): tracer
+            step (int): the current step
+        """
+        conflicts, conflicted_rows = self.count_conflicts()
+        tracer.record(step=step,
+                      conflicts=conflicts,
+                      conflicted_rows=conflicted_rows,
+                      random_walks=self.debug_random_walks,
+                      elapsed_seconds=time.time() - self.debug_start_time,
+                      noise=self.noise)
+
+    def count_conflicts(self) -> Tuple[int, int]:
+        """count conflicts on the whole board
+
+        Returns:
+            conflicts (int): the number of extra queens on each column and diagonal
+            conflicted_rows (int): the number of rows whose queen has conflicts
+        Note:
+            counting conflicted rows takes O(n), so it is called only when the state is traced
+        """
+        conflicts = self.conflicts_total
+
+        conflicted_rows = 0
+        for row, column in self.queen_is.items():
+            if column is not None and self.get_conflicts_count(at=(row, column))[0] > 0:
+                conflicted_rows += 1
+        return conflicts, conflicted_rows
 
     def choose_one_conflicts(self) -> Tuple[int, int]:
         """randomly choose a unit that conflicts to the other
@@ -128,6 +679,9 @@ class MinConflictsEngine(Engine):
         """
         given_row, given_column = unit
 
+        if self.sample_size is not None and self.conflicts_total > self.exact_conflicts:
+            return self.search_sampled_unit(unit=unit)
+
         current_conflicts_num = self.get_conflicts_count(at=unit)
         current_conflicts_unit = unit
 
@@ -148,20 +702,12 @@ class MinConflictsEngine(Engine):
                     current_conflicts_unit = (given_row, column)
             return current_conflicts_unit
         else:
-            start_offset = self.history_offset_dict[given_row]
-            end_offset = len(self.history) - 1
-            columns = []
-            for i in range(start_offset, end_offset + 1):
-                h_row, h_column = self.history[i]
-                columns.append(h_column)
-                if h_row + h_column == given_row + given_column:
-                    columns.append(h_row + h_column - given_row)
-                if h_row - h_column == given_row - given_column:
-                    columns.append(given_row - h_row + h_column)
-            self.history_offset_dict[given_row] = end_offset
-
-            random.shuffle(columns)
-            for column in columns:
+            columns = self.history_columns(unit=unit)
+
+            # scan from a random offset instead of shuffling, so ties are broken randomly in O(1)
+            offset = self.random.randrange(len(columns)) if len(columns) != 0 else 0
+            for i in range(len(columns)):
+                column = columns[(offset + i) % len(columns)]
                 c = self.get_conflicts_count(at=(given_row, column))
                 if current_conflicts_num > c:
                     if current_conflicts_num == 0:
@@ -170,6 +716,95 @@ class MinConflictsEngine(Engine):
                     current_conflicts_unit = (given_row, column)
             return current_conflicts_unit
 
+    def history_columns(self, unit: Tuple[int, int]) -> List[int]:
+        """get columns freed on the row by moves since the row was examined last time
+
+        Args:
+            unit (Tuple[int, int]): the unit where the queen of the row is
+        Returns:
+            columns (List[int]): columns whose column or diagonal has lost a queen
+        """
+        given_row, given_column = unit
+        start_offset = self.history_offset_dict[given_row]
+        end_offset = len(self.history) - 1
+        columns = []
+        for i in range(start_offset, end_offset + 1):
+            h_row, h_column = self.history[i]
+            columns.append(h_column)
+            if h_row + h_column == given_row + given_column:
+                columns.append(h_row + h_column - given_row)
+            if h_row - h_column == given_row - given_column:
+                columns.append(given_row - h_row + h_column)
+        self.history_offset_dict[given_row] = end_offset
+        return columns
+
+    def search_sampled_unit(self, unit: Tuple[int, int]) -> Tuple[int, int]:
+        """search a unit that has minimum conflicts count among sampled columns
+
+        The columns freed since the row was examined last time and `sample_size` random columns are
+        examined, so a step takes O(sample_size) instead of O(n).
+
+        Args:
+            unit (Tuple[int, int]): the unit where the queen of the row is
+        Returns:
+            next_unit (Tuple[int, int]): the next unit where a queen will move
+        """
+        given_row, _ = unit
+        columns = []
+        if len(self.history) != 0 and not self.break_ties_randomly():
+            columns = self.history_columns(unit=unit)
+        for _ in range(self.sample_size):
+            columns.append(self.random.randrange(self.n))
+
+        current_conflicts_num, _ = self.get_conflicts_count(at=unit)
+        current_conflicts_unit = unit
+        for column in columns:
+            c, _ = self.get_conflicts_count(at=(given_row, column))
+            if current_conflicts_num > c:
+                current_conflicts_num = c
+                current_conflicts_unit = (given_row, column)
+                # no queen attacks the unit
+                if c == -3:
+                    break
+        return current_conflicts_unit
+
+    def adapt_sample_size(self) -> None:
+        """double sample_size if conflicts have not decreased in the last window, otherwise halve it
+        """
+        if self.conflicts_total >= self.window_conflicts_total:
+            self.sample_size = min(self.sample_size * 2, self.n)
+            self.debug_max_sample_size = max(self.debug_max_sample_size, self.sample_size)
+        else:
+            self.sample_size = max(self.sample_size // 2, self.min_sample_size)
+        self.window_conflicts_total = self.conflicts_total
+
+    def adapt_noise(self, step: int) -> None:
+        """decrease noise on a new minimum of conflicts_total, and increase it after a stagnation of noise_window steps
+
+        Args:
+            step (int): the current step
+        """
+        if self.conflicts_total < self.best_conflicts_total:
+            self.noise -= self.noise * self.noise_phi / 2
+            self.best_conflicts_total = self.conflicts_total
+            self.best_conflicts_step = step
+        elif step - self.best_conflicts_step >= self.noise_window:
+            self.noise += (self.max_noise - self.noise) * self.noise_phi
+            self.debug_max_noise = max(self.debug_max_noise, self.noise)
+            self.best_conflicts_step = step
+        # the window follows the remaining conflicts, which is the size of the subproblem left
+        self.noise_window = max(int(self.noise_theta * self.conflicts_total), 1)
+
+    def reset_noise(self, step: int) -> None:
+        """start the stagnation window of the adaptive noise from the current state
+
+        Args:
+            step (int): the current step
+        """
+        self.best_conflicts_total = self.conflicts_total
+        self.best_conflicts_step = step
+        self.noise_window = max(int(self.noise_theta * self.conflicts_total), 1)
+
     def move(self, previous: Tuple[int, int], after: Tuple[int, int]) -> None:
         """move a queen to the next unit
 
@@ -187,11 +822,26 @@ class MinConflictsEngine(Engine):
     def initialize_current_board(self, debug_row=None) -> None:
         """initialize the current board
         """
+        self.initialize_queue()
+        self.initialize_rows(start_row=0, end_row=self.n)
+
+    def initialize_queue(self) -> None:
+        """prepare the shuffled queue of columns used in initialize_rows
+        """
         columns = [i for i in range(self.n)]
-        random.shuffle(columns)
-        queue = deque(columns)
+        self.random.shuffle(columns)
+        self.initial_queue = deque(columns)
 
-        for row in range(self.n):
+    def initialize_rows(self, start_row: int, end_row: int) -> None:
+        """place queens on rows from start_row until end_row
+
+        Args:
+            start_row (int): the first row
+            end_row (int): the row where the initialization stops
+        """
+        queue = self.initial_queue
+
+        for row in range(start_row, end_row):
             column = None
             min_conflicts_num = self.n
             reserved_queue = deque([])
@@ -230,22 +880,8 @@ class MinConflictsEngine(Engine):
 
         Returns:
             (bool): True if it's a solution
-        TODO: make O(n^2) O(n)
         """
-        for row_num in range(self.n):
-            # # it's not a solution if more than 2 queens exists on a same row
-            # if sum(self.current_state[row_num]) != 1:
-            #     return False
-
-            # it's not a solution if a queen has some conflicts
-            # column_num = self.current_state[row_num].index(True)
-            column_num = self.queen_is[row_num]
-            conflicts_count, _ = self.get_conflicts_count(at=(row_num, column_num))
-            if conflicts_count > 0:
-                return False
-
-        # otherwise, it's a solution
-        return True
+        return self.queens_num == self.n and self.conflicts_total == 0
 
     def get_conflicts_count(self, at: Tuple[int, int]) -> Tuple[int, List[Tuple[int, int]]]:
         """count the conflicts count for the given location
@@ -270,26 +906,88 @@ class MinConflictsEngine(Engine):
         num = num + self.conflicts_num_dict[MinConflictsEngine.DIAG_DOWN][diag_down]
         return num, None
 
-    def convert_to_boards(self, enable_print: bool) -> List[Board]:
-        """convert current state to Board
-
-        Returns:
-            boards (List[Board]): current state descirbed as Board
-        Note:
-            it returns a list but its length is always 1
+    def stop_timer(self) -> None:
+        """record the duration of the solve for debug
         """
-        # for debug
         self.debug_end_time = time.time()
         if self.debug_start_time is not None:
             self.debug_duration_seconds = self.debug_end_time - self.debug_start_time
 
+    def get_weighted_conflicts_count(self, at: Tuple[int, int]) -> Tuple[int, List[Tuple[int, int]]]:
+        """count the conflicts weighted by lines for the given location, used in the breakout mode
+
+        Args:
+            at (Tuple[int, int]): unit (row, column)
+        Returns:
+            count (int): the sum of the weight of each line times the number of the other queens on it, minus 3,
+                which is the same as get_conflicts_count while all weights are 1
+            conflict_list (Tuple[int, int]): always None
+        """
+        given_row, given_column = at
+        diag_up = given_row + given_column
+        diag_down = given_row - given_column
+
+        # the queen of the row itself is not a conflict
+        own = 1 if self.queen_is[given_row] == given_column else 0
+        num = 3 * own - 3
+        num += self.column_weights[given_column] * (self.conflicts_num_dict[MinConflictsEngine.COLUMN][given_column] - own)
+        num += self.diag_up_weights[diag_up] * (self.conflicts_num_dict[MinConflictsEngine.DIAG_UP][diag_up] - own)
+        num += self.diag_down_weights[diag_down + self.n - 1] * (self.conflicts_num_dict[MinConflictsEngine.DIAG_DOWN][diag_down] - own)
+        return num, None
+
+    def breakout_move(self, previous: Tuple[int, int], after: Tuple[int, int]) -> None:
+        """move a queen and raise the weights of its conflicted lines if the move does not reduce conflicts
+
+        the empty units are always preferred to the current one by get_conflicts_count, so the queen hardly
+        stays. a move that does not reduce the unweighted conflicts is taken as a local minimum instead
+
+        Args:
+            previous (Tuple[int, int]): the previous unit
+            after (Tuple[int, int]): the next unit where a queen will move
+        """
+        conflicts_total = self.conflicts_total
+        lines = self.conflicted_lines(unit=previous)
+        self.move(previous=previous, after=after)
+        if self.conflicts_total >= conflicts_total:
+            for weights, index in lines:
+                weights[index] += 1
+            self.debug_weight_increases += len(lines)
+
+    def conflicted_lines(self, unit: Tuple[int, int]) -> List[Tuple[array, int]]:
+        """get the lines where the queen of the unit conflicts
+
+        Args:
+            unit (Tuple[int, int]): the unit where a queen exists
+        Returns:
+            lines (List[Tuple[array, int]]): the weights of the kind of line and the index of the line
+        """
+        given_row, given_column = unit
+        diag_up = given_row + given_column
+        diag_down = given_row - given_column
+        lines = []
+        if self.conflicts_num_dict[MinConflictsEngine.COLUMN][given_column] > 1:
+            lines.append((self.column_weights, given_column))
+        if self.conflicts_num_dict[MinConflictsEngine.DIAG_UP][diag_up] > 1:
+            lines.append((self.diag_up_weights, diag_up))
+        if self.conflicts_num_dict[MinConflictsEngine.DIAG_DOWN][diag_down] > 1:
+            lines.append((self.diag_down_weights, diag_down + self.n - 1))
+        return lines
+
+    def convert_to_result(self, enable_print: bool = False) -> SolveResult:
+        """convert current state to SolveResult
+
+        Args:
+            enable_print (bool): build the board of the result now if True, otherwise it is built on access
+        Returns:
+            result (SolveResult): current state described by the column of the queen on each row
+        """
+        self.stop_timer()
+        columns = [-1 if self.queen_is[row] is None else self.queen_is[row] for row in range(self.n)]
+        result = SolveResult(n=self.n, columns=columns, steps=self.debug_steps, duration_seconds=self.debug_duration_seconds,
+                             seed=self.random.seed, conflicts=self.conflicts_total, restarts=self.debug_restarts)
         if enable_print:
-            b = Board(n=self.n)
-            for k, v in self.queen_is.items():
-                b.set_queen(at=(k, v))
-            return [b]
-        else:
-            return None
+            result.to_board()
+        return result
 
     def break_ties_randomly(self) -> bool:
         """return True or False randomly
@@ -297,7 +995,8 @@ class MinConflictsEngine(Engine):
         Args:
             exponent (int): the indicator of uniform distribution
         """
-        if random.randint(0, self.random_ratio) == 0:
+        if self.random.randint(0, self.random_ratio) == 0:
+            self.debug_random_walks += 1
             return True
         return False
 
@@ -314,10 +1013,18 @@ class MinConflictsEngine(Engine):
         # put queen
         # self.current_state[given_row][given_column] = True
         self.queen_is[given_row] = given_column
+        self.queens_num += 1
 
-        self.conflicts_num_dict[MinConflictsEngine.COLUMN][given_column] += 1
-        self.conflicts_num_dict[MinConflictsEngine.DIAG_UP][given_row + given_column] += 1
-        self.conflicts_num_dict[MinConflictsEngine.DIAG_DOWN][given_row - given_column] += 1
+        # a queen is an extra one if the line already has a queen
+        column_dict = self.conflicts_num_dict[MinConflictsEngine.COLUMN]
+        diag_up_dict = self.conflicts_num_dict[MinConflictsEngine.DIAG_UP]
+        diag_down_dict = self.conflicts_num_dict[MinConflictsEngine.DIAG_DOWN]
+        diag_up = given_row + given_column
+        diag_down = given_row - given_column
+        self.conflicts_total += (column_dict[given_column] != 0) + (diag_up_dict[diag_up] != 0) + (diag_down_dict[diag_down] != 0)
+        column_dict[given_column] += 1
+        diag_up_dict[diag_up] += 1
+        diag_down_dict[diag_down] += 1
 
     def remove_queen(self, at: Tuple[int, int]) -> None:
         """remove queen on the board
@@ -336,7 +1043,14 @@ class MinConflictsEngine(Engine):
         # self.current_state[given_row][given_column] = False
 
         self.history.append(at)
+        self.queens_num -= 1
 
-        self.conflicts_num_dict[MinConflictsEngine.COLUMN][given_column] -= 1
-        self.conflicts_num_dict[MinConflictsEngine.DIAG_UP][given_row + given_column] -= 1
-        self.conflicts_num_dict[MinConflictsEngine.DIAG_DOWN][given_row - given_column] -= 1
+        column_dict = self.conflicts_num_dict[MinConflictsEngine.COLUMN]
+        diag_up_dict = self.conflicts_num_dict[MinConflictsEngine.DIAG_UP]
+        diag_down_dict = self.conflicts_num_dict[MinConflictsEngine.DIAG_DOWN]
+        diag_up = given_row + given_column
+        diag_down = given_row - given_column
+        column_dict[given_column] -= 1
+        diag_up_dict[diag_up] -= 1
+        diag_down_dict[diag_down] -= 1
+        self.conflicts_total -= (column_dict[given_column] != 0) + (diag_up_dict[diag_up] != 0) + (diag_down_dict[diag_down] != 0)
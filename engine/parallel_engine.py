@@ -0,0 +1,447 @@
+from models.model import Engine, SolveResult
+from utils.random_stream import RandomStream
+from array import array
+from multiprocessing import shared_memory
+from multiprocessing.synchronize import Barrier
+from typing import Dict, List
+import multiprocessing
+import numpy as np
+import os
+import time
+
+
+def shared_lengths(n: int) -> Dict[str, int]:
+    """get the length of each shared array of 32-bit integers
+
+    The arrays are the column of the queen on each row, the number of queens on each line,
+    and the list of empty columns with its length.
+
+    Args:
+        n (int): length of chess board
+    Returns:
+        (Dict[str, int]): name -> length
+    """
+    return {'columns': n, 'column_counts': n, 'diag_up_counts': 2 * n - 1, 'diag_down_counts': 2 * n - 1,
+            'free_columns': n, 'free_count': 1}
+
+
+class SharedCounters():
+    """int32 arrays in shared memory, seen as memoryviews for fast item access and as NumPy arrays for bulk work
+    """
+
+    def __init__(self, n: int, names: Dict[str, str] = None) -> None:
+        """create the arrays, or attach to the arrays created by another process
+
+        Args:
+            n (int): length of chess board
+            names (Dict[str, str]): array name -> name of the shared memory block. the arrays are created if None
+        """
+        self.owner: bool = names is None
+        self.blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self.views: Dict[str, memoryview] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, length in shared_lengths(n).items():
+            if self.owner:
+                # a new block is zero-filled
+                block = shared_memory.SharedMemory(create=True, size=max(4 * length, 1))
+            else:
+                block = shared_memory.SharedMemory(name=names[name])
+            self.blocks[name] = block
+            self.views[name] = block.buf[:4 * length].cast('i')
+            self.arrays[name] = np.ndarray((length,), dtype=np.int32, buffer=block.buf)
+
+    def names(self) -> Dict[str, str]:
+        """get the names to attach from the other processes
+
+        Returns:
+            (Dict[str, str]): array name -> name of the shared memory block
+        """
+        return {name: block.name for name, block in self.blocks.items()}
+
+    def close(self) -> None:
+        """detach from the arrays, and free them if this instance has created them
+        """
+        # views must be released before the blocks are closed
+        self.arrays = {}
+        for view in self.views.values():
+            view.release()
+        self.views = {}
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.blocks = {}
+
+
+class ParallelMinConflictsEngine(Engine):
+    """solve problem by min-conflicts on worker processes that share line counters
+
+    Rows are split into contiguous blocks, one for each worker process. The column of each queen and
+    the number of queens on each column and diagonal live in shared memory. A worker only moves queens
+    on its own rows, so the columns are always exact, but two workers can update the same counter at
+    once and lose one of the updates. The search therefore runs in rounds separated by a barrier:
+
+    1. each worker repairs conflicted rows of its block for up to `steps_per_round` steps,
+       in the way of the sampled search of the v6 engine
+    2. the main process recomputes all counters from the columns (reconciliation), which fixes
+       the races of the round, and checks if the board is a solution
+
+    Candidate columns of a move are `sample_size` random columns plus columns with no queen.
+    The empty columns are listed on reconciliation. They are what the v6 engine learns from its
+    move history, which cannot be shared cheaply between processes.
+    """
+
+    def __init__(self,
+                 n: int,
+                 workers: int = None,
+                 seed: int = None,
+                 sample_size: int = 32,
+                 noise: float = 0.05,
+                 steps_per_round: int = 1000,
+                 max_rounds: int = 200,
+                 min_rows_per_worker: int = 64) -> None:
+        """initialize instance
+
+        Args:
+            n (int): length of chess board
+            workers (int): the number of worker processes. Default the number of CPUs
+            seed (int): seed of the random streams. the initial board is reproducible if given,
+                but races between workers make the search itself nondeterministic
+            sample_size (int): the number of random columns examined on each move
+            noise (float): probability of moving a queen to a random column instead of the best one
+            steps_per_round (int): the maximum number of moves of each worker between reconciliations
+            max_rounds (int): the maximum number of rounds
+            min_rows_per_worker (int): fewer workers are used so that each block has at least these rows
+        """
+        self.n: int = n
+        self.workers: int = max(1, min(workers or os.cpu_count() or 1, n // min_rows_per_worker))
+        self.seed: int = seed
+        self.sample_size: int = sample_size
+        self.noise: float = noise
+        self.steps_per_round: int = steps_per_round
+        self.max_rounds: int = max_rounds
+
+        # the column of the queen on each row after solve
+        self.columns: array = array('i')
+        self.conflicts_total: int = 0
+
+        # variables for debug
+        self.debug_duration_seconds: float = 0
+        self.debug_steps: int = 0
+        self.debug_rounds: int = 0
+        self.debug_reconcile_seconds: float = 0
+
+    def solve(self, enable_print: bool = False) -> SolveResult:
+        """solve problem
+
+        Args:
+            enable_print (bool): build the result board now if True, otherwise it is built on access
+        Returns:
+            result (SolveResult): the placement, which also works as the list of the result board
+        """
+        start_time = time.time()
+        if self.n == 0:
+            self.columns = array('i')
+            self.conflicts_total = 0
+            return SolveResult(n=0, columns=self.columns, seed=self.seed)
+
+        counters = SharedCounters(n=self.n)
+        ctx = multiprocessing.get_context()
+        barrier = ctx.Barrier(self.workers + 1)
+        stop = ctx.Value('b', 0, lock=False)
+        steps = ctx.Array('q', self.workers, lock=False)
+        processes = []
+        try:
+            # disjoint pools of columns for the blocks, so the initial board has no column conflicts
+            columns = list(range(self.n))
+            RandomStream(seed=self.seed).shuffle(columns)
+            counters.arrays['columns'][:] = columns
+
+            bounds = [self.n * i // self.workers for i in range(self.workers + 1)]
+            for worker_id in range(self.workers):
+                p = ctx.Process(target=run_worker, kwargs={
+                    'n': self.n,
+                    'names': counters.names(),
+                    'worker_id': worker_id,
+                    'start_row': bounds[worker_id],
+                    'end_row': bounds[worker_id + 1],
+                    'seed': None if self.seed is None else self.seed * self.workers + worker_id + 1,
+                    'sample_size': self.sample_size,
+                    'noise': self.noise,
+                    'steps_per_round': self.steps_per_round,
+                    'barrier': barrier,
+                    'stop': stop,
+                    'steps': steps,
+                })
+                p.start()
+                processes.append(p)
+
+            # wait for the initialization of all blocks
+            barrier.wait()
+            for round_num in range(self.max_rounds + 1):
+                reconcile_start_time = time.time()
+                self.conflicts_total = reconcile(counters=counters, n=self.n)
+                self.debug_reconcile_seconds += time.time() - reconcile_start_time
+                if self.conflicts_total == 0 or round_num == self.max_rounds:
+                    stop.value = 1
+                    barrier.wait()
+                    break
+                # start the round, and wait for its end
+                barrier.wait()
+                barrier.wait()
+                self.debug_rounds += 1
+
+            for p in processes:
+                p.join()
+            # the int32 block is copied as it is, without a Python list
+            self.columns = array('i', counters.arrays['columns'].tobytes())
+            self.debug_steps = sum(steps)
+        except BaseException:
+            barrier.abort()
+            for p in processes:
+                p.terminate()
+                p.join()
+            raise
+        finally:
+            counters.close()
+
+        self.debug_duration_seconds = time.time() - start_time
+        result = SolveResult(n=self.n, columns=self.columns, steps=self.debug_steps, duration_seconds=self.debug_duration_seconds,
+                             seed=self.seed, conflicts=self.conflicts_total)
+        if enable_print:
+            result.to_board()
+        return result
+
+    def has_solution(self) -> bool:
+        """check if the queens on the board are a solution
+
+        Returns:
+            (bool): True if the last reconciliation found no conflicts
+        """
+        return len(self.columns) == self.n and self.conflicts_total == 0
+
+
+def reconcile(counters: SharedCounters, n: int) -> int:
+    """recompute counters and empty columns from the columns of the queens
+
+    Args:
+        counters (SharedCounters): shared arrays. workers must be waiting on the barrier
+        n (int): length of chess board
+    Returns:
+        (int): the number of extra queens on each column and diagonal
+    """
+    a = counters.arrays
+    columns = a['columns'].astype(np.int64)
+    rows = np.arange(n, dtype=np.int64)
+    a['column_counts'][:] = np.bincount(columns, minlength=n)
+    a['diag_up_counts'][:] = np.bincount(rows + columns, minlength=2 * n - 1)
+    a['diag_down_counts'][:] = np.bincount(rows - columns + n - 1, minlength=2 * n - 1)
+
+    free_columns = np.flatnonzero(a['column_counts'] == 0)
+    a['free_columns'][:len(free_columns)] = free_columns
+    a['free_count'][0] = len(free_columns)
+
+    conflicts = 0
+    for name in ['column_counts', 'diag_up_counts', 'diag_down_counts']:
+        conflicts += int(np.maximum(a[name] - 1, 0).sum())
+    return conflicts
+
+
+def run_worker(n: int,
+               names: Dict[str, str],
+               worker_id: int,
+               start_row: int,
+               end_row: int,
+               seed: int,
+               sample_size: int,
+               noise: float,
+               steps_per_round: int,
+               barrier: Barrier,
+               stop: multiprocessing.Value,
+               steps: multiprocessing.Array) -> None:
+    """initialize the block and repair it round by round until the main process stops
+
+    Args:
+        n (int): length of chess board
+        names (Dict[str, str]): names of the shared memory blocks
+        worker_id (int): index of the worker
+        start_row (int): the first row of the block
+        end_row (int): the row where the block ends
+        seed (int): seed of the random stream
+        sample_size (int): the number of random columns examined on each move
+        noise (float): probability of moving a queen to a random column
+        steps_per_round (int): the maximum number of moves in a round
+        barrier (Barrier): barrier shared with the other workers and the main process
+        stop (multiprocessing.Value): set to 1 by the main process to stop workers
+        steps (multiprocessing.Array): the number of moves of each worker
+    """
+    counters = SharedCounters(n=n, names=names)
+    worker = None
+    try:
+        worker = BlockWorker(counters=counters, n=n, start_row=start_row, end_row=end_row,
+                             random=RandomStream(seed=seed), sample_size=sample_size, noise=noise)
+        worker.initialize()
+        barrier.wait()
+        while True:
+            # wait for the reconciliation
+            barrier.wait()
+            if stop.value:
+                break
+            steps[worker_id] += worker.repair(max_steps=steps_per_round)
+            barrier.wait()
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        del worker
+        counters.close()
+
+
+class BlockWorker():
+    """min-conflicts on the rows of a block
+    """
+
+    def __init__(self, counters: SharedCounters, n: int, start_row: int, end_row: int, random: RandomStream,
+                 sample_size: int, noise: float) -> None:
+        """initialize instance
+
+        Args:
+            counters (SharedCounters): shared arrays
+            n (int): length of chess board
+            start_row (int): the first row of the block
+            end_row (int): the row where the block ends
+            random (RandomStream): random stream of this worker
+            sample_size (int): the number of random columns examined on each move
+            noise (float): probability of moving to a random column instead of the best one
+        """
+        self.counters: SharedCounters = counters
+        self.n: int = n
+        self.start_row: int = start_row
+        self.end_row: int = end_row
+        self.random: RandomStream = random
+        self.sample_size: int = sample_size
+        self.noise: float = noise
+
+    def initialize(self) -> None:
+        """place queens of the block greedily on the columns given to the block
+
+        Each row takes the first column of the pool with free diagonals among up to sample_size tries,
+        like the initialization of the v6 engine. Workers place queens at the same time, so two queens
+        can still meet on a diagonal, which is repaired later.
+        """
+        v = self.counters.views
+        columns, column_counts, diag_up_counts, diag_down_counts = (
+            v['columns'], v['column_counts'], v['diag_up_counts'], v['diag_down_counts'])
+        n = self.n
+        pool = columns[self.start_row:self.end_row].tolist()
+        self.random.shuffle(pool)
+
+        for row in range(self.start_row, self.end_row):
+            best_i = 0
+            best_c = n
+            for i in range(min(self.sample_size, len(pool))):
+                column = pool[-1 - i]
+                c = diag_up_counts[row + column] + diag_down_counts[row - column + n - 1]
+                if c < best_c:
+                    best_i = i
+                    best_c = c
+                    if c == 0:
+                        break
+            # swap-remove the chosen column from the pool
+            column = pool[-1 - best_i]
+            pool[-1 - best_i] = pool[-1]
+            pool.pop()
+
+            columns[row] = column
+            column_counts[column] += 1
+            diag_up_counts[row + column] += 1
+            diag_down_counts[row - column + n - 1] += 1
+
+    def conflicted_rows(self) -> List[int]:
+        """get rows of the block whose queen has conflicts
+
+        Returns:
+            (List[int]): rows
+        """
+        a = self.counters.arrays
+        n = self.n
+        rows = np.arange(self.start_row, self.end_row, dtype=np.int64)
+        columns = a['columns'][self.start_row:self.end_row].astype(np.int64)
+        counts = a['column_counts'][columns] + a['diag_up_counts'][rows + columns] + a['diag_down_counts'][rows - columns + n - 1]
+        return (np.flatnonzero(counts > 3) + self.start_row).tolist()
+
+    def repair(self, max_steps: int) -> int:
+        """move queens of conflicted rows to the columns with the fewest conflicts
+
+        Args:
+            max_steps (int): the maximum number of moves
+        Returns:
+            (int): the number of moves
+        """
+        v = self.counters.views
+        columns, column_counts, diag_up_counts, diag_down_counts = (
+            v['columns'], v['column_counts'], v['diag_up_counts'], v['diag_down_counts'])
+        n = self.n
+        free_columns = v['free_columns'][:v['free_count'][0]].tolist()
+        conflicted = self.conflicted_rows()
+        # queens attacked by a move are not in the list, so the list is rebuilt after a while
+        next_scan_step = 2 * len(conflicted) + 16
+
+        step = 0
+        while step < max_steps and len(conflicted) != 0:
+            step += 1
+            if step == next_scan_step:
+                conflicted = self.conflicted_rows()
+                next_scan_step = step + 2 * len(conflicted) + 16
+                if len(conflicted) == 0:
+                    break
+            i = self.random.randrange(len(conflicted))
+            row = conflicted[i]
+            column = columns[row]
+            current_c = column_counts[column] + diag_up_counts[row + column] + diag_down_counts[row - column + n - 1] - 3
+            if current_c <= 0:
+                # repaired by moves of the other rows
+                conflicted[i] = conflicted[-1]
+                conflicted.pop()
+                continue
+
+            candidates = [self.random.randrange(n) for _ in range(self.sample_size)]
+            if len(free_columns) <= self.sample_size:
+                candidates.extend(free_columns)
+            else:
+                offset = self.random.randrange(len(free_columns) - self.sample_size + 1)
+                candidates.extend(free_columns[offset:offset + self.sample_size])
+            best_column = column
+            best_c = current_c
+            if self.random.random() < self.noise:
+                # random walk out of local minima and plateaus, as break_ties_randomly does in the v6 engine
+                best_column = candidates[0]
+                best_c = column_counts[best_column] + diag_up_counts[row + best_column] + diag_down_counts[row - best_column + n - 1]
+            else:
+                for c_column in candidates:
+                    if c_column == column:
+                        continue
+                    c = column_counts[c_column] + diag_up_counts[row + c_column] + diag_down_counts[row - c_column + n - 1]
+                    # moving to a column as good as the current one is allowed, so plateaus can be crossed
+                    if c <= best_c:
+                        best_column = c_column
+                        best_c = c
+                        if c == 0:
+                            break
+            if best_column == column:
+                continue
+
+            column_counts[column] -= 1
+            if column_counts[column] == 0:
+                # freed columns are candidates of the next moves also in this round
+                free_columns.append(column)
+            diag_up_counts[row + column] -= 1
+            diag_down_counts[row - column + n - 1] -= 1
+            columns[row] = best_column
+            column_counts[best_column] += 1
+            diag_up_counts[row + best_column] += 1
+            diag_down_counts[row - best_column + n - 1] += 1
+            if best_c == 0:
+                conflicted[i] = conflicted[-1]
+                conflicted.pop()
+        return step
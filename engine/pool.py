@@ -0,0 +1,118 @@
+from models.model import Engine
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+import threading
+
+
+class EnginePool():
+    """idle engines kept by n, which are reset and lent again instead of constructed
+
+    Engines must have reset(seed), which keeps their counters allocated. A borrowed engine belongs to
+    the borrower until it is released, so the pool can be shared by threads. The memory of an engine
+    grows with n, so the pool is bounded by the sum of n of idle engines: over `max_total_n`, the ones
+    of the n released least recently are dropped. Engines over `max_pooled_n` are never kept.
+    """
+
+    def __init__(self,
+                 factory: Callable[[int, int], Engine],
+                 max_idle: int = 1,
+                 max_total_n: int = None,
+                 max_pooled_n: int = None) -> None:
+        """initialize instance
+
+        Args:
+            factory (Callable[[int, int], Engine]): function that takes n and seed and returns a new engine
+            max_idle (int): the maximum number of idle engines kept for each n
+            max_total_n (int): the maximum sum of n of idle engines. not bounded if None
+            max_pooled_n (int): the maximum n of engines kept. not bounded if None
+        """
+        if max_idle < 0:
+            raise ValueError(f'max_idle must not be negative: {max_idle}')
+        if max_total_n is not None and max_total_n < 0:
+            raise ValueError(f'max_total_n must not be negative: {max_total_n}')
+        if max_pooled_n is not None and max_pooled_n < 0:
+            raise ValueError(f'max_pooled_n must not be negative: {max_pooled_n}')
+        self.factory: Callable[[int, int], Engine] = factory
+        self.max_idle: int = max_idle
+        self.max_total_n: int = max_total_n
+        self.max_pooled_n: int = max_pooled_n
+        self.lock: threading.Lock = threading.Lock()
+        # n -> idle engines, in the order of the last release
+        self.idle: Dict[int, List[Engine]] = OrderedDict()
+        # the sum of n of idle engines
+        self.idle_total_n: int = 0
+
+        # the number of engines constructed and the number of borrows served by an idle engine
+        self.created: int = 0
+        self.reused: int = 0
+
+    def acquire(self, n: int, seed: int = None) -> Engine:
+        """borrow an engine ready to solve
+
+        Args:
+            n (int): length of chess board
+            seed (int): seed of the engine. the solve is reproducible if given
+        Returns:
+            (Engine): an idle engine reset with the seed, or a new one created with the seed if none is idle
+        """
+        with self.lock:
+            engines = self.idle.get(n)
+            engine = engines.pop() if engines else None
+            if engine is None:
+                self.created += 1
+            else:
+                self.idle_total_n -= n
+                self.reused += 1
+
+        if engine is None:
+            return self.factory(n, seed)
+        engine.reset(seed=seed)
+        return engine
+
+    def release(self, engine: Engine) -> None:
+        """return the engine, which is dropped if max_idle engines of the n are already idle or it is too large
+
+        Args:
+            engine (Engine): engine got by acquire
+        """
+        n = engine.n
+        if (self.max_pooled_n is not None and n > self.max_pooled_n) or (self.max_total_n is not None and n > self.max_total_n):
+            return
+        with self.lock:
+            engines = self.idle.setdefault(n, [])
+            self.idle.move_to_end(n)
+            if len(engines) >= self.max_idle:
+                return
+            engines.append(engine)
+            self.idle_total_n += n
+            while self.max_total_n is not None and self.idle_total_n > self.max_total_n:
+                oldest_n, oldest = next(iter(self.idle.items()))
+                if len(oldest) == 0:
+                    del self.idle[oldest_n]
+                    continue
+                oldest.pop(0)
+                self.idle_total_n -= oldest_n
+
+    @contextmanager
+    def borrow(self, n: int, seed: int = None) -> Iterator[Engine]:
+        """borrow an engine for the with block
+
+        Args:
+            n (int): length of chess board
+            seed (int): seed of the engine. the solve is reproducible if given
+        Returns:
+            (Iterator[Engine]): the engine, released at the end of the block
+        """
+        engine = self.acquire(n=n, seed=seed)
+        try:
+            yield engine
+        finally:
+            self.release(engine)
+
+    def clear(self) -> None:
+        """drop all idle engines
+        """
+        with self.lock:
+            self.idle.clear()
+            self.idle_total_n = 0
@@ -0,0 +1,102 @@
+from models.model import Engine, EngineInfo
+from typing import Any, Dict, List
+import importlib
+
+FIRST = EngineInfo.FIRST
+COUNT = EngineInfo.COUNT
+SAMPLE = EngineInfo.SAMPLE
+TRACE = EngineInfo.TRACE
+CHECKPOINT = EngineInfo.CHECKPOINT
+ASYNC = EngineInfo.ASYNC
+SEEDED = EngineInfo.SEEDED
+RESTART = EngineInfo.RESTART
+OBSERVE = EngineInfo.OBSERVE
+RESET = EngineInfo.RESET
+COMPLETE = EngineInfo.COMPLETE
+
+# engine name -> metadata. implementations are imported only when an engine is created
+ENGINES: Dict[str, EngineInfo] = {info.name: info for info in [
+    EngineInfo(name='v1', module='engine.minconflicts_engine', class_name='MinConflictsEngine', kwargs={'version': 1},
+               modes=(FIRST, SEEDED), memory=EngineInfo.QUADRATIC, description='min-conflicts on a boolean board', max_n=50),
+    EngineInfo(name='v3', module='engine.minconflicts_engine_3', class_name='MinConflictsEngine', kwargs={},
+               modes=(FIRST,), memory=EngineInfo.QUADRATIC, description='min-conflicts with a conflicts table', max_n=150),
+    EngineInfo(name='v4', module='engine.minconflicts_engine_4', class_name='MinConflictsEngine', kwargs={},
+               modes=(FIRST,), memory=EngineInfo.QUADRATIC, description='min-conflicts with line counters', max_n=200),
+    EngineInfo(name='v5', module='engine.minconflicts_engine_5', class_name='MinConflictsEngine', kwargs={},
+               modes=(FIRST,), memory=EngineInfo.QUADRATIC, description='min-conflicts with line counters and a queue', max_n=100),
+    EngineInfo(name='v6', module='engine.minconflicts_engine_6', class_name='MinConflictsEngine', kwargs={},
+               modes=(FIRST, SAMPLE, TRACE, CHECKPOINT, ASYNC, SEEDED, RESTART, OBSERVE, RESET), memory=EngineInfo.LINEAR,
+               description='min-conflicts with line counters and move history', max_n=5000),
+    EngineInfo(name='v6_breakout', module='engine.minconflicts_engine_6', class_name='MinConflictsEngine', kwargs={'breakout': True},
+               modes=(FIRST, SAMPLE, TRACE, CHECKPOINT, ASYNC, SEEDED, RESTART, OBSERVE, RESET), memory=EngineInfo.LINEAR,
+               description='v6 with line weights raised at local minima', max_n=5000),
+    EngineInfo(name='v6_adaptive', module='engine.minconflicts_engine_6', class_name='MinConflictsEngine', kwargs={'adaptive_noise': True},
+               modes=(FIRST, SAMPLE, TRACE, CHECKPOINT, ASYNC, SEEDED, RESTART, OBSERVE, RESET), memory=EngineInfo.LINEAR,
+               description='v6 with random moves by adaptive noise', max_n=5000),
+    EngineInfo(name='simple', module='engine.simple_engine', class_name='SimpleEngine', kwargs={},
+               modes=(FIRST, COMPLETE), memory=EngineInfo.QUADRATIC, description='brute force over permutations', max_n=8),
+    EngineInfo(name='dfs', module='engine.dfs_engine', class_name='DFSEngine', kwargs={},
+               modes=(FIRST, COMPLETE), memory=EngineInfo.LINEAR, description='depth-first search with MRV and forward checking', max_n=500),
+    EngineInfo(name='parallel', module='engine.parallel_engine', class_name='ParallelMinConflictsEngine', kwargs={},
+               modes=(FIRST, SEEDED), memory=EngineInfo.LINEAR,
+               description='min-conflicts on worker processes over shared-memory counters', max_n=20000),
+    EngineInfo(name='batch', module='engine.batch_engine', class_name='BatchMinConflictsEngine', kwargs={},
+               modes=(FIRST, SEEDED, RESET), memory=EngineInfo.LINEAR,
+               description='vectorized min-conflicts on many boards at once', max_n=100),
+    EngineInfo(name='count', module='engine.counting_engine', class_name='CountingEngine', kwargs={},
+               modes=(COUNT, COMPLETE), memory=EngineInfo.LINEAR, description='count solutions by bitmask backtracking', max_n=12),
+    EngineInfo(name='count_numpy', module='engine.counting_engine', class_name='NumpyCountingEngine', kwargs={},
+               modes=(COUNT, COMPLETE), memory=EngineInfo.LINEAR, description='count solutions by batched NumPy backtracking', max_n=13),
+]}
+
+
+def get_engine_info(name: str) -> EngineInfo:
+    """get the metadata of the engine
+
+    Args:
+        name (str): engine name
+    Returns:
+        (EngineInfo): metadata
+    Raises:
+        ValueError: if the engine is unknown
+    """
+    if name not in ENGINES:
+        raise ValueError(f'unknown engine: {name}')
+    return ENGINES[name]
+
+
+def get_engine_names(mode: str = None) -> List[str]:
+    """get names of engines
+
+    Args:
+        mode (str): only engines supporting the mode if given
+    Returns:
+        (List[str]): engine names
+    """
+    return [name for name, info in ENGINES.items() if mode is None or mode in info.modes]
+
+
+def get_engine_class(name: str) -> type:
+    """import the engine and get its class
+
+    Args:
+        name (str): engine name
+    Returns:
+        (type): class of the engine
+    """
+    info = get_engine_info(name)
+    return getattr(importlib.import_module(info.module), info.class_name)
+
+
+def create_engine(name: str, n: int, **kwargs: Any) -> Engine:
+    """import the engine and create an instance
+
+    Args:
+        name (str): engine name
+        n (int): length of chess board
+        kwargs: keyword arguments passed to the engine, which override the ones of the registry
+    Returns:
+        (Engine): engine
+    """
+    info = get_engine_info(name)
+    return get_engine_class(name)(n=n, **dict(info.kwargs, **kwargs))
@@ -0,0 +1,83 @@
+from engine.batch_engine import BatchMinConflictsEngine
+from utils.util import validate_columns
+import numpy as np
+import pytest
+
+
+def test_solve():
+    """test for solve
+    """
+    for i in [0, 1, 4, 5, 8, 20]:
+        e = BatchMinConflictsEngine(n=i, boards=300, seed=0, batch_size=64)
+        result = e.solve()
+        assert e.has_solution()
+        assert e.solutions.shape == (300, i)
+        assert all(validate_columns(columns) for columns in e.solutions.tolist())
+        # the result is the first board
+        assert result.is_solution()
+        assert list(result.columns) == e.columns == e.solutions[0].tolist()
+        assert result.steps == e.steps[0]
+
+    e = BatchMinConflictsEngine(n=8, seed=0)
+    b = e.solve(enable_print=True)
+    assert all(b[0].board[row][column] is not None for row, column in enumerate(e.columns))
+
+    with pytest.raises(ValueError):
+        BatchMinConflictsEngine(n=8, boards=0)
+
+
+def test_no_solution():
+    """test for n without solutions
+    """
+    for i in [2, 3]:
+        e = BatchMinConflictsEngine(n=i, boards=10, seed=0, max_steps=20)
+        result = e.solve()
+        assert not e.has_solution()
+        assert not result.is_solution()
+        assert e.steps.tolist() == [20] * 10
+        assert e.debug_steps == 200
+
+
+def test_seed():
+    """test that boards are reproducible with the same seed
+    """
+    e1 = BatchMinConflictsEngine(n=12, boards=50, seed=3)
+    e1.solve()
+    e2 = BatchMinConflictsEngine(n=12, boards=50, seed=3)
+    e2.solve()
+    assert np.array_equal(e1.solutions, e2.solutions)
+    assert np.array_equal(e1.steps, e2.steps)
+    # boards differ from each other
+    assert len({tuple(columns) for columns in e1.solutions.tolist()}) > 1
+
+
+def test_results():
+    """test for results and new_boards
+    """
+    e = BatchMinConflictsEngine(n=8, boards=20, seed=1, batch_size=7)
+    e.solve()
+    results = e.results()
+    assert len(results) == 20
+    assert all(r.is_solution() for r in results)
+    assert [r.steps for r in results] == e.steps.tolist()
+
+    # counters of new boards match their columns
+    columns, column_counts, diag_up_counts, diag_down_counts = e.new_boards(count=5)
+    for board in range(5):
+        assert sorted(columns[board].tolist()) == list(range(8))
+        assert column_counts[board].tolist() == [1] * 8
+        assert diag_up_counts[board].tolist() == np.bincount(np.arange(8) + columns[board], minlength=15).tolist()
+        assert diag_down_counts[board].tolist() == np.bincount(np.arange(8) - columns[board] + 7, minlength=15).tolist()
+
+
+def test_reset():
+    """test for reset
+    """
+    e = BatchMinConflictsEngine(n=8, boards=10, seed=1)
+    e.solve()
+    e.reset(seed=2)
+    assert len(e.solved) == 0
+    e.solve()
+    expected = BatchMinConflictsEngine(n=8, boards=10, seed=2)
+    expected.solve()
+    assert e.solutions.tolist() == expected.solutions.tolist()
@@ -0,0 +1,28 @@
+from engine.counting_engine import CountingEngine, NumpyCountingEngine, popcount
+from models.model import KNOWN_COUNTS
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize(['i', 'expected_result_num'], [(i, KNOWN_COUNTS[i]) for i in range(1, 11)])
+def test_count(i, expected_result_num):
+    """test for count
+    """
+    e = CountingEngine(n=i)
+    assert e.solve() == []
+    assert e.solution_count == expected_result_num
+
+    e = NumpyCountingEngine(n=i)
+    assert e.solve() == []
+    assert e.solution_count == expected_result_num
+
+    # frontiers are split into many small batches
+    e = NumpyCountingEngine(n=i, batch_size=3)
+    assert e.count() == expected_result_num
+
+
+def test_popcount():
+    """test for popcount
+    """
+    x = np.array([0, 1, 3, 0xff, (1 << 64) - 1], dtype=np.uint64)
+    assert popcount(x).tolist() == [0, 1, 2, 8, 64]
@@ -1,5 +1,6 @@
 from engine.simple_engine import SimpleEngine
 from engine.minconflicts_engine import MinConflictsEngine
+from models.model import KNOWN_COUNTS
 import datetime
 import pytest
 
@@ -19,7 +20,7 @@ def test_solve_simple_engine():
 
 
 @pytest.mark.skip(reason='takes too long time')
-@pytest.mark.parametrize(['i', 'expected_result_num'], [(1, 1), (2, 0), (3, 0), (4, 2), (5, 10), (6, 4), (7, 40), (8, 92), (9, 352)])
+@pytest.mark.parametrize(['i', 'expected_result_num'], [(i, KNOWN_COUNTS[i]) for i in range(1, 10)])
 def test_solve(i, expected_result_num):
     """test for solve()
     """
@@ -0,0 +1,45 @@
+from engine.dfs_engine import DFSEngine
+from utils.util import validate_columns
+import pytest
+
+
+def test_solve():
+    """test for solve
+    """
+    for i in list(range(0, 31)) + [100, 150]:
+        e = DFSEngine(n=i)
+        b = e.solve()
+        if i in [2, 3]:
+            assert len(b) == 0
+            assert not b.is_solution()
+            assert not e.has_solution()
+            continue
+        assert len(b) == 1
+        assert b.is_solution()
+        assert e.has_solution()
+        assert validate_columns(e.columns)
+        assert all(b[0].board[row][column] is not None for row, column in enumerate(e.columns))
+
+
+def test_solve_lcv():
+    """test for solve with LCV
+    """
+    for i in [1, 4, 8, 30]:
+        e = DFSEngine(n=i, value_order=DFSEngine.LCV)
+        assert len(e.solve()) == 1
+        assert validate_columns(e.columns)
+
+    with pytest.raises(ValueError):
+        DFSEngine(n=8, value_order='unknown')
+
+
+def test_deterministic():
+    """test that the same solution is found on each run, also after restarts
+    """
+    e1 = DFSEngine(n=60)
+    e1.restart_search(initial_node_limit=1)
+    e2 = DFSEngine(n=60)
+    e2.restart_search(initial_node_limit=1)
+    assert e1.debug_restarts > 0
+    assert e1.columns == e2.columns
+    assert validate_columns(e1.columns)
@@ -224,19 +224,30 @@ def test_solve_minconflicts_simple_for_ver3():
         assert len(b) == 1
 
 
-def test_get_updated_items():
-    """test for put_queen
+def test_get_updated_segments():
+    """test for get_updated_segments
     """
     e = MinConflictsEngine(n=3)
-    assert set(e.get_updated_items(at=(0, 0))) == {(1, 0), (2, 0), (1, 1), (2, 2)}
-    assert set(e.get_updated_items(at=(0, 1))) == {(1, 1), (2, 1), (1, 0), (1, 2)}
-    assert set(e.get_updated_items(at=(0, 2))) == {(1, 2), (2, 2), (1, 1), (2, 0)}
-    assert set(e.get_updated_items(at=(1, 0))) == {(0, 0), (2, 0), (0, 1), (2, 1)}
-    assert set(e.get_updated_items(at=(1, 1))) == {(0, 1), (2, 1), (0, 0), (2, 2), (0, 2), (2, 0)}
-    assert set(e.get_updated_items(at=(1, 2))) == {(0, 2), (2, 2), (0, 1), (2, 1)}
-    assert set(e.get_updated_items(at=(2, 0))) == {(0, 0), (1, 0), (1, 1), (0, 2)}
-    assert set(e.get_updated_items(at=(2, 1))) == {(0, 1), (1, 1), (1, 0), (1, 2)}
-    assert set(e.get_updated_items(at=(2, 2))) == {(0, 2), (1, 2), (0, 0), (1, 1)}
+
+    def cells(at):
+        # expand the slices of conflicts_flat into (row, column)
+        return {divmod(i, 3) for segment in e.get_updated_segments(at=at) for i in range(9)[segment]}
+
+    assert cells(at=(0, 0)) == {(1, 0), (2, 0), (1, 1), (2, 2)}
+    assert cells(at=(0, 1)) == {(1, 1), (2, 1), (1, 0), (1, 2)}
+    assert cells(at=(0, 2)) == {(1, 2), (2, 2), (1, 1), (2, 0)}
+    assert cells(at=(1, 0)) == {(0, 0), (2, 0), (0, 1), (2, 1)}
+    assert cells(at=(1, 1)) == {(0, 1), (2, 1), (0, 0), (2, 2), (0, 2), (2, 0)}
+    assert cells(at=(1, 2)) == {(0, 2), (2, 2), (0, 1), (2, 1)}
+    assert cells(at=(2, 0)) == {(0, 0), (1, 0), (1, 1), (0, 2)}
+    assert cells(at=(2, 1)) == {(0, 1), (1, 1), (1, 0), (1, 2)}
+    assert cells(at=(2, 2)) == {(0, 2), (1, 2), (0, 0), (1, 1)}
+
+    # a queen on one side limits the segment up to the queen, and queens on both sides leave the line as it is
+    e.put_queen(at=(0, 0))
+    assert cells(at=(1, 0)) == {(0, 0), (0, 1), (2, 1)}
+    e.put_queen(at=(2, 0))
+    assert cells(at=(1, 0)) == {(0, 1), (2, 1)}
 
 
 def test_put_and_remove_queen():
@@ -245,33 +256,27 @@ def test_put_and_remove_queen():
     e = MinConflictsEngine(n=3)
 
     e.put_queen(at=(1, 1))
-    assert e.conflicts_table == [[1, 1, 1], [0, 0, 0], [1, 1, 1]]
+    assert e.conflicts_table.tolist() == [[1, 1, 1], [0, 0, 0], [1, 1, 1]]
     e.put_queen(at=(0, 1))
-    assert e.conflicts_table == [[1, 1, 1], [1, 1, 1], [1, 1, 1]]
+    assert e.conflicts_table.tolist() == [[1, 1, 1], [1, 1, 1], [1, 1, 1]]
     e.put_queen(at=(2, 1))
-    assert e.conflicts_table == [[1, 1, 1], [2, 2, 2], [1, 1, 1]]
+    assert e.conflicts_table.tolist() == [[1, 1, 1], [2, 2, 2], [1, 1, 1]]
     e.remove_queen(at=(2, 1))
-    assert e.conflicts_table == [[1, 1, 1], [1, 1, 1], [1, 1, 1]]
+    assert e.conflicts_table.tolist() == [[1, 1, 1], [1, 1, 1], [1, 1, 1]]
     e.put_queen(at=(2, 0))
-    assert e.conflicts_table == [[2, 1, 1], [2, 2, 1], [1, 1, 1]]
+    assert e.conflicts_table.tolist() == [[2, 1, 1], [2, 2, 1], [1, 1, 1]]
     e.remove_queen(at=(2, 0))
-    assert e.conflicts_table == [[1, 1, 1], [1, 1, 1], [1, 1, 1]]
+    assert e.conflicts_table.tolist() == [[1, 1, 1], [1, 1, 1], [1, 1, 1]]
     e.put_queen(at=(2, 2))
-    assert e.conflicts_table == [[1, 1, 2], [1, 2, 2], [1, 1, 1]]
+    assert e.conflicts_table.tolist() == [[1, 1, 2], [1, 2, 2], [1, 1, 1]]
     e.remove_queen(at=(0, 1))
-    assert e.conflicts_table == [[1, 1, 2], [0, 1, 1], [1, 1, 1]]
+    assert e.conflicts_table.tolist() == [[1, 1, 2], [0, 1, 1], [1, 1, 1]]
     e.put_queen(at=(0, 0))
-    assert e.conflicts_table == [[1, 1, 2], [1, 2, 1], [2, 1, 1]]
+    assert e.conflicts_table.tolist() == [[1, 1, 2], [1, 2, 1], [2, 1, 1]]
     e.remove_queen(at=(0, 0))
-    assert e.conflicts_table == [[1, 1, 2], [0, 1, 1], [1, 1, 1]]
+    assert e.conflicts_table.tolist() == [[1, 1, 2], [0, 1, 1], [1, 1, 1]]
     e.put_queen(at=(0, 2))
-    assert e.conflicts_table == [[1, 1, 2], [0, 2, 2], [1, 1, 2]]
-
-    # test for conflicts dict is valid
-    # TODO: delete
-    # assert e.conflicts_dict == {0: {0: set(), 1: {1, 0}, 2: {2}, 3: set(), 4: set(), 5: set(), 6: set()},
-    #                             1: {0: {0}, 1: set(), 2: {2, 1}, 3: set(), 4: set(), 5: set(), 6: set()},
-    #                             2: {0: set(), 1: {1, 0}, 2: {2}, 3: set(), 4: set(), 5: set(), 6: set()}}
+    assert e.conflicts_table.tolist() == [[1, 1, 2], [0, 2, 2], [1, 1, 2]]
 
     # try put and remove queens for 100 times and confirm the last state is all zeros
     for _ in range(100):
@@ -284,7 +289,7 @@ def test_put_and_remove_queen():
             item = random.choice(items)
             e.remove_queen(at=item)
             items.remove(item)
-        assert e.conflicts_table == [[0 for _ in range(8)] for _ in range(8)]
+        assert e.conflicts_table.tolist() == [[0 for _ in range(8)] for _ in range(8)]
 
 
 def test_solve_minconflicts_simple_for_ver4():
@@ -303,3 +308,47 @@ def test_solve_minconflicts_simple_for_ver5():
         e = MinConflictsEngine(n=i, version=5)
         b = e.solve()
         assert len(b) == 1
+
+
+def test_conflicts_table():
+    """test that conflicts table agrees with conflicts count of version 4
+    """
+    for n in [1, 2, 5, 8, 13]:
+        e = MinConflictsEngine(n=n, version=5)
+        e4 = MinConflictsEngine(n=n, version=4)
+        e4.current_state = e.current_state
+        columns = [random.randint(0, n - 1) for _ in range(n)]
+        for row in random.sample(range(n), n):
+            e.put_queen(at=(row, columns[row]))
+        for _ in range(3 * n):
+            row = random.randint(0, n - 1)
+            column = random.randint(0, n - 1)
+            e.move(previous=(row, columns[row]), after=(row, column))
+            columns[row] = column
+        for row in range(n):
+            for column in range(n):
+                assert e.get_conflicts_count(at=(row, column))[0] == e4.get_conflicts_count(at=(row, column))[0]
+
+
+def test_seed():
+    """test that the search is reproducible with the same seed
+    """
+    e1 = MinConflictsEngine(n=30, version=5, seed=3)
+    e1.solve()
+    e2 = MinConflictsEngine(n=30, version=5, seed=3)
+    e2.solve()
+    assert e1.current_state == e2.current_state
+    assert e1.debug_steps == e2.debug_steps
+
+
+def test_search_next_unit_minimum():
+    """test that version 5 chooses a column with the minimum conflicts count of the row
+    """
+    for n in [1, 2, 3, 5, 8, 13]:
+        e = MinConflictsEngine(n=n, version=5)
+        columns = [random.randint(0, n - 1) for _ in range(n)]
+        for row in range(n):
+            e.put_queen(at=(row, columns[row]))
+        for row in range(n):
+            _, column = e.search_next_unit(unit=(row, columns[row]), randomly=False)
+            assert e.conflicts_table[row][column] == e.conflicts_table[row].min()
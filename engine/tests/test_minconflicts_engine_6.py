@@ -0,0 +1,324 @@
+from engine.minconflicts_engine_6 import MinConflictsEngine
+from models.model import SolveStatus
+from utils.checkpoint import load_checkpoint
+from utils.restart import GeometricRestarts, LubyRestarts, StagnationRestarts
+from utils.util import validate_columns
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+import pytest
+
+
+def test_solve():
+    """test for solve
+    """
+    for i in [1, 4, 5, 8, 100]:
+        e = MinConflictsEngine(n=i)
+        b = e.solve(enable_print=True)
+        assert len(b) == 1
+        assert e.has_solution()
+
+
+def test_solve_async():
+    """test for solve_async and progress
+    """
+    e = MinConflictsEngine(n=200)
+    b = asyncio.run(e.solve_async(enable_print=True, chunk_steps=10))
+    assert len(b) == 1
+    assert e.has_solution()
+
+    async def collect():
+        return [status async for status in e.progress(chunk_steps=10)]
+
+    e = MinConflictsEngine(n=200)
+    statuses = asyncio.run(collect())
+    assert statuses[0].phase == SolveStatus.INITIALIZING
+    assert statuses[-1].phase == SolveStatus.SOLVED
+    assert statuses[-1].step == e.debug_steps
+    assert [s.placed_rows for s in statuses] == sorted(s.placed_rows for s in statuses)
+
+
+def test_solve_async_cancel():
+    """test that solve_async is cancelled at the next yield, leaving the engine consistent
+    """
+    async def cancel():
+        e = MinConflictsEngine(n=100, seed=0)
+        moves = []
+        move = e.move
+        e.move = lambda previous, after: (moves.append(after), move(previous=previous, after=after))
+        task = asyncio.ensure_future(e.solve_async(chunk_steps=1))
+        while len(moves) < 3 and not task.done():
+            await asyncio.sleep(0)
+        assert not task.done()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return e, len(moves)
+
+    e, moves = asyncio.run(cancel())
+    # no step runs after the cancel, and the queens are still one in each column
+    assert moves == 3
+    assert not e.has_solution()
+    assert sorted(e.queen_is) == list(range(100))
+
+
+def test_checkpoint_and_resume(tmp_path):
+    """test for checkpoint and resume_from
+    """
+    path = str(tmp_path / 'checkpoint.pkl')
+    e = MinConflictsEngine(n=300)
+    e.solve(checkpoint_path=path, checkpoint_interval=1)
+    state = load_checkpoint(path)
+    assert state['n'] == 300
+    assert state['step'] == e.debug_steps - 1
+    assert len(state['columns']) == 300
+
+    # resume from the last checkpoint, which is one step before the solution
+    e2 = MinConflictsEngine(n=300)
+    e2.solve(resume_from=path)
+    assert e2.has_solution()
+    assert e2.debug_steps >= state['step']
+
+    # counters are recomputed from the columns
+    for row, column in enumerate(state['columns']):
+        assert e2.conflicts_num_dict[MinConflictsEngine.COLUMN][column] >= 1
+
+    # checkpoint for the other n is rejected
+    with pytest.raises(ValueError):
+        MinConflictsEngine(n=10).solve(resume_from=path)
+
+
+def test_checkpoint_on_signal(tmp_path):
+    """test that SIGINT saves the checkpoint before interrupting
+    """
+    path = str(tmp_path / 'checkpoint.pkl')
+    script = '\n'.join([
+        'import time',
+        'from engine.minconflicts_engine_6 import MinConflictsEngine',
+        'e = MinConflictsEngine(n=100)',
+        'move = e.move',
+        'e.move = lambda previous, after: (time.sleep(0.05), move(previous=previous, after=after))',
+        f'e.solve(checkpoint_path={path!r}, checkpoint_interval=10 ** 9)',
+    ])
+    p = subprocess.Popen([sys.executable, '-c', script])
+    try:
+        # the first checkpoint is saved right after the initialization
+        while not os.path.exists(path):
+            time.sleep(0.01)
+        time.sleep(0.2)
+        p.send_signal(signal.SIGINT)
+        assert p.wait(timeout=10) != 0
+    finally:
+        p.kill()
+    assert load_checkpoint(path)['step'] > 0
+
+
+def test_sample_solutions():
+    """test for sample_solutions
+    """
+    e = MinConflictsEngine(n=30)
+    solutions = e.sample_solutions(k=20)
+    assert len(solutions) == 20
+    assert len(set([tuple(s) for s in solutions])) == 20
+    for s in solutions:
+        assert validate_columns(s)
+    assert e.debug_solutions_per_second > 0
+
+    # there are only 4 solutions when n = 6
+    e = MinConflictsEngine(n=6)
+    solutions = e.sample_solutions(k=10, max_attempts=200)
+    assert 0 < len(solutions) <= 4
+
+
+def test_seed():
+    """test that the search is reproducible with the same seed
+    """
+    e1 = MinConflictsEngine(n=200, seed=3)
+    e1.solve()
+    e2 = MinConflictsEngine(n=200, seed=3)
+    e2.solve()
+    assert e1.has_solution()
+    assert e1.queen_is == e2.queen_is
+    assert e1.debug_steps == e2.debug_steps
+
+
+def test_sampled_search():
+    """test for search with sample_size
+    """
+    e = MinConflictsEngine(n=300, seed=1, sample_size=4)
+    e.exact_conflicts = 0
+    # start from a random permutation, which has many conflicts
+    e.initialize_queue()
+    for row in range(e.n):
+        e.put_queen(at=(row, e.initial_queue[row]))
+    assert e.conflicts_total == e.count_conflicts()[0] > 0
+    assert e.search(start_step=0, end_step=e.max_steps)
+    assert validate_columns([e.queen_is[row] for row in range(e.n)])
+    assert e.conflicts_total == 0
+
+    # sample size is doubled on stall and halved on progress
+    e = MinConflictsEngine(n=100, sample_size=4)
+    e.window_conflicts_total = e.conflicts_total
+    e.adapt_sample_size()
+    assert e.sample_size == 8
+    e.conflicts_total = -1
+    e.adapt_sample_size()
+    assert e.sample_size == 4
+    # but not below the initial one
+    e.conflicts_total = -2
+    e.adapt_sample_size()
+    assert e.sample_size == 4
+
+
+def test_breakout():
+    """test for the breakout mode
+    """
+    # weighted counts are the same as unweighted ones while all weights are 1
+    e = MinConflictsEngine(n=50, seed=2, breakout=True)
+    e.initialize_queue()
+    for row in range(e.n):
+        e.put_queen(at=(row, e.initial_queue[row]))
+    units = [(row, column) for row in range(e.n) for column in range(e.n)]
+    assert [e.get_conflicts_count(at=u) for u in units] == [MinConflictsEngine.get_conflicts_count(e, at=u) for u in units]
+
+    # only lines where the queen conflicts weigh more
+    row = next(r for r in range(e.n) if MinConflictsEngine.get_conflicts_count(e, at=(r, e.queen_is[r]))[0] > 0)
+    unit = (row, e.queen_is[row])
+    lines = e.conflicted_lines(unit=unit)
+    assert 0 < len(lines) <= 3
+    before = e.get_conflicts_count(at=unit)[0]
+    for weights, index in lines:
+        weights[index] += 1
+    assert e.get_conflicts_count(at=unit)[0] > before
+
+    # weights are raised when a move does not reduce conflicts
+    conflicts_total = e.conflicts_total
+    e.breakout_move(previous=unit, after=unit)
+    assert e.conflicts_total == conflicts_total
+    assert e.debug_weight_increases == len(lines)
+    assert sum(e.column_weights) + sum(e.diag_up_weights) + sum(e.diag_down_weights) == 5 * e.n - 2 + 2 * len(lines)
+
+    for i in [1, 4, 8, 100, 1000]:
+        e = MinConflictsEngine(n=i, seed=0, breakout=True)
+        result = e.solve()
+        assert result.is_solution()
+        assert e.conflicts_total == 0
+
+
+def test_adaptive_noise():
+    """test for the adaptive noise
+    """
+    e = MinConflictsEngine(n=100, seed=0, adaptive_noise=True)
+    e.conflicts_total = 10
+    e.reset_noise(step=0)
+    assert e.noise == 0
+    assert e.noise_window == 1
+
+    # noise rises toward max_noise while conflicts stagnate
+    for step in range(1, 50):
+        e.adapt_noise(step=step)
+    assert 0 < e.noise < e.max_noise
+    assert e.debug_max_noise == e.noise
+
+    # and decays on a new minimum
+    noise = e.noise
+    e.conflicts_total = 9
+    e.adapt_noise(step=50)
+    assert e.noise < noise
+    assert e.best_conflicts_total == 9
+
+    # small boards, where the fixed setting can stall, are solved
+    for seed in range(30):
+        e = MinConflictsEngine(n=8, seed=seed, adaptive_noise=True)
+        assert e.solve().is_solution()
+
+
+def test_restart():
+    """test for solve with a restart policy
+    """
+    for policy in [LubyRestarts(unit=8), GeometricRestarts(first=8), StagnationRestarts(window=8)]:
+        for i in [0, 1, 4, 8, 20, 100]:
+            e = MinConflictsEngine(n=i, seed=0)
+            result = e.solve(restart=policy)
+            assert result.is_solution()
+            assert result.restarts == e.debug_restarts
+            assert e.debug_steps <= e.max_steps
+
+    # n = 3 has no solution, so runs are repeated until the budget of all runs is spent
+    e = MinConflictsEngine(n=3, seed=0)
+    result = e.solve(restart=LubyRestarts(unit=2))
+    assert not result.is_solution()
+    assert e.debug_steps == e.max_steps
+    # runs of 2, 2, 4, 2, 2, 4, 8, ... steps until the sum reaches max_steps = 300
+    policy = LubyRestarts(unit=2)
+    runs = 0
+    steps = policy.run_steps(runs)
+    while steps < e.max_steps:
+        runs += 1
+        steps += policy.run_steps(runs)
+    assert result.restarts == runs == 61
+
+    # a restart reuses the counters and leaves a consistent board
+    e = MinConflictsEngine(n=50, seed=1)
+    e.solve()
+    counters = e.conflicts_num_dict[MinConflictsEngine.COLUMN]
+    e.restart()
+    assert e.conflicts_num_dict[MinConflictsEngine.COLUMN] is counters
+    assert e.queens_num == 50
+    assert len(e.history) == 0
+    assert e.conflicts_total == e.count_conflicts()[0]
+    assert sorted(counters.values()) != [0] * 50
+
+
+def test_reset():
+    """test for reset
+    """
+    for kwargs in [{}, {'breakout': True}, {'adaptive_noise': True}, {'sample_size': 4}]:
+        e = MinConflictsEngine(n=30, seed=100, **kwargs)
+        e.solve()
+        for seed in [1, 2, 3]:
+            # a reset engine searches exactly like a new one
+            expected = MinConflictsEngine(n=30, seed=seed, **kwargs).solve()
+            e.reset(seed=seed)
+            result = e.solve()
+            assert result.columns == expected.columns
+            assert result.steps == expected.steps
+            assert e.debug_restarts == 0
+
+    # counters are zeroed in place
+    e = MinConflictsEngine(n=50, seed=1, breakout=True)
+    e.solve()
+    counters = e.conflicts_num_dict[MinConflictsEngine.DIAG_UP]
+    weights = e.diag_up_weights
+    e.reset(seed=2)
+    assert e.conflicts_num_dict[MinConflictsEngine.DIAG_UP] is counters
+    assert e.diag_up_weights is weights
+    assert set(counters.values()) == {0}
+    assert set(weights) == {1}
+    assert set(e.queen_is.values()) == {None}
+    assert e.queens_num == 0 and e.conflicts_total == 0
+
+
+def test_resume_is_same_search(tmp_path):
+    """test that a resumed search makes the same moves as the uninterrupted one
+    """
+    path = str(tmp_path / 'checkpoint.pkl')
+    for kwargs in [{}, {'breakout': True}, {'adaptive_noise': True}, {'sample_size': 4}]:
+        for seed in range(5):
+            # a checkpoint is saved right after the initialization, and in the middle of the search
+            e = MinConflictsEngine(n=100, seed=seed, **kwargs)
+            expected = e.solve(checkpoint_path=path, checkpoint_interval=20)
+            state = load_checkpoint(path)
+            e2 = MinConflictsEngine(n=100, **kwargs)
+            result = e2.solve(resume_from=path)
+            assert result.columns == expected.columns
+            assert result.steps == expected.steps
+            assert state['step'] <= result.steps
+
+    # the default interval grows with n
+    e = MinConflictsEngine(n=300, seed=0)
+    e.solve(checkpoint_path=path)
+    assert e.checkpoint_interval == 300
@@ -0,0 +1,115 @@
+from engine.parallel_engine import BlockWorker, ParallelMinConflictsEngine, SharedCounters, reconcile
+from utils.random_stream import RandomStream
+from utils.util import validate_columns
+from multiprocessing import shared_memory
+import pytest
+
+
+def test_solve():
+    """test for solve
+    """
+    for i in [0, 1, 4, 5, 8, 30, 500]:
+        e = ParallelMinConflictsEngine(n=i, workers=1, seed=0)
+        result = e.solve()
+        assert result.is_solution()
+        assert result.seed == 0
+        assert result.columns == e.columns
+        assert e.has_solution()
+        assert validate_columns(e.columns)
+        assert len(e.columns) == i
+
+    e = ParallelMinConflictsEngine(n=8, workers=1, seed=0)
+    b = e.solve(enable_print=True)
+    assert all(b[0].board[row][column] is not None for row, column in enumerate(e.columns))
+
+
+def test_solve_workers():
+    """test for solve on multiple workers
+    """
+    for i in [8, 100, 2000]:
+        e = ParallelMinConflictsEngine(n=i, workers=3, seed=1, min_rows_per_worker=2)
+        assert e.workers == 3
+        e.solve()
+        assert e.has_solution()
+        assert validate_columns(e.columns)
+
+    # fewer workers for small n
+    assert ParallelMinConflictsEngine(n=100, workers=4).workers == 1
+    assert ParallelMinConflictsEngine(n=200, workers=4).workers == 3
+
+
+def test_no_solution():
+    """test for n without solutions
+    """
+    for i in [2, 3]:
+        e = ParallelMinConflictsEngine(n=i, workers=1, seed=0, max_rounds=3, steps_per_round=10)
+        e.solve()
+        assert not e.has_solution()
+        assert e.debug_rounds == 3
+
+
+def test_shared_memory_released(monkeypatch):
+    """test that shared memory is freed after solve
+    """
+    names = []
+    original_names = SharedCounters.names
+
+    def spy(self):
+        names.append(original_names(self))
+        return names[-1]
+
+    monkeypatch.setattr(SharedCounters, 'names', spy)
+    ParallelMinConflictsEngine(n=100, workers=1, seed=0).solve()
+    assert len(names) != 0
+    for name in names[0].values():
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_reconcile():
+    """test for reconcile
+    """
+    counters = SharedCounters(n=4)
+    try:
+        a = counters.arrays
+        a['columns'][:] = [1, 3, 0, 0]
+        # stale counters left by races are overwritten
+        a['column_counts'][:] = [5, 5, 5, 5]
+        # only the queens on column 0 conflict
+        assert reconcile(counters=counters, n=4) == 1
+        assert a['column_counts'].tolist() == [2, 1, 0, 1]
+        assert a['free_count'][0] == 1
+        assert a['free_columns'][0] == 2
+
+        a['columns'][:] = [1, 3, 0, 2]
+        assert reconcile(counters=counters, n=4) == 0
+        assert a['free_count'][0] == 0
+    finally:
+        counters.close()
+
+
+def test_block_worker():
+    """test for BlockWorker in a single process
+    """
+    n = 50
+    counters = SharedCounters(n=n)
+    try:
+        counters.arrays['columns'][:] = list(range(n))
+        worker = BlockWorker(counters=counters, n=n, start_row=0, end_row=n, random=RandomStream(seed=0),
+                             sample_size=8, noise=0.05)
+        worker.initialize()
+        # the columns given to the block are kept, and counters match them
+        assert sorted(counters.arrays['columns'].tolist()) == list(range(n))
+        conflicts = reconcile(counters=counters, n=n)
+        assert (conflicts == 0) == (worker.conflicted_rows() == [])
+
+        for _ in range(100):
+            worker.repair(max_steps=1000)
+            # counters of a single worker never race
+            counts = counters.arrays['column_counts'].tolist()
+            if reconcile(counters=counters, n=n) == 0:
+                break
+            assert counters.arrays['column_counts'].tolist() == counts
+        assert validate_columns(counters.arrays['columns'].tolist())
+    finally:
+        counters.close()
@@ -0,0 +1,99 @@
+from engine.minconflicts_engine_6 import MinConflictsEngine
+from engine.pool import EnginePool
+import threading
+import pytest
+
+
+def test_acquire():
+    """test for acquire and release
+    """
+    pool = EnginePool(factory=lambda n, seed: MinConflictsEngine(n=n, seed=seed))
+    e1 = pool.acquire(n=20, seed=1)
+    result1 = e1.solve()
+    assert result1.columns == MinConflictsEngine(n=20, seed=1).solve().columns
+    pool.release(e1)
+
+    # the idle engine of the n is reset and lent again
+    e2 = pool.acquire(n=20, seed=1)
+    assert e2 is e1
+    assert e2.solve().columns == result1.columns
+    assert pool.acquire(n=20) is not e1
+    assert pool.acquire(n=10).n == 10
+    assert (pool.created, pool.reused) == (3, 1)
+
+    # only max_idle engines are kept for each n
+    pool.release(e2)
+    pool.release(MinConflictsEngine(n=20))
+    assert len(pool.idle[20]) == 1
+
+    pool.clear()
+    assert pool.acquire(n=20) is not e2
+    with pytest.raises(ValueError):
+        EnginePool(factory=MinConflictsEngine, max_idle=-1)
+
+
+def test_factory_seed():
+    """test that a new engine is created with the seed and is not reset
+    """
+    calls = []
+
+    def factory(n, seed):
+        calls.append((n, seed))
+        e = MinConflictsEngine(n=n, seed=seed)
+        e.reset = lambda seed=None: calls.append(('reset', seed))
+        return e
+
+    pool = EnginePool(factory=factory)
+    e = pool.acquire(n=8, seed=3)
+    assert calls == [(8, 3)]
+    pool.release(e)
+    assert pool.acquire(n=8, seed=4) is e
+    assert calls == [(8, 3), ('reset', 4)]
+
+
+def test_max_total_n():
+    """test that idle engines are bounded by the sum of n, and large engines are not kept
+    """
+    pool = EnginePool(factory=lambda n, seed: MinConflictsEngine(n=n, seed=seed), max_total_n=11)
+    engines = [pool.acquire(n=n) for n in [4, 5, 6]]
+    for e in engines:
+        pool.release(e)
+    # the engine of the n released least recently is dropped
+    assert pool.idle_total_n == 11
+    assert pool.acquire(n=4) is not engines[0]
+    assert pool.acquire(n=5) is engines[1]
+    assert pool.acquire(n=6) is engines[2]
+    assert pool.idle_total_n == 0
+
+    # an engine over the bound is dropped alone
+    pool.release(engines[2])
+    pool.release(MinConflictsEngine(n=12))
+    assert pool.idle_total_n == 6
+    assert [n for n, engines in pool.idle.items() if engines] == [6]
+
+    pool = EnginePool(factory=lambda n, seed: MinConflictsEngine(n=n, seed=seed), max_pooled_n=10)
+    pool.release(MinConflictsEngine(n=11))
+    pool.release(MinConflictsEngine(n=10))
+    assert pool.idle_total_n == 10
+    assert [n for n, engines in pool.idle.items() if engines] == [10]
+
+
+def test_borrow():
+    """test for borrow from threads
+    """
+    pool = EnginePool(factory=lambda n, seed: MinConflictsEngine(n=n, seed=seed), max_idle=4)
+    results = []
+
+    def solve(seed: int) -> None:
+        for _ in range(5):
+            with pool.borrow(n=12, seed=seed) as e:
+                results.append(e.solve().columns == MinConflictsEngine(n=12, seed=seed).solve().columns)
+
+    threads = [threading.Thread(target=solve, args=(seed,)) for seed in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [True] * 20
+    assert pool.created <= 4
+    assert pool.created + pool.reused == 20
@@ -0,0 +1,54 @@
+from engine.registry import COUNT, FIRST, ENGINES, create_engine, get_engine_class, get_engine_info, get_engine_names
+from utils.util import extract_columns, validate_columns
+import subprocess
+import sys
+import pytest
+
+
+def test_get_engine_info():
+    """test for get_engine_info and get_engine_names
+    """
+    info = get_engine_info('v6')
+    assert info.name == 'v6'
+    assert FIRST in info.modes
+    assert set(get_engine_names()) == set(ENGINES.keys())
+    assert get_engine_names(mode=COUNT) == ['count', 'count_numpy']
+    with pytest.raises(ValueError):
+        get_engine_info('unknown')
+
+
+def test_create_engine():
+    """test for create_engine
+    """
+    for name in get_engine_names(mode=FIRST):
+        e = create_engine(name, n=8)
+        assert isinstance(e, get_engine_class(name))
+        e.solve()
+        assert len(extract_columns(e)) == 8
+    e = create_engine('dfs', n=8)
+    e.solve()
+    assert validate_columns(extract_columns(e))
+
+    e = create_engine('count', n=8)
+    e.solve()
+    assert e.solution_count == 92
+
+    # keyword arguments override the ones of the registry
+    assert create_engine('v1', n=8, version=5).version == 5
+
+
+def test_lazy_import():
+    """test that engines are not imported until created
+    """
+    script = '\n'.join([
+        'import sys',
+        'from engine.registry import create_engine, get_engine_info',
+        'get_engine_info("v6")',
+        'assert not any(name.startswith("engine.minconflicts") for name in sys.modules)',
+        'create_engine("v6", n=8)',
+        'assert "engine.minconflicts_engine_6" in sys.modules',
+        'assert "engine.minconflicts_engine" not in sys.modules',
+        'assert "numpy" not in sys.modules',
+        'assert "asyncio" not in sys.modules',
+    ])
+    subprocess.run([sys.executable, '-c', script], check=True)
@@ -1,5 +1,9 @@
 from abc import ABCMeta, abstractmethod
-from typing import List, Tuple, Union
+from array import array
+from typing import Any, Dict, List, MutableSequence, NamedTuple, Sequence, Tuple, Union
+
+# the number of solutions for n = 0, 1, 2, ... (OEIS A000170)
+KNOWN_COUNTS: List[int] = [1, 1, 0, 0, 2, 10, 4, 40, 92, 352, 724, 2680, 14200, 73712, 365596, 2279184]
 
 
 class Queen():
@@ -78,15 +82,241 @@ class Board():
         # print the board state
         for i in range(self.n):
             row_list = [str(i).center(max_len, ' ')]
-            for j in self.board[i]:
-                s = ' '.center(max_len, ' ') if j is None else Q.center(max_len, ' ')
+            for j in range(self.n):
+                s = Q.center(max_len, ' ') if self.has_queen(at=(i, j)) else ' '.center(max_len, ' ')
                 row_list.append(s)
             row = '|'.join(row_list) + '|'
             print(row)
             print(sep)
 
 
+class PermutationBoard(Board):
+    """board that keeps only the column of the queen on each row
+
+    It takes O(n) memory instead of O(n^2), and the columns can be any mutable sequence of integers,
+    e.g. a NumPy view of shared memory, which is used without copying. A row has at most one queen,
+    so setting a queen on a row moves its queen.
+    """
+
+    def __init__(self, n: int, columns: MutableSequence[int] = None) -> None:
+        """
+        Args:
+            n (int): length of the chess board
+            columns (MutableSequence[int]): column of the queen on each row, -1 if the row has no queen.
+                an empty board if None
+        """
+        self.n: int = n
+        self.board: List[List[Union[None, Queen]]] = None
+        self.columns: MutableSequence[int] = columns
+        if columns is None:
+            self.columns = array('i', [-1]) * n
+        elif len(columns) != n:
+            raise ValueError(f'the length of columns must be {n}: {len(columns)}')
+
+    def reset_board(self) -> None:
+        """remove all queens
+        """
+        for row in range(self.n):
+            self.columns[row] = -1
+
+    def has_queen(self, at: Tuple[int, int]) -> bool:
+        """get value according to the coodinate
+        Args:
+            at (Tuple[int, int]): location (row, column)
+        Returns:
+            (bool): True if queen exists at the given place, else return False
+        """
+        row, column = at
+        return self.columns[row] == column
+
+    def set_queen(self, at: Tuple[int, int]) -> None:
+        """Set Queen onto the board, moving the queen already on the row
+        Args:
+            at (Tuple[int, int]): the place on the board where the queen is placed (row, column)
+        """
+        row_at, column_at = at
+        self.columns[row_at] = column_at
+
+    def remove_queen(self, at: Tuple[int, int]) -> None:
+        """Remove Queen from the given place
+        Args:
+            at (Tuple[int, int]): the place where a queen will be removed from (row, column)
+        """
+        row_at, column_at = at
+        if self.columns[row_at] == column_at:
+            self.columns[row_at] = -1
+
+
+def count_conflicts(columns: Sequence[int]) -> int:
+    """count extra queens on each column and diagonal in O(n)
+
+    Args:
+        columns (Sequence[int]): column of the queen on each row, -1 if the row has no queen
+    Returns:
+        (int): the number of queens placed on a line that already has a queen
+    """
+    n = len(columns)
+    used_columns = bytearray(n)
+    used_diag_up = bytearray(2 * n)
+    used_diag_down = bytearray(2 * n)
+    conflicts = 0
+    for row, column in enumerate(columns):
+        if not 0 <= column < n:
+            continue
+        diag_up = row + column
+        diag_down = row - column + n
+        conflicts += used_columns[column] + used_diag_up[diag_up] + used_diag_down[diag_down]
+        used_columns[column] = 1
+        used_diag_up[diag_up] = 1
+        used_diag_down[diag_down] = 1
+    return conflicts
+
+
+class SolveResult():
+    """result of solve, which keeps the placement as a typed array instead of boards
+
+    It acts as a sequence of at most one Board for the callers of the former List[Board]: it has
+    one board if every row has a queen, and the board is built only when it is accessed.
+    """
+    __slots__ = ['n', 'columns', 'conflicts', 'steps', 'duration_seconds', 'seed', 'restarts', 'board']
+
+    def __init__(self,
+                 n: int,
+                 columns: Sequence[int],
+                 steps: int = 0,
+                 duration_seconds: float = 0,
+                 seed: int = None,
+                 conflicts: int = None,
+                 restarts: int = 0) -> None:
+        """
+        Args:
+            n (int): length of the chess board
+            columns (Sequence[int]): column of the queen on each row, -1 if the row has no queen.
+                it is used as it is if it is already an array of 'i', otherwise copied into one
+            steps (int): the number of steps of the engine
+            duration_seconds (float): seconds the solve took
+            seed (int): seed of the engine, if any
+            conflicts (int): residual conflicts if the engine knows them. counted in O(n) if None
+            restarts (int): the number of restarts of the engine
+        """
+        self.n: int = n
+        self.columns: array = columns if isinstance(columns, array) and columns.typecode == 'i' else array('i', columns)
+        if len(self.columns) != n:
+            raise ValueError(f'the length of columns must be {n}: {len(self.columns)}')
+        self.conflicts: int = conflicts if conflicts is not None else count_conflicts(self.columns)
+        self.steps: int = steps
+        self.duration_seconds: float = duration_seconds
+        self.seed: int = seed
+        self.restarts: int = restarts
+        self.board: Board = None
+
+    def is_complete(self) -> bool:
+        """check if every row has a queen
+
+        Returns:
+            (bool): True if every row has a queen
+        """
+        return -1 not in self.columns
+
+    def is_solution(self) -> bool:
+        """check if the placement is a solution
+
+        Returns:
+            (bool): True if every row has a queen and no queens conflict
+        """
+        return self.conflicts == 0 and self.is_complete()
+
+    def to_board(self) -> Board:
+        """build the board of the placement on the first call
+
+        Returns:
+            (Board): board, which takes O(n^2) memory
+        """
+        if self.board is None:
+            self.board = Board(n=self.n)
+            for row, column in enumerate(self.columns):
+                if column != -1:
+                    self.board.set_queen(at=(row, column))
+        return self.board
+
+    def __len__(self) -> int:
+        return 1 if self.is_complete() else 0
+
+    def __getitem__(self, index: int) -> Board:
+        if index not in [0, -1] or len(self) == 0:
+            raise IndexError('SolveResult has one board at most')
+        return self.to_board()
+
+    def __repr__(self) -> str:
+        return (f'SolveResult(n={self.n}, solution={self.is_solution()}, conflicts={self.conflicts}, '
+                f'steps={self.steps}, duration_seconds={self.duration_seconds}, seed={self.seed}, restarts={self.restarts})')
+
+
+class SolveStatus(NamedTuple):
+    """snapshot of an ongoing solve
+    """
+    INITIALIZING = 'initializing'
+    SEARCHING = 'searching'
+    SOLVED = 'solved'
+    FAILED = 'failed'
+
+    # one of the phases above
+    phase: str
+    # length of the chess board
+    n: int
+    # the number of rows where a queen has been placed
+    placed_rows: int
+    # the number of steps done
+    step: int
+    # the maximum number of steps
+    max_steps: int
+    # the number of random moves made so far
+    random_walks: int
+    # seconds elapsed from the start of the solve
+    elapsed_seconds: float
+    # the number of extra queens on each column and diagonal
+    conflicts: int = 0
+
+
+class EngineInfo(NamedTuple):
+    """metadata of an engine, available without importing the engine
+    """
+    # modes
+    FIRST = 'first'
+    COUNT = 'count'
+    SAMPLE = 'sample'
+    TRACE = 'trace'
+    CHECKPOINT = 'checkpoint'
+    ASYNC = 'async'
+    SEEDED = 'seeded'
+    RESTART = 'restart'
+    OBSERVE = 'observe'
+    RESET = 'reset'
+    # searches exhaustively, so it never misses a solution that exists
+    COMPLETE = 'complete'
+
+    # memory classes
+    LINEAR = 'O(n)'
+    QUADRATIC = 'O(n^2)'
+
+    # name of the engine
+    name: str
+    # module and class of the engine, which are imported on demand
+    module: str
+    class_name: str
+    # keyword arguments passed to the engine in addition to n
+    kwargs: Dict[str, Any]
+    # supported modes of the modes above
+    modes: Tuple[str, ...]
+    # how the memory grows with n
+    memory: str
+    # short description
+    description: str
+    # the largest n solved in a second or so, which bounds randomized verification
+    max_n: int
+
+
 class Engine(metaclass=ABCMeta):
     @abstractmethod
-    def solve(self) -> List[Board]:
+    def solve(self) -> Sequence[Board]:
         pass
@@ -0,0 +1,64 @@
+from models.model import Board, SolveResult, count_conflicts
+from array import array
+import pytest
+
+
+def test_count_conflicts():
+    """test for count_conflicts
+    """
+    assert count_conflicts([]) == 0
+    assert count_conflicts([1, 3, 0, 2]) == 0
+    # the same column, and the same diagonal
+    assert count_conflicts([0, 0]) == 1
+    assert count_conflicts([0, 1, 2, 3]) == 3
+    # rows without a queen are ignored
+    assert count_conflicts([-1, 3, -1, 2]) == 0
+
+
+def test_solve_result():
+    """test for SolveResult
+    """
+    # case 1: solution
+    r = SolveResult(n=4, columns=[1, 3, 0, 2], steps=3, duration_seconds=0.5, seed=7)
+    assert r.columns == array('i', [1, 3, 0, 2])
+    assert r.conflicts == 0
+    assert r.is_solution()
+    assert (r.steps, r.duration_seconds, r.seed) == (3, 0.5, 7)
+
+    # it works as the list of one board, which is built on access
+    assert r.board is None
+    assert len(r) == 1
+    assert r
+    b = r[0]
+    assert isinstance(b, Board)
+    assert b.has_queen(at=(0, 1))
+    assert r[-1] is b
+    assert r.to_board() is b
+    assert list(r) == [b]
+    with pytest.raises(IndexError):
+        r[1]
+
+    # __slots__ prevent attributes other than the fields
+    with pytest.raises(AttributeError):
+        r.boards = [b]
+
+    # case 2: not a solution
+    r = SolveResult(n=4, columns=[0, 1, 2, 3])
+    assert r.conflicts == 3
+    assert not r.is_solution()
+    assert len(r) == 1
+
+    # case 3: no queens, as a failed search
+    r = SolveResult(n=3, columns=[-1, -1, -1])
+    assert not r.is_solution()
+    assert len(r) == 0
+    assert not r
+    assert list(r) == []
+    with pytest.raises(IndexError):
+        r[0]
+
+    # the array is used without copying
+    columns = array('i', [0])
+    assert SolveResult(n=1, columns=columns).columns is columns
+    with pytest.raises(ValueError):
+        SolveResult(n=2, columns=columns)
@@ -1,17 +1,82 @@
+import argparse
 import sys
-from engine.minconflicts_engine import MinConflictsEngine
-from engine.minconflicts_engine_3 import MinConflictsEngine as E3
-from engine.minconflicts_engine_4 import MinConflictsEngine as E4
-from engine.minconflicts_engine_5 import MinConflictsEngine as E5
-from engine.minconflicts_engine_6 import MinConflictsEngine as E6
+from engine.registry import OBSERVE, RESTART, SAMPLE, TRACE, create_engine, get_engine_info, get_engine_names
+from models.model import SolveResult
+from utils.restart import POLICIES, create_policy
 
-n = int(sys.argv[1]) if len(sys.argv) >= 2 else 8
-t = True if len(sys.argv) >= 3 else False
-e = E6(n=n)
-boards = e.solve(enable_print=t)
-if t:
+parser = argparse.ArgumentParser(description='solve the n-queens problem')
+parser.add_argument('n', type=int, nargs='?', default=8, help='the number of queens')
+parser.add_argument('display', nargs='?', default=None, help='print the result board if given')
+parser.add_argument('--engine', default='v6', choices=get_engine_names(), help='engine name')
+parser.add_argument('--trace', default=None, help='write the search trajectory to the file (.jsonl or .csv)')
+parser.add_argument('--trace-interval', type=int, default=None,
+                    help='record the trajectory every k steps. Default n // 100, which keeps tracing O(1) per step')
+parser.add_argument('--samples', type=int, default=None, help='find the given number of distinct solutions')
+parser.add_argument('--restart', default=None, choices=list(POLICIES),
+                    help='restart from a new initialization by the policy within the step budget')
+parser.add_argument('--restart-steps', type=int, default=None,
+                    help='unit of luby, the first run of geometric or the window of stagnation. Default n')
+parser.add_argument('--progress', action='store_true', help='report steps per second, conflicts and ETA on stderr')
+parser.add_argument('--cache', default=None, help='directory of the solution cache. solutions are cached if given')
+args = parser.parse_args()
+
+n = args.n
+t = args.display is not None
+info = get_engine_info(args.engine)
+if args.trace is not None and TRACE not in info.modes:
+    parser.error(f'--trace is not supported by {info.name}')
+if args.samples is not None and SAMPLE not in info.modes:
+    parser.error(f'--samples is not supported by {info.name}')
+if args.restart is not None and RESTART not in info.modes:
+    parser.error(f'--restart is not supported by {info.name}')
+if args.progress and OBSERVE not in info.modes:
+    parser.error(f'--progress is not supported by {info.name}')
+
+tracer = None
+if args.trace is not None:
+    from utils.tracer import Tracer, default_interval
+    tracer = Tracer(interval=args.trace_interval if args.trace_interval is not None else default_interval(n))
+if args.samples is not None:
+    e = create_engine(info.name, n=n)
+    solutions = e.sample_solutions(k=args.samples)
+    print(f'{e.n}:')
+    print(f'  solutions: {len(solutions)}')
+    print(f'  solutions per second: {e.debug_solutions_per_second}')
+    sys.exit(0)
+
+if args.cache is not None:
+    from utils.cache import CachedEngine, SolutionCache
+    e = CachedEngine(factory=lambda: create_engine(info.name, n=n), n=n, engine_name=info.name,
+                     cache=SolutionCache(directory=args.cache))
+else:
+    e = create_engine(info.name, n=n)
+options = {}
+if args.restart is not None:
+    options['restart'] = create_policy(name=args.restart, steps=args.restart_steps if args.restart_steps is not None else max(n, 1))
+if args.progress:
+    from utils.observer import ProgressReporter
+    options['observer'] = ProgressReporter()
+if TRACE in info.modes:
+    boards = e.solve(enable_print=t, tracer=tracer, **options)
+else:
+    boards = e.solve()
+if t and boards:
     boards[0].print()
+if tracer is not None:
+    tracer.flush(args.trace)
 print(f'{e.n}:')
-print(f'  is solution: {e.has_solution()}')
-print(f'  duration: {e.debug_duration_seconds} sec')
-print(f'  steps: {e.debug_steps}')
+# engines report their results in slightly different ways
+if isinstance(boards, SolveResult):
+    print(f'  is solution: {boards.is_solution()}')
+    print(f'  duration: {boards.duration_seconds} sec')
+    print(f'  steps: {boards.steps}')
+    print(f'  restarts: {boards.restarts}')
+    sys.exit(0)
+if hasattr(e, 'solution_count'):
+    print(f'  solutions: {e.solution_count}')
+elif hasattr(e, 'has_solution'):
+    print(f'  is solution: {e.has_solution()}')
+else:
+    print(f'  is solution: {bool(boards)}')
+print(f'  duration: {getattr(e, "debug_duration_seconds", 0)} sec')
+print(f'  steps: {getattr(e, "debug_steps", 0)}')
@@ -0,0 +1,430 @@
+from engine.pool import EnginePool
+from engine.registry import FIRST, RESET, create_engine, get_engine_info, get_engine_names
+from models.model import Engine, EngineInfo
+from utils.metrics import SolverMetrics
+from utils.shm_channel import ResultChannel, ResultWriter
+from utils.util import extract_columns
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+import argparse
+import json
+import os
+import threading
+import time
+
+# engines that start worker processes of their own, which can not run inside the daemonic workers of the service
+EXCLUDED_ENGINES = ('parallel',)
+# engines whose time grows too fast to accept n up to max_n of the service. a timed out solve keeps its worker
+ADMISSION_MAX_N: Dict[str, int] = {'simple': 10}
+# engines of quadratic memory are accepted up to this n, which is about 4M cells of their tables
+QUADRATIC_MAX_N = 2000
+# paths that have their own metrics. the others are recorded together as OTHER_ENDPOINT
+ENDPOINTS = ('/solve', '/metrics', '/metrics/prometheus', '/health')
+# content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+OTHER_ENDPOINT = 'other'
+
+
+class ServiceBusy(Exception):
+    """raised when the service can not accept a new solve
+    """
+    pass
+
+
+# engine name -> idle engines of the worker process, for engines that can be reset
+POOLS: Dict[str, EnginePool] = {}
+# the maximum sum of n of idle engines kept by each worker process for each engine. v6 takes about 700 bytes per n
+POOL_MAX_TOTAL_N = 30000
+# engines of larger n are not kept, since a repeated n saves little next to their solve
+POOL_MAX_N = 10000
+
+
+def get_pool(engine_name: str) -> EnginePool:
+    """get the pool of the engine in this process
+
+    Args:
+        engine_name (str): name of an engine in the registry, which supports the reset mode
+    Returns:
+        (EnginePool): pool
+    """
+    pool = POOLS.get(engine_name)
+    if pool is None:
+        pool = EnginePool(factory=lambda n, seed: create_engine(engine_name, n=n, seed=seed), max_total_n=POOL_MAX_TOTAL_N,
+                          max_pooled_n=POOL_MAX_N)
+        POOLS[engine_name] = pool
+    return pool
+
+
+def solve_columns(engine_name: str, n: int, writer: ResultWriter = None) -> Dict[str, Any]:
+    """solve the problem in a worker process
+
+    engines that can be reset are borrowed from the pool of the process, so a repeated n skips the allocation.
+    The solve is recorded in solver metrics of its own, whose snapshot the service merges.
+
+    Args:
+        engine_name (str): name of an engine in the registry
+        n (int): length of chess board
+        writer (ResultWriter): write the columns to shared memory if given, so they are not pickled
+    Returns:
+        (Dict[str, Any]): columns, or handle of the block if writer is given, steps, duration_seconds,
+            is_solution and metrics
+    """
+    metrics = SolverMetrics()
+    if RESET not in get_engine_info(engine_name).modes:
+        result = solve_engine(e=create_engine(engine_name, n=n), engine_name=engine_name, n=n, metrics=metrics)
+    else:
+        with get_pool(engine_name).borrow(n=n) as e:
+            result = solve_engine(e=e, engine_name=engine_name, n=n, metrics=metrics)
+    result['metrics'] = metrics.registry.snapshot()
+    if writer is not None:
+        result['handle'] = writer.write(columns=result.pop('columns'))
+    return result
+
+
+def solve_engine(e: Engine, engine_name: str, n: int, metrics: SolverMetrics) -> Dict[str, Any]:
+    """solve the problem with the engine
+
+    Args:
+        e (Engine): engine ready to solve
+        engine_name (str): engine name used as the label of metrics
+        n (int): length of chess board
+        metrics (SolverMetrics): metrics to record the solve
+    Returns:
+        (Dict[str, Any]): columns, steps, duration_seconds and is_solution
+    """
+    metrics.started.inc(engine=engine_name)
+    start_time = time.time()
+    e.solve()
+    duration_seconds = time.time() - start_time
+    columns = extract_columns(e)
+    is_solution = e.has_solution() if hasattr(e, 'has_solution') else len(columns) == n
+    metrics.record(engine=e, engine_name=engine_name, n=n, duration_seconds=duration_seconds, solved=is_solution)
+    return {
+        'columns': columns,
+        'steps': getattr(e, 'debug_steps', 0),
+        'duration_seconds': duration_seconds,
+        'is_solution': is_solution,
+    }
+
+
+class EndpointMetrics():
+    """latency and throughput of an endpoint
+    """
+
+    def __init__(self, start_time: float) -> None:
+        """initialize instance
+
+        Args:
+            start_time (float): the time the service started, from which throughput is measured
+        """
+        self.lock: threading.Lock = threading.Lock()
+        self.start_time: float = start_time
+        self.requests: int = 0
+        self.errors: int = 0
+        self.rejected: int = 0
+        self.latency_total_seconds: float = 0
+        self.latency_max_seconds: float = 0
+
+    def observe(self, latency_seconds: float, status: int) -> None:
+        """record a finished request
+
+        Args:
+            latency_seconds (float): latency of the request
+            status (int): HTTP status code of the response
+        """
+        with self.lock:
+            self.requests += 1
+            if status == 503:
+                self.rejected += 1
+            elif status >= 400:
+                self.errors += 1
+            self.latency_total_seconds += latency_seconds
+            self.latency_max_seconds = max(self.latency_max_seconds, latency_seconds)
+
+    def to_dict(self) -> Dict[str, float]:
+        """get metrics as a dict
+
+        Returns:
+            (Dict[str, float]): metrics
+        """
+        with self.lock:
+            uptime = time.time() - self.start_time
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'rejected': self.rejected,
+                'latency_avg_seconds': self.latency_total_seconds / self.requests if self.requests != 0 else 0,
+                'latency_max_seconds': self.latency_max_seconds,
+                'throughput_per_second': self.requests / uptime if uptime > 0 else 0,
+            }
+
+
+class SolverService():
+    """run solves on a bounded process pool, coalescing requests for the same (n, engine)
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, max_n: int = 10 ** 7, timeout_seconds: float = 60) -> None:
+        """initialize instance
+
+        Args:
+            max_workers (int): the number of worker processes
+            max_pending (int): the maximum number of solves queued or running at once
+            max_n (int): the maximum n the service accepts, which is lowered for engines in ADMISSION_MAX_N
+                and engines of quadratic memory
+            timeout_seconds (float): how long a request waits for its solve
+        """
+        self.max_workers: int = max_workers
+        self.max_pending: int = max_pending
+        self.max_n: int = max_n
+        self.timeout_seconds: float = timeout_seconds
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(max_workers=max_workers)
+        # workers write columns into blocks of this channel instead of pickling them
+        self.channel: ResultChannel = ResultChannel()
+        self.lock: threading.Lock = threading.Lock()
+        self.inflight: Dict[Tuple[int, str], Future] = {}
+        self.coalesced: int = 0
+        self.metrics: Dict[str, EndpointMetrics] = {}
+        # solves of all workers, merged once for each solve however many requests joined it
+        self.solver_metrics: SolverMetrics = SolverMetrics()
+        self.start_time: float = time.time()
+
+    def submit(self, n: int, engine_name: str) -> Tuple[Future, bool]:
+        """submit a solve, or join the one in flight for the same (n, engine)
+
+        Args:
+            n (int): length of chess board
+            engine_name (str): name of an engine in the registry, which finds a solution
+        Returns:
+            future (Future): future of the result of solve_columns, whose columns are a NumPy view of shared memory
+            coalesced (bool): True if joined a solve in flight
+        Raises:
+            ValueError: if the arguments are not acceptable
+            ServiceBusy: if too many solves are pending
+        """
+        if engine_name not in get_engine_names(mode=FIRST) or engine_name in EXCLUDED_ENGINES:
+            raise ValueError(f'unknown engine: {engine_name}')
+        max_n = self.admission_max_n(engine_name)
+        if not 1 <= n <= max_n:
+            raise ValueError(f'n must be between 1 and {max_n} for {engine_name}: {n}')
+
+        key = (n, engine_name)
+        with self.lock:
+            future = self.inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, True
+            if len(self.inflight) >= self.max_pending:
+                raise ServiceBusy(f'{len(self.inflight)} solves are pending')
+            # requests wait on a future of their own, which is done after the metrics are merged
+            solve_future = self.executor.submit(solve_columns, engine_name, n, self.channel.writer())
+            future = Future()
+            self.inflight[key] = future
+        solve_future.add_done_callback(lambda f: self.release(key, solve_future=f, future=future))
+        return future, False
+
+    def admission_max_n(self, engine_name: str) -> int:
+        """get the maximum n accepted for the engine
+
+        max_n of the registry only bounds verification, so it is not used here
+
+        Args:
+            engine_name (str): name of an engine in the registry
+        Returns:
+            (int): the maximum n
+        """
+        max_n = min(self.max_n, ADMISSION_MAX_N.get(engine_name, self.max_n))
+        if get_engine_info(engine_name).memory == EngineInfo.QUADRATIC:
+            max_n = min(max_n, QUADRATIC_MAX_N)
+        return max_n
+
+    def release(self, key: Tuple[int, str], solve_future: Future, future: Future) -> None:
+        """forget the finished solve, merge its solver metrics and pass its result to the requests
+
+        The columns in the result are a view of the block written by the worker. The block is released here,
+        and its memory is freed with the last view.
+
+        Args:
+            key (Tuple[int, str]): (n, engine name)
+            solve_future (Future): the finished future of the worker
+            future (Future): the future the requests wait on
+        """
+        with self.lock:
+            self.inflight.pop(key, None)
+        if solve_future.cancelled():
+            future.cancel()
+            return
+        exception = solve_future.exception()
+        if exception is not None:
+            future.set_exception(exception)
+            return
+        result = solve_future.result()
+        self.solver_metrics.registry.merge(result['metrics'])
+        handle = result['handle']
+        result['columns'] = self.channel.columns(handle)
+        self.channel.release(handle)
+        future.set_result(result)
+
+    def observe(self, endpoint: str, latency_seconds: float, status: int) -> None:
+        """record metrics of a request
+
+        Args:
+            endpoint (str): path of the endpoint
+            latency_seconds (float): latency of the request
+            status (int): HTTP status code of the response
+        """
+        with self.lock:
+            metrics = self.metrics.setdefault(endpoint, EndpointMetrics(start_time=self.start_time))
+        metrics.observe(latency_seconds=latency_seconds, status=status)
+
+    def stats(self) -> Dict[str, Any]:
+        """get the state of the service
+
+        Returns:
+            (Dict[str, Any]): queue depth, coalesced count and metrics per endpoint
+        """
+        with self.lock:
+            pending = len(self.inflight)
+            coalesced = self.coalesced
+            endpoints = list(self.metrics.items())
+        return {
+            'pending': pending,
+            'max_pending': self.max_pending,
+            'workers': self.max_workers,
+            'coalesced': coalesced,
+            'endpoints': {endpoint: metrics.to_dict() for endpoint, metrics in endpoints},
+        }
+
+    def shutdown(self) -> None:
+        """stop worker processes and free blocks of results never received
+        """
+        self.executor.shutdown(wait=True)
+        self.channel.close()
+
+
+class SolverRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler for SolverService
+
+    Endpoints:
+        GET /solve?n=<n>&engine=<engine>: solve and return the columns of queens. 504 if not solved in timeout_seconds
+        GET /metrics: return the state of the service
+        GET /metrics/prometheus: return the solver metrics of all workers in the Prometheus text format
+        GET /health: return ok
+    """
+    service: SolverService = None
+
+    def do_GET(self) -> None:
+        start_time = time.time()
+        url = urlparse(self.path)
+        status = 200
+        content_type = 'application/json'
+        try:
+            if url.path == '/solve':
+                status, body = self.solve(query=parse_qs(url.query))
+            elif url.path == '/metrics':
+                body = self.service.stats()
+            elif url.path == '/metrics/prometheus':
+                body, content_type = self.service.solver_metrics.registry.exposition(), PROMETHEUS_CONTENT_TYPE
+            elif url.path == '/health':
+                body = {'status': 'ok'}
+            else:
+                status, body = 404, {'error': f'not found: {url.path}'}
+        except Exception as e:
+            status, body, content_type = 500, {'error': str(e)}, 'application/json'
+        # recorded before the response, so a client sees its own request in the next /metrics
+        endpoint = url.path if url.path in ENDPOINTS else OTHER_ENDPOINT
+        self.service.observe(endpoint=endpoint, latency_seconds=time.time() - start_time, status=status)
+        self.respond(status=status, body=body, content_type=content_type)
+
+    def solve(self, query: Dict[str, List[str]]) -> Tuple[int, Dict[str, Any]]:
+        """handle /solve
+
+        Args:
+            query (Dict[str, List[str]]): query parameters
+        Returns:
+            status (int): HTTP status code
+            body (Dict[str, Any]): response body
+        """
+        try:
+            n = int(query.get('n', ['8'])[0])
+            engine_name = query.get('engine', ['v6'])[0]
+            future, coalesced = self.service.submit(n=n, engine_name=engine_name)
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except ServiceBusy as e:
+            return 503, {'error': str(e)}
+        try:
+            result = future.result(timeout=self.service.timeout_seconds)
+        except FutureTimeoutError:
+            # the solve keeps its slot until it finishes, so admission control still counts it
+            return 504, {'error': f'not solved in {self.service.timeout_seconds} seconds'}
+        body = {key: value for key, value in result.items() if key not in ['metrics', 'handle']}
+        return 200, dict(body, columns=result['columns'].tolist(), n=n, engine=engine_name, coalesced=coalesced)
+
+    def respond(self, status: int, body: Any, content_type: str = 'application/json') -> None:
+        """write a response
+
+        Args:
+            status (int): HTTP status code
+            body (Any): response body, a dict written as JSON or a text
+            content_type (str): content type of the body
+        """
+        data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        if status == 503:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # client_address is empty on a unix socket
+        return self.client_address[0] if self.client_address else 'unix'
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """HTTP server on a unix socket
+    """
+    daemon_threads = True
+
+
+def serve(service: SolverService, port: int = 8080, unix_socket: str = None) -> None:
+    """serve until interrupted
+
+    Args:
+        service (SolverService): service
+        port (int): TCP port on localhost
+        unix_socket (str): path of the unix socket. it is used instead of the port if given
+    """
+    handler = type('Handler', (SolverRequestHandler,), {'service': service})
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = ThreadingUnixHTTPServer(unix_socket, handler)
+    else:
+        server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='serve n-queens solutions over HTTP')
+    parser.add_argument('--port', type=int, default=8080, help='TCP port on localhost')
+    parser.add_argument('--unix', default=None, help='path of the unix socket to listen on instead of the port')
+    parser.add_argument('--workers', type=int, default=2, help='the number of worker processes')
+    parser.add_argument('--max-pending', type=int, default=8, help='the maximum number of solves queued or running')
+    parser.add_argument('--max-n', type=int, default=10 ** 7, help='the maximum n to accept')
+    parser.add_argument('--timeout', type=float, default=60, help='seconds a request waits for its solve')
+    args = parser.parse_args()
+    serve(service=SolverService(max_workers=args.workers, max_pending=args.max_pending, max_n=args.max_n,
+                                timeout_seconds=args.timeout),
+          port=args.port,
+          unix_socket=args.unix)
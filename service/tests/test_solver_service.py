@@ -0,0 +1,166 @@
+from service.solver_service import POOLS, ServiceBusy, SolverRequestHandler, SolverService, solve_columns
+from utils.shm_channel import orphan_names
+from utils.util import validate_columns
+from http.server import ThreadingHTTPServer
+from multiprocessing import shared_memory
+import json
+import threading
+import time
+import urllib.request
+import numpy as np
+import pytest
+
+
+def test_solve_columns():
+    """test for solve_columns
+    """
+    for engine_name in ['v1', 'v6', 'simple']:
+        result = solve_columns(engine_name=engine_name, n=6)
+        assert len(result['columns']) == 6
+
+    # simple engine always finds a solution
+    result = solve_columns(engine_name='simple', n=6)
+    assert result['is_solution']
+    assert sorted(result['columns']) == [0, 1, 2, 3, 4, 5]
+    # the solve is recorded in a snapshot for the service to merge
+    assert result['metrics']['nqueens_solves_started_total'] == {('simple',): 1}
+    assert result['metrics']['nqueens_solves_finished_total'] == {('simple', 'true'): 1}
+
+    # engines that can be reset are reused by the process
+    solve_columns(engine_name='v6', n=7)
+    reused = POOLS['v6'].reused
+    assert len(solve_columns(engine_name='v6', n=7)['columns']) == 7
+    assert POOLS['v6'].reused == reused + 1
+
+
+def test_submit():
+    """test for coalescing and admission control
+    """
+    s = SolverService(max_workers=1, max_pending=1)
+    try:
+        f1, coalesced1 = s.submit(n=3000, engine_name='v6')
+        f2, coalesced2 = s.submit(n=3000, engine_name='v6')
+        assert not coalesced1
+        assert coalesced2
+        assert f1 is f2
+
+        # the queue is full, so a different solve is rejected
+        with pytest.raises(ServiceBusy):
+            s.submit(n=10, engine_name='v6')
+        with pytest.raises(ValueError):
+            s.submit(n=10, engine_name='unknown')
+
+        assert len(f1.result()['columns']) == 3000
+        # the finished solve is released by the callback
+        while s.stats()['pending'] != 0:
+            time.sleep(0.01)
+        f3, _ = s.submit(n=10, engine_name='v6')
+        assert len(f3.result()['columns']) == 10
+    finally:
+        s.shutdown()
+
+
+def test_admission():
+    """test that n is limited by the service and slow engines, and the parallel engine is rejected
+    """
+    s = SolverService(max_workers=1, max_pending=2, max_n=7000)
+    try:
+        with pytest.raises(ValueError):
+            s.submit(n=20, engine_name='simple')
+        with pytest.raises(ValueError):
+            s.submit(n=8, engine_name='parallel')
+        with pytest.raises(ValueError):
+            s.submit(n=2001, engine_name='v3')
+        with pytest.raises(ValueError):
+            s.submit(n=7001, engine_name='v6')
+        assert s.admission_max_n('v6') == 7000
+        f, _ = s.submit(n=8, engine_name='simple')
+        assert f.result()['is_solution']
+
+        # n over max_n of the registry, which only bounds verification, is accepted
+        f, _ = s.submit(n=6000, engine_name='v6')
+        assert len(f.result()['columns']) == 6000
+    finally:
+        s.shutdown()
+
+
+def test_shared_memory():
+    """test that columns come back through shared memory, whose blocks are released on arrival
+    """
+    s = SolverService(max_workers=1, max_pending=2)
+    try:
+        result = s.submit(n=50, engine_name='v6')[0].result()
+        columns = result['columns']
+        # a view of the block written by the worker, not a pickled list
+        assert isinstance(columns, np.ndarray)
+        assert not columns.flags.owndata
+        assert validate_columns(columns.tolist())
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=result['handle'].name)
+        assert orphan_names(prefix=s.channel.prefix) == []
+    finally:
+        s.shutdown()
+
+
+def test_timeout():
+    """test that a request gives up waiting for a long solve
+    """
+    s = SolverService(max_workers=1, max_pending=2, timeout_seconds=0.001)
+    handler = type('Handler', (SolverRequestHandler,), {'service': s})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(f'http://127.0.0.1:{server.server_address[1]}/solve?n=5000&engine=v6')
+        assert e.value.code == 504
+    finally:
+        server.shutdown()
+        server.server_close()
+        s.shutdown()
+
+
+def test_http():
+    """test for HTTP endpoints
+    """
+    s = SolverService(max_workers=1, max_pending=2)
+    handler = type('Handler', (SolverRequestHandler,), {'service': s})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        with urllib.request.urlopen(f'{url}/solve?n=8&engine=v6') as r:
+            body = json.loads(r.read())
+        assert body['n'] == 8
+        assert 'metrics' not in body
+        assert len(body['columns']) == 8
+
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(f'{url}/solve?n=0')
+        assert e.value.code == 400
+
+        with urllib.request.urlopen(f'{url}/metrics') as r:
+            body = json.loads(r.read())
+        assert body['endpoints']['/solve']['requests'] == 2
+        assert body['endpoints']['/solve']['errors'] == 1
+
+        # solves in the workers are merged into the Prometheus text, without the snapshot in the response
+        with urllib.request.urlopen(f'{url}/metrics/prometheus') as r:
+            assert r.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            text = r.read().decode()
+        assert 'nqueens_solves_started_total{engine="v6"} 1\n' in text
+        assert 'nqueens_solve_duration_seconds_count{engine="v6",n_bucket="10",solved="true"} 1\n' in text
+
+        # unknown paths are recorded together
+        for path in ['/a', '/b']:
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f'{url}{path}')
+        with urllib.request.urlopen(f'{url}/metrics') as r:
+            body = json.loads(r.read())
+        assert set(body['endpoints']) == {'/solve', '/metrics', '/metrics/prometheus', 'other'}
+        assert body['endpoints']['other']['errors'] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+        s.shutdown()
@@ -0,0 +1,28 @@
+from benchmark import benchmark, reusable, speedups
+from engine.registry import get_engine_names
+from utils.metrics import SolverMetrics
+
+
+def test_benchmark():
+    """test that every engine of the registry and of engine_factory can be benchmarked
+    """
+    engine_names = get_engine_names() + ['v6_k4', 'parallel_w2', 'batch_b4']
+    metrics = SolverMetrics()
+    rows = benchmark(engine_names=engine_names, ns=[5], metrics=metrics)
+    assert [row['engine'] for row in rows] == engine_names
+    solved = {row['engine']: row['solved'] for row in rows}
+    # complete engines always find a solution
+    assert solved['simple'] and solved['dfs']
+    assert rows[engine_names.index('count')]['count'] == 10
+    assert metrics.finished.snapshot()[('simple', 'true')] == 1
+
+
+def test_reuse():
+    """test that engines supporting reset are reused over runs
+    """
+    assert reusable('v6_k4') and reusable('batch_b4')
+    assert not reusable('simple')
+    rows = benchmark(engine_names=['v6', 'simple'], ns=[6], repeat=2, reuse=True)
+    assert len(rows) == 4
+    results = speedups(rows=rows, baseline='v6')
+    assert [(result['engine'], result['n']) for result in results] == [('simple', 6)]
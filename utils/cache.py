@@ -0,0 +1,228 @@
+from models.model import Board, Engine, SolveResult
+from utils.util import extract_columns, validate_columns
+from array import array
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+
+# placements fixed beforehand, [(row, column), ...]
+Placements = Sequence[Tuple[int, int]]
+
+
+class SolutionCache():
+    """persistent cache of solutions on disk
+
+    Each entry is stored in a file named after the hash of its key (n, fixed placements, engine).
+    The file holds the permutation as 32-bit integers, so a solution takes 4n bytes.
+    The least recently used entries are evicted when the cache exceeds its limits.
+    """
+    MAGIC = b'NQC1'
+    HEADER = struct.Struct('<4sI')
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30, max_entries: int = 1024) -> None:
+        """initialize instance
+
+        Args:
+            directory (str): directory where entries are stored
+            max_bytes (int): the maximum total size of entries
+            max_entries (int): the maximum number of entries
+        """
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self.max_entries: int = max_entries
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, n: int, engine_name: str, fixed: Placements = ()) -> str:
+        """get the path of the entry
+
+        Args:
+            n (int): length of chess board
+            engine_name (str): name of the engine
+            fixed (Placements): placements fixed beforehand
+        Returns:
+            (str): path of the entry
+        """
+        key = json.dumps([n, sorted([list(p) for p in fixed]), engine_name])
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + '.bin')
+
+    def get(self, n: int, engine_name: str, fixed: Placements = ()) -> Optional[array]:
+        """load the solution
+
+        The entry is verified on load, and removed if it's broken.
+
+        Args:
+            n (int): length of chess board
+            engine_name (str): name of the engine
+            fixed (Placements): placements fixed beforehand
+        Returns:
+            columns (Optional[array]): columns[row] is the column where the queen is placed. None if not cached
+        """
+        path = self.path(n=n, engine_name=engine_name, fixed=fixed)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        columns = self.decode(data=data, n=n)
+        if columns is None or not validate_columns(columns) or any(columns[row] != column for row, column in fixed):
+            self.remove(path)
+            return None
+
+        # mark as recently used
+        os.utime(path)
+        return columns
+
+    def put(self, columns: Sequence[int], engine_name: str, fixed: Placements = ()) -> None:
+        """store the solution
+
+        Args:
+            columns (Sequence[int]): columns[row] is the column where the queen is placed
+            engine_name (str): name of the engine
+            fixed (Placements): placements fixed beforehand
+        """
+        n = len(columns)
+        if SolutionCache.HEADER.size + 4 * n > self.max_bytes:
+            # it would evict everything including itself
+            return
+        path = self.path(n=n, engine_name=engine_name, fixed=fixed)
+        body = array('i', columns)
+        if sys.byteorder != 'little':
+            body.byteswap()
+
+        # write to a temporary file first not to leave a broken entry
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as f:
+            f.write(SolutionCache.HEADER.pack(SolutionCache.MAGIC, n))
+            f.write(body.tobytes())
+        os.replace(temporary_path, path)
+        self.evict()
+
+    def decode(self, data: bytes, n: int) -> Optional[array]:
+        """decode the content of an entry
+
+        Args:
+            data (bytes): content of the file
+            n (int): expected length of chess board
+        Returns:
+            columns (Optional[array]): columns. None if the content is broken
+        """
+        header_size = SolutionCache.HEADER.size
+        if len(data) != header_size + 4 * n:
+            return None
+        magic, stored_n = SolutionCache.HEADER.unpack(data[:header_size])
+        if magic != SolutionCache.MAGIC or stored_n != n:
+            return None
+        columns = array('i')
+        columns.frombytes(data[header_size:])
+        if sys.byteorder != 'little':
+            columns.byteswap()
+        return columns
+
+    def evict(self) -> None:
+        """remove the least recently used entries until the cache fits its limits
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.bin'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum([size for _, size, _ in entries])
+        while len(entries) != 0 and (total_bytes > self.max_bytes or len(entries) > self.max_entries):
+            _, size, path = entries.pop(0)
+            self.remove(path)
+            total_bytes -= size
+
+    def remove(self, path: str) -> None:
+        """remove the entry if exists
+
+        Args:
+            path (str): path of the entry
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class CachedEngine(Engine):
+    """engine that looks up the cache before solving with the given engine
+    """
+
+    def __init__(self,
+                 factory: Callable[[], Any],
+                 n: int,
+                 engine_name: str,
+                 cache: SolutionCache,
+                 fixed: Placements = ()) -> None:
+        """initialize instance
+
+        Args:
+            factory (Callable[[], Any]): function to create the engine used on cache miss
+            n (int): length of chess board
+            engine_name (str): name of the engine, which is a part of the cache key
+            cache (SolutionCache): cache
+            fixed (Placements): placements fixed beforehand. a solution is stored only if it satisfies them
+        """
+        self.factory: Callable[[], Any] = factory
+        self.n: int = n
+        self.engine_name: str = engine_name
+        self.cache: SolutionCache = cache
+        self.fixed: Placements = fixed
+
+        self.engine: Any = None
+        self.columns: Sequence[int] = None
+        self.hit: bool = False
+
+        # variables for debug
+        self.debug_duration_seconds: float = 0
+        self.debug_steps: int = 0
+
+    def solve(self, *args: Any, **kwargs: Any) -> Sequence[Board]:
+        """solve problem, or load the solution from the cache
+
+        Args:
+            args, kwargs: passed to solve() of the engine on cache miss
+        Returns:
+            result (Sequence[Board]): SolveResult of the cached solution on cache hit, otherwise the result of the engine
+        """
+        start_time = time.time()
+        self.columns = self.cache.get(n=self.n, engine_name=self.engine_name, fixed=self.fixed)
+        self.hit = self.columns is not None
+
+        if self.hit:
+            self.debug_duration_seconds = time.time() - start_time
+            self.debug_steps = 0
+            return SolveResult(n=self.n, columns=self.columns, duration_seconds=self.debug_duration_seconds, conflicts=0)
+
+        self.engine = self.factory()
+        boards = self.engine.solve(*args, **kwargs)
+        self.columns = extract_columns(self.engine)
+        self.debug_duration_seconds = time.time() - start_time
+        self.debug_steps = getattr(self.engine, 'debug_steps', 0)
+        if self.has_solution():
+            self.cache.put(columns=self.columns, engine_name=self.engine_name, fixed=self.fixed)
+        return boards
+
+    def has_solution(self) -> bool:
+        """check if the result is a solution
+
+        Returns:
+            (bool): True if it's a solution
+        """
+        if self.columns is None or len(self.columns) != self.n:
+            return False
+        if any(self.columns[row] != column for row, column in self.fixed):
+            return False
+        return validate_columns(self.columns)
@@ -0,0 +1,85 @@
+from typing import Any, Callable, Dict
+import os
+import pickle
+import signal
+import threading
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """write the state of a solve to the file atomically
+
+    Args:
+        path (str): path of the checkpoint file
+        state (Dict[str, Any]): state to be saved
+    """
+    # write to a temporary file first not to break the previous checkpoint when killed while writing
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """read the state of a solve from the file
+
+    Args:
+        path (str): path of the checkpoint file
+    Returns:
+        (Dict[str, Any]): saved state
+    """
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+class StopSignals():
+    """context manager that turns SIGINT and SIGTERM into a stop request
+
+    While `deferred` returns True, the signal is recorded and `on_signal` is called instead of
+    interrupting the process, so that the caller can save a checkpoint at a consistent point and
+    stop by `raise_stop`. Otherwise the signal interrupts the process as usual.
+    Handlers can be installed only from the main thread, so it does nothing on the other threads.
+    """
+    SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+    def __init__(self, deferred: Callable[[], bool], on_signal: Callable[[], None]) -> None:
+        """initialize instance
+
+        Args:
+            deferred (Callable[[], bool]): return True if the signal should be deferred
+            on_signal (Callable[[], None]): called when a signal is deferred
+        """
+        self.deferred: Callable[[], bool] = deferred
+        self.on_signal: Callable[[], None] = on_signal
+        self.received: int = None
+        self.previous_handlers: Dict[int, Any] = {}
+
+    def __enter__(self) -> 'StopSignals':
+        if threading.current_thread() is threading.main_thread():
+            for signum in StopSignals.SIGNALS:
+                self.previous_handlers[signum] = signal.signal(signum, self.handle)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        for signum, handler in self.previous_handlers.items():
+            signal.signal(signum, handler)
+        self.previous_handlers = {}
+
+    def handle(self, signum: int, frame: Any) -> None:
+        """signal handler
+
+        Args:
+            signum (int): signal number
+            frame (Any): current stack frame
+        """
+        self.received = signum
+        if self.deferred():
+            self.on_signal()
+        else:
+            self.raise_stop()
+
+    def raise_stop(self) -> None:
+        """interrupt the process as the received signal would do
+        """
+        if self.received == signal.SIGINT:
+            raise KeyboardInterrupt()
+        raise SystemExit(128 + self.received)
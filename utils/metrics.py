@@ -0,0 +1,388 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Sequence, Tuple
+import math
+import os
+import threading
+import time
+
+# label values of a series, in the order of the label names of its metric
+LabelValues = Tuple[str, ...]
+
+# upper bounds of the histogram of time to solution in seconds
+DURATION_BUCKETS = (0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0, 300.0)
+
+
+class Counter():
+    """monotonically increasing value for each combination of labels
+    """
+    TYPE = 'counter'
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()) -> None:
+        """initialize instance
+
+        Args:
+            name (str): name of the metric
+            description (str): description of the metric
+            label_names (Sequence[str]): names of labels
+        """
+        self.name: str = name
+        self.description: str = description
+        self.label_names: Tuple[str, ...] = tuple(label_names)
+        self.values: Dict[LabelValues, float] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    def labels(self, labels: Dict[str, Any]) -> LabelValues:
+        """get label values in the order of label_names
+
+        Args:
+            labels (Dict[str, Any]): {label name: value}
+        Returns:
+            (LabelValues): values as strings
+        """
+        if set(labels) != set(self.label_names):
+            raise ValueError(f'labels of {self.name} must be {list(self.label_names)}: {sorted(labels)}')
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def inc(self, value: float = 1, **labels: Any) -> None:
+        """increase the value
+
+        Args:
+            value (float): amount, not negative
+            labels (Any): label values
+        """
+        if value < 0:
+            raise ValueError(f'counters only increase: {value}')
+        key = self.labels(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def snapshot(self) -> Dict[LabelValues, Any]:
+        """get a picklable copy of the values
+
+        Returns:
+            (Dict[LabelValues, Any]): {label values: value}
+        """
+        with self.lock:
+            return dict(self.values)
+
+    def merge(self, values: Dict[LabelValues, Any]) -> None:
+        """add values of a snapshot, e.g. taken in another process
+
+        Args:
+            values (Dict[LabelValues, Any]): snapshot
+        """
+        with self.lock:
+            for key, value in values.items():
+                self.values[key] = self.values.get(key, 0) + value
+
+    def samples(self) -> List[Tuple[str, LabelValues, Tuple[str, ...], float]]:
+        """get samples to expose
+
+        Returns:
+            (List[Tuple[str, LabelValues, Tuple[str, ...], float]]): (name, label values, label names, value)
+        """
+        return [(self.name, key, self.label_names, value) for key, value in sorted(self.snapshot().items())]
+
+
+class Histogram(Counter):
+    """distribution of observed values in cumulative buckets, with their sum and count
+    """
+    TYPE = 'histogram'
+
+    def __init__(self,
+                 name: str,
+                 description: str,
+                 label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DURATION_BUCKETS) -> None:
+        """initialize instance
+
+        Args:
+            name (str): name of the metric
+            description (str): description of the metric
+            label_names (Sequence[str]): names of labels
+            buckets (Sequence[float]): upper bounds of buckets in ascending order. +Inf is added
+        """
+        super().__init__(name=name, description=description, label_names=label_names)
+        if list(buckets) != sorted(buckets):
+            raise ValueError(f'buckets must be in ascending order: {buckets}')
+        self.buckets: Tuple[float, ...] = tuple(buckets) + (math.inf,)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """add an observation
+
+        Args:
+            value (float): observed value
+            labels (Any): label values
+        """
+        key = self.labels(labels)
+        with self.lock:
+            # counts of each bucket (not cumulative), sum and count
+            counts = self.values.get(key)
+            if counts is None:
+                counts = self.values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            counts[-2] += value
+            counts[-1] += 1
+
+    def inc(self, value: float = 1, **labels: Any) -> None:
+        raise TypeError('use observe for histograms')
+
+    def snapshot(self) -> Dict[LabelValues, Any]:
+        with self.lock:
+            return {key: list(counts) for key, counts in self.values.items()}
+
+    def merge(self, values: Dict[LabelValues, Any]) -> None:
+        with self.lock:
+            for key, counts in values.items():
+                current = self.values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+                for i, count in enumerate(counts):
+                    current[i] += count
+
+    def samples(self) -> List[Tuple[str, LabelValues, Tuple[str, ...], float]]:
+        samples = []
+        for key, counts in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else repr(float(bound))
+                samples.append((self.name + '_bucket', key + (le,), self.label_names + ('le',), cumulative))
+            samples.append((self.name + '_sum', key, self.label_names, counts[-2]))
+            samples.append((self.name + '_count', key, self.label_names, counts[-1]))
+        return samples
+
+
+class MetricsRegistry():
+    """set of metrics exposed together in the Prometheus text format
+
+    Metrics are safe to update from threads. Worker processes return snapshot() to the parent,
+    which adds them up with merge(), since nothing is shared between processes.
+    """
+
+    def __init__(self) -> None:
+        """initialize instance
+        """
+        self.metrics: Dict[str, Counter] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    def register(self, metric: Counter) -> Counter:
+        """add the metric, or get the one registered with the same name
+
+        Args:
+            metric (Counter): metric
+        Returns:
+            (Counter): the registered metric
+        """
+        with self.lock:
+            registered = self.metrics.setdefault(metric.name, metric)
+        if type(registered) is not type(metric) or registered.label_names != metric.label_names:
+            raise ValueError(f'{metric.name} is already registered as another metric')
+        return registered
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+        """get the counter of the name, registering it on the first call
+
+        Args:
+            name (str): name of the metric
+            description (str): description of the metric
+            label_names (Sequence[str]): names of labels
+        Returns:
+            (Counter): counter
+        """
+        return self.register(Counter(name=name, description=description, label_names=label_names))
+
+    def histogram(self,
+                  name: str,
+                  description: str,
+                  label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DURATION_BUCKETS) -> Histogram:
+        """get the histogram of the name, registering it on the first call
+
+        Args:
+            name (str): name of the metric
+            description (str): description of the metric
+            label_names (Sequence[str]): names of labels
+            buckets (Sequence[float]): upper bounds of buckets in ascending order
+        Returns:
+            (Histogram): histogram
+        """
+        return self.register(Histogram(name=name, description=description, label_names=label_names, buckets=buckets))
+
+    def snapshot(self) -> Dict[str, Dict[LabelValues, Any]]:
+        """get a picklable copy of all values
+
+        Returns:
+            (Dict[str, Dict[LabelValues, Any]]): {metric name: snapshot of the metric}
+        """
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def merge(self, snapshot: Dict[str, Dict[LabelValues, Any]]) -> None:
+        """add values of a snapshot of a registry with the same metrics
+
+        Args:
+            snapshot (Dict[str, Dict[LabelValues, Any]]): snapshot
+        """
+        for name, values in snapshot.items():
+            if name not in self.metrics:
+                raise ValueError(f'unknown metric in the snapshot: {name}')
+            self.metrics[name].merge(values)
+
+    def exposition(self) -> str:
+        """format all metrics in the Prometheus text exposition format
+
+        Returns:
+            (str): text
+        """
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f'# HELP {name} {escape(metric.description, quote=False)}')
+            lines.append(f'# TYPE {name} {metric.TYPE}')
+            for sample_name, values, label_names, value in metric.samples():
+                labels = ','.join(f'{label}="{escape(v)}"' for label, v in zip(label_names, values))
+                lines.append(f'{sample_name}{{{labels}}} {format_value(value)}' if labels else f'{sample_name} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """write the exposition to the file, e.g. for the textfile collector of node_exporter
+
+        the file is replaced atomically, so a scraper never reads a partial file
+
+        Args:
+            path (str): path of the output file
+        """
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w') as f:
+            f.write(self.exposition())
+        os.replace(temporary_path, path)
+
+    def serve(self, port: int = 0, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """serve the exposition on http://host:port/metrics from a daemon thread
+
+        Args:
+            port (int): port. a free port is chosen if 0
+            host (str): address to bind, only the local host by default
+        Returns:
+            (ThreadingHTTPServer): server. server_address has the port, and shutdown() stops it
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.exposition().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class SolverMetrics():
+    """metrics of solves: solves started and finished, steps, random walks, restarts and time to solution
+
+    Engines are not changed: the debug_* counters of an engine are added once after each solve,
+    so nothing is paid in the step loop.
+    """
+
+    def __init__(self, registry: MetricsRegistry = None) -> None:
+        """initialize instance
+
+        Args:
+            registry (MetricsRegistry): registry of the metrics. a new one if None
+        """
+        self.registry: MetricsRegistry = registry if registry is not None else MetricsRegistry()
+        self.started: Counter = self.registry.counter('nqueens_solves_started_total', 'solves started', ['engine'])
+        self.finished: Counter = self.registry.counter('nqueens_solves_finished_total', 'solves finished', ['engine', 'solved'])
+        self.steps: Counter = self.registry.counter('nqueens_steps_total', 'steps of engines', ['engine'])
+        self.random_walks: Counter = self.registry.counter('nqueens_random_walks_total', 'random walks of engines', ['engine'])
+        self.restarts: Counter = self.registry.counter('nqueens_restarts_total', 'restarts of engines', ['engine'])
+        self.duration: Histogram = self.registry.histogram('nqueens_solve_duration_seconds',
+                                                           'time to solution, or to giving up if not solved',
+                                                           ['engine', 'n_bucket', 'solved'])
+
+    def solve(self, engine: Any, engine_name: str, n: int, **kwargs: Any) -> Any:
+        """solve with the engine and record it
+
+        Args:
+            engine (Any): engine
+            engine_name (str): engine name used as the label
+            n (int): length of chess board
+            kwargs (Any): keyword arguments of solve
+        Returns:
+            (Any): the result of solve
+        """
+        self.started.inc(engine=engine_name)
+        start_time = time.perf_counter()
+        result = engine.solve(**kwargs)
+        self.record(engine=engine, engine_name=engine_name, n=n, duration_seconds=time.perf_counter() - start_time)
+        return result
+
+    def record(self, engine: Any, engine_name: str, n: int, duration_seconds: float, solved: bool = None) -> None:
+        """record a finished solve
+
+        Args:
+            engine (Any): engine after solve
+            engine_name (str): engine name used as the label
+            n (int): length of chess board
+            duration_seconds (float): seconds the solve took
+            solved (bool): whether a solution was found. taken from the engine if None
+        """
+        if solved is None:
+            solved = engine.has_solution() if hasattr(engine, 'has_solution') else (getattr(engine, 'solution_count', None) or 0) > 0
+        self.finished.inc(engine=engine_name, solved=str(solved).lower())
+        self.steps.inc(getattr(engine, 'debug_steps', 0), engine=engine_name)
+        self.random_walks.inc(getattr(engine, 'debug_random_walks', 0), engine=engine_name)
+        self.restarts.inc(getattr(engine, 'debug_restarts', 0), engine=engine_name)
+        self.duration.observe(duration_seconds, engine=engine_name, n_bucket=n_bucket(n), solved=str(solved).lower())
+
+
+def n_bucket(n: int) -> str:
+    """get the bucket of n, the smallest power of 10 not less than n, which keeps the number of series small
+
+    Args:
+        n (int): length of chess board
+    Returns:
+        (str): bucket, e.g. '1000' for n = 200
+    """
+    bucket = 1
+    while bucket < n:
+        bucket *= 10
+    return str(bucket)
+
+
+def escape(value: str, quote: bool = True) -> str:
+    """escape a label value or a help text
+
+    Args:
+        value (str): text
+        quote (bool): escape double quotes, which is needed for label values
+    Returns:
+        (str): escaped text
+    """
+    value = value.replace('\\', '\\\\').replace('\n', '\\n')
+    return value.replace('"', '\\"') if quote else value
+
+
+def format_value(value: float) -> str:
+    """format a sample value
+
+    Args:
+        value (float): value
+    Returns:
+        (str): integers without a decimal point, otherwise repr of float
+    """
+    if isinstance(value, int) or (isinstance(value, float) and value.is_integer()):
+        return str(int(value))
+    return repr(float(value))
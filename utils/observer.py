@@ -0,0 +1,144 @@
+from models.model import SolveStatus
+from typing import IO
+import sys
+import time
+
+
+class Observer():
+    """receiver of the progress of a solve, called at most every `every_steps` steps or about every `every_seconds`
+
+    The engine only compares the step with the step returned by the last call, so observing costs a single
+    integer comparison per step. The seconds are turned into steps by the rate measured between calls.
+    Subclasses override on_progress, and return True from it to stop the solve early.
+    """
+
+    def __init__(self, every_steps: int = 1000, every_seconds: float = None) -> None:
+        """initialize instance
+
+        Args:
+            every_steps (int): the maximum number of steps between calls
+            every_seconds (float): the target interval of calls in seconds. only every_steps is used if None
+        """
+        if every_steps < 1:
+            raise ValueError(f'every_steps must be positive: {every_steps}')
+        if every_seconds is not None and every_seconds <= 0:
+            raise ValueError(f'every_seconds must be positive: {every_seconds}')
+        self.every_steps: int = every_steps
+        self.every_seconds: float = every_seconds
+        self.stop_requested: bool = False
+
+        # the step and the time of the last call, which measure the rate
+        self.last_step: int = None
+        self.last_time: float = None
+        self.steps_per_second: float = 0.0
+        # the current number of steps between calls
+        self.interval: int = every_steps if every_seconds is None else 1
+
+    def observe(self, status: SolveStatus) -> int:
+        """notify the status and get the step of the next call
+
+        Args:
+            status (SolveStatus): the current status
+        Returns:
+            (int): the step on which the engine calls this next
+        """
+        now = time.time()
+        if self.last_step is not None and now > self.last_time and status.step > self.last_step:
+            self.steps_per_second = (status.step - self.last_step) / (now - self.last_time)
+        self.last_step = status.step
+        self.last_time = now
+
+        if self.on_progress(status):
+            self.stop_requested = True
+
+        if self.every_seconds is None:
+            self.interval = self.every_steps
+        elif self.steps_per_second == 0:
+            self.interval = 1
+        else:
+            # do not grow too fast because the rate is just an estimate
+            self.interval = max(1, min(int(self.steps_per_second * self.every_seconds), self.interval * 2, self.every_steps))
+        return status.step + self.interval
+
+    def finish(self, status: SolveStatus) -> None:
+        """notify the last status of the solve
+
+        Args:
+            status (SolveStatus): the status of the end
+        """
+        self.on_progress(status)
+
+    def on_progress(self, status: SolveStatus) -> bool:
+        """handle the status
+
+        Args:
+            status (SolveStatus): the current status
+        Returns:
+            (bool): True to stop the solve
+        """
+        return False
+
+
+class ProgressReporter(Observer):
+    """observer that rewrites a line on the terminal with steps per second, conflicts and the ETA
+
+    The ETA extrapolates the decrease of conflicts since the first call, and is unknown while
+    conflicts are not decreasing.
+    """
+
+    def __init__(self, every_steps: int = 100000, every_seconds: float = 0.5, stream: IO[str] = None) -> None:
+        """initialize instance
+
+        Args:
+            every_steps (int): the maximum number of steps between calls
+            every_seconds (float): the target interval of calls in seconds
+            stream (IO[str]): output. Default stderr
+        """
+        super().__init__(every_steps=every_steps, every_seconds=every_seconds)
+        self.stream: IO[str] = stream if stream is not None else sys.stderr
+        self.first_conflicts: int = None
+        self.first_elapsed_seconds: float = None
+
+    def eta_seconds(self, status: SolveStatus) -> float:
+        """estimate seconds until no conflicts remain
+
+        Args:
+            status (SolveStatus): the current status
+        Returns:
+            (float): seconds, None if unknown
+        """
+        if status.conflicts == 0:
+            return 0.0
+        if self.first_conflicts is None or status.elapsed_seconds <= self.first_elapsed_seconds:
+            return None
+        decrease_per_second = (self.first_conflicts - status.conflicts) / (status.elapsed_seconds - self.first_elapsed_seconds)
+        if decrease_per_second <= 0:
+            return None
+        return status.conflicts / decrease_per_second
+
+    def format(self, status: SolveStatus) -> str:
+        """format the status in a line
+
+        Args:
+            status (SolveStatus): the current status
+        Returns:
+            (str): line
+        """
+        eta = self.eta_seconds(status)
+        eta_text = '?' if eta is None else f'{eta:.1f}s'
+        return (f'{status.phase} n={status.n} step={status.step}/{status.max_steps} '
+                f'{self.steps_per_second:.0f} steps/s conflicts={status.conflicts} '
+                f'eta={eta_text} elapsed={status.elapsed_seconds:.1f}s')
+
+    def on_progress(self, status: SolveStatus) -> bool:
+        if self.first_conflicts is None:
+            self.first_conflicts = status.conflicts
+            self.first_elapsed_seconds = status.elapsed_seconds
+        self.stream.write('\r' + self.format(status) + '\x1b[K')
+        self.stream.flush()
+        return False
+
+    def finish(self, status: SolveStatus) -> None:
+        super().finish(status)
+        self.stream.write('\n')
+        self.stream.flush()
@@ -0,0 +1,162 @@
+from itertools import repeat, starmap
+from typing import Any, List, MutableSequence, Sequence
+import random
+import struct
+
+
+class RandomStream():
+    """seedable random source that serves numbers from pre-drawn buffers
+
+    Random numbers are drawn from the generator in large blocks and converted to Python lists,
+    so each draw in the step loop is a list lookup instead of a call into `random`. Integers below
+    `stop` are taken from 32-bit words by multiply-shift, which needs no division.
+    Words are cut out of a single `getrandbits` call as little-endian, so a seed gives the same stream
+    on any host, and floats are drawn by a loop in C. This keeps NumPy out of the startup of the engines.
+    """
+    WORD_BITS = 32
+
+    def __init__(self, seed: int = None, buffer_size: int = 4096) -> None:
+        """initialize instance
+
+        Args:
+            seed (int): seed of the generator. the stream is not reproducible if None
+            buffer_size (int): the number of numbers drawn at once
+        """
+        if buffer_size < 1:
+            raise ValueError(f'buffer_size must be positive: {buffer_size}')
+        self.seed: int = seed
+        self.buffer_size: int = buffer_size
+        self.generator: random.Random = random.Random(seed)
+        # unpacks a block of words, independently of the byte order of the host
+        self.word_struct: struct.Struct = struct.Struct(f'<{buffer_size}I')
+
+        # pre-drawn 32-bit words and floats in [0, 1), and the position of the next one
+        self.words: List[int] = []
+        self.word_index: int = 0
+        self.floats: List[float] = []
+        self.float_index: int = 0
+
+    def refill_words(self) -> None:
+        """draw the next block of 32-bit words
+        """
+        bits = self.generator.getrandbits(RandomStream.WORD_BITS * self.buffer_size)
+        self.words = list(self.word_struct.unpack(bits.to_bytes(self.word_struct.size, 'little')))
+        self.word_index = 0
+
+    def refill_floats(self) -> None:
+        """draw the next block of floats
+        """
+        self.floats = list(starmap(self.generator.random, repeat((), self.buffer_size)))
+        self.float_index = 0
+
+    def random(self) -> float:
+        """get a float in [0, 1)
+
+        Returns:
+            (float): random float
+        """
+        if self.float_index == len(self.floats):
+            self.refill_floats()
+        x = self.floats[self.float_index]
+        self.float_index += 1
+        return x
+
+    def randrange(self, stop: int) -> int:
+        """get an integer in [0, stop)
+
+        Args:
+            stop (int): the upper bound, up to 2 ** 32
+        Returns:
+            (int): random integer
+        """
+        if self.word_index == len(self.words):
+            self.refill_words()
+        x = self.words[self.word_index]
+        self.word_index += 1
+        return (x * stop) >> RandomStream.WORD_BITS
+
+    def randint(self, a: int, b: int) -> int:
+        """get an integer in [a, b]
+
+        Args:
+            a (int): the lower bound
+            b (int): the upper bound, inclusive
+        Returns:
+            (int): random integer
+        """
+        return a + self.randrange(b - a + 1)
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        """choose an item
+
+        Args:
+            seq (Sequence[Any]): non-empty sequence
+        Returns:
+            (Any): random item of seq
+        """
+        return seq[self.randrange(len(seq))]
+
+    def shuffle(self, x: MutableSequence[Any]) -> None:
+        """shuffle the sequence in place by Fisher-Yates
+
+        Args:
+            x (MutableSequence[Any]): sequence to be shuffled
+        """
+        for i in range(len(x) - 1, 0, -1):
+            j = self.randrange(i + 1)
+            x[i], x[j] = x[j], x[i]
+
+    def sample(self, population: Sequence[Any], k: int) -> List[Any]:
+        """choose k distinct items
+
+        Args:
+            population (Sequence[Any]): sequence to choose from
+            k (int): the number of items, up to len(population)
+        Returns:
+            (List[Any]): random items in random order
+        """
+        n = len(population)
+        if not 0 <= k <= n:
+            raise ValueError(f'k must be from 0 to {n}: {k}')
+
+        # few items are chosen by rejection, which does not copy the population
+        if 4 * k <= n:
+            chosen = set()
+            result = []
+            while len(result) < k:
+                i = self.randrange(n)
+                if i not in chosen:
+                    chosen.add(i)
+                    result.append(population[i])
+            return result
+
+        # otherwise, the first k items of a partial Fisher-Yates shuffle
+        pool = list(population)
+        for i in range(k):
+            j = i + self.randrange(n - i)
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+    def getstate(self) -> dict:
+        """get the state to restore the stream later
+
+        Returns:
+            (dict): picklable state, including numbers left in the buffers
+        """
+        return {
+            'generator': self.generator.getstate(),
+            'words': self.words[self.word_index:],
+            'floats': self.floats[self.float_index:],
+        }
+
+    def setstate(self, state: dict) -> None:
+        """restore the state taken by getstate
+
+        Args:
+            state (dict): state
+        """
+        self.generator.setstate(state['generator'])
+        self.words = list(state['words'])
+        self.word_index = 0
+        self.floats = list(state['floats'])
+        self.float_index = 0
@@ -0,0 +1,192 @@
+from typing import Dict, List, NamedTuple, Tuple
+import csv
+import math
+import os
+import random
+
+# the metrics of the benchmark harness compared between runs
+METRICS: List[str] = ['duration_seconds', 'steps']
+# old column names in analysis/ -> names of the benchmark harness
+COLUMN_ALIASES: Dict[str, str] = {'duration_sec': 'duration_seconds'}
+
+
+class MetricComparison(NamedTuple):
+    """comparison of a metric of (engine, n) between baseline and candidate
+    """
+    engine: str
+    n: int
+    metric: str
+    baseline_runs: int
+    candidate_runs: int
+    baseline_median: float
+    candidate_median: float
+    candidate_p90: float
+    candidate_p99: float
+    # median of candidate / median of baseline, and its bootstrap confidence interval
+    ratio: float
+    ratio_low: float
+    ratio_high: float
+    regressed: bool
+
+
+def load_results(path: str, engine: str = None, n: int = None) -> Dict[Tuple[str, int], Dict[str, List[float]]]:
+    """load a CSV of the benchmark harness
+
+    CSVs in analysis/ have neither engine nor n. For them, the engine is given or the file name,
+    and n is given or the row number, as the notebook wrote one row for each n from 0.
+
+    Args:
+        path (str): path of the CSV
+        engine (str): engine name of rows without it. If given, rows of other engines are ignored
+        n (int): n of rows without it
+    Returns:
+        (Dict[Tuple[str, int], Dict[str, List[float]]]): (engine, n) -> metric -> values of runs
+    """
+    default_engine = engine if engine is not None else os.path.splitext(os.path.basename(path))[0]
+    results = {}
+    with open(path, newline='') as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            row = {COLUMN_ALIASES.get(k, k): v for k, v in row.items()}
+            row_engine = row.get('engine') or default_engine
+            if engine is not None and row_engine != engine:
+                continue
+            row_n = int(row['n']) if row.get('n') else (n if n is not None else i)
+            values = results.setdefault((row_engine, row_n), {metric: [] for metric in METRICS})
+            for metric in METRICS:
+                if row.get(metric):
+                    values[metric].append(float(row[metric]))
+    return results
+
+
+def percentile(values: List[float], q: float) -> float:
+    """get the percentile with linear interpolation
+
+    Args:
+        values (List[float]): non-empty values
+        q (float): percentile from 0 to 100
+    Returns:
+        (float): percentile
+    """
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    if values[lower] == values[upper]:
+        # also avoids inf - inf
+        return values[lower]
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def median(values: List[float]) -> float:
+    """get the median
+
+    Args:
+        values (List[float]): non-empty values
+    Returns:
+        (float): median
+    """
+    return percentile(values, 50)
+
+
+def ratio_of_medians(baseline: List[float], candidate: List[float]) -> float:
+    """get median of candidate / median of baseline
+
+    Args:
+        baseline (List[float]): values of baseline
+        candidate (List[float]): values of candidate
+    Returns:
+        (float): ratio. 1 if both medians are 0, and inf if only the baseline is 0
+    """
+    b = median(baseline)
+    c = median(candidate)
+    if b == 0:
+        return 1.0 if c == 0 else math.inf
+    return c / b
+
+
+def bootstrap_ratio(baseline: List[float], candidate: List[float], resamples: int = 1000, confidence: float = 0.95,
+                    seed: int = 0) -> Tuple[float, float]:
+    """get the bootstrap confidence interval of the ratio of medians
+
+    Runs of each side are resampled with replacement, and the percentiles of the ratios are taken.
+
+    Args:
+        baseline (List[float]): values of baseline
+        candidate (List[float]): values of candidate
+        resamples (int): the number of resamples
+        confidence (float): confidence level
+        seed (int): seed of resampling, so that a report is reproducible
+    Returns:
+        low (float): lower bound
+        high (float): upper bound
+    """
+    r = random.Random(seed)
+    ratios = []
+    for _ in range(resamples):
+        b = r.choices(baseline, k=len(baseline))
+        c = r.choices(candidate, k=len(candidate))
+        ratios.append(ratio_of_medians(baseline=b, candidate=c))
+    alpha = (1 - confidence) / 2 * 100
+    return percentile(ratios, alpha), percentile(ratios, 100 - alpha)
+
+
+def compare(baseline: Dict[Tuple[str, int], Dict[str, List[float]]], candidate: Dict[Tuple[str, int], Dict[str, List[float]]],
+            threshold: float = 0.1, resamples: int = 1000) -> List[MetricComparison]:
+    """compare metrics of (engine, n) found in both results
+
+    A metric regresses if the ratio of medians exceeds 1 + threshold and the lower bound of its confidence
+    interval exceeds 1, so a slow run caused by noise alone does not fail the gate.
+
+    Args:
+        baseline (Dict[Tuple[str, int], Dict[str, List[float]]]): results loaded by load_results
+        candidate (Dict[Tuple[str, int], Dict[str, List[float]]]): results loaded by load_results
+        threshold (float): allowed relative increase of the median
+        resamples (int): the number of bootstrap resamples
+    Returns:
+        (List[MetricComparison]): comparisons ordered by engine, n and metric
+    """
+    comparisons = []
+    for key in sorted(set(baseline) & set(candidate)):
+        for metric in METRICS:
+            b = baseline[key][metric]
+            c = candidate[key][metric]
+            if len(b) == 0 or len(c) == 0:
+                continue
+            ratio = ratio_of_medians(baseline=b, candidate=c)
+            low, high = bootstrap_ratio(baseline=b, candidate=c, resamples=resamples)
+            comparisons.append(MetricComparison(
+                engine=key[0],
+                n=key[1],
+                metric=metric,
+                baseline_runs=len(b),
+                candidate_runs=len(c),
+                baseline_median=median(b),
+                candidate_median=median(c),
+                candidate_p90=percentile(c, 90),
+                candidate_p99=percentile(c, 99),
+                ratio=ratio,
+                ratio_low=low,
+                ratio_high=high,
+                regressed=ratio > 1 + threshold and low > 1,
+            ))
+    return comparisons
+
+
+def format_report(comparisons: List[MetricComparison]) -> str:
+    """format comparisons as a table
+
+    Args:
+        comparisons (List[MetricComparison]): comparisons
+    Returns:
+        (str): report. regressed rows are marked with REGRESSED
+    """
+    lines = ['engine n metric runs baseline_median candidate_median candidate_p90 candidate_p99 ratio [95% CI]']
+    for c in comparisons:
+        lines.append(
+            f'{c.engine} {c.n} {c.metric} {c.baseline_runs}/{c.candidate_runs} {c.baseline_median:.6g} {c.candidate_median:.6g} '
+            f'{c.candidate_p90:.6g} {c.candidate_p99:.6g} {c.ratio:.3f} [{c.ratio_low:.3f}, {c.ratio_high:.3f}]'
+            + (' REGRESSED' if c.regressed else ''))
+    regressed = [c for c in comparisons if c.regressed]
+    lines.append(f'{len(regressed)} of {len(comparisons)} metrics regressed')
+    return '\n'.join(lines)
+
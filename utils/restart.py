@@ -0,0 +1,137 @@
+from abc import ABCMeta, abstractmethod
+from typing import Dict, Type
+
+
+def luby(i: int) -> int:
+    """get the i-th term of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...
+
+    Args:
+        i (int): index from 1
+    Returns:
+        (int): the term
+    """
+    if i < 1:
+        raise ValueError(f'index of the Luby sequence must be positive: {i}')
+    while True:
+        # k is the smallest with i <= 2^k - 1
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+class RestartPolicy(metaclass=ABCMeta):
+    """when a search gives up the current placement and starts again from a new initialization
+
+    A run ends after `run_steps(run)` steps. If `window` is set, the run also ends when conflicts
+    have not reached a new minimum of the run within the last `window` steps.
+    """
+
+    def __init__(self, window: int = None) -> None:
+        """initialize instance
+
+        Args:
+            window (int): steps between checks of stagnation. stagnation is not checked if None
+        """
+        if window is not None and window < 1:
+            raise ValueError(f'window must be positive: {window}')
+        self.window: int = window
+
+    @abstractmethod
+    def run_steps(self, run: int) -> int:
+        """get the maximum number of steps of the run
+
+        Args:
+            run (int): index of the run from 0
+        Returns:
+            (int): steps
+        """
+        pass
+
+
+class LubyRestarts(RestartPolicy):
+    """restart after unit times the terms of the Luby sequence, which is optimal within a constant factor
+    for runtimes of any unknown distribution
+    """
+
+    def __init__(self, unit: int, window: int = None) -> None:
+        """initialize instance
+
+        Args:
+            unit (int): steps of the shortest run
+            window (int): steps between checks of stagnation. stagnation is not checked if None
+        """
+        super().__init__(window=window)
+        if unit < 1:
+            raise ValueError(f'unit must be positive: {unit}')
+        self.unit: int = unit
+
+    def run_steps(self, run: int) -> int:
+        return self.unit * luby(run + 1)
+
+
+class GeometricRestarts(RestartPolicy):
+    """restart after first, first * factor, first * factor^2, ... steps
+    """
+
+    def __init__(self, first: int, factor: float = 2.0, window: int = None) -> None:
+        """initialize instance
+
+        Args:
+            first (int): steps of the first run
+            factor (float): ratio of the steps of a run to the previous one, at least 1
+            window (int): steps between checks of stagnation. stagnation is not checked if None
+        """
+        super().__init__(window=window)
+        if first < 1:
+            raise ValueError(f'first must be positive: {first}')
+        if factor < 1:
+            raise ValueError(f'factor must be at least 1: {factor}')
+        self.first: int = first
+        self.factor: float = factor
+
+    def run_steps(self, run: int) -> int:
+        return max(int(self.first * self.factor ** run), 1)
+
+
+class StagnationRestarts(RestartPolicy):
+    """restart only when conflicts stagnate for a window
+    """
+
+    def __init__(self, window: int) -> None:
+        """initialize instance
+
+        Args:
+            window (int): steps between checks of stagnation
+        """
+        super().__init__(window=window)
+
+    def run_steps(self, run: int) -> int:
+        # bounded by the step budget of the engine
+        return 1 << 62
+
+
+# name -> policy class, for command line options
+POLICIES: Dict[str, Type[RestartPolicy]] = {
+    'luby': LubyRestarts,
+    'geometric': GeometricRestarts,
+    'stagnation': StagnationRestarts,
+}
+
+
+def create_policy(name: str, steps: int) -> RestartPolicy:
+    """create the restart policy from its name and a single scale
+
+    Args:
+        name (str): one of POLICIES
+        steps (int): unit of luby, the first run of geometric or the window of stagnation
+    Returns:
+        (RestartPolicy): policy
+    """
+    if name not in POLICIES:
+        raise ValueError(f'unknown restart policy: {name}. choose from {list(POLICIES)}')
+    if name == 'luby':
+        return LubyRestarts(unit=steps)
+    if name == 'geometric':
+        return GeometricRestarts(first=steps)
+    return StagnationRestarts(window=steps)
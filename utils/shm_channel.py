@@ -0,0 +1,223 @@
+from models.model import PermutationBoard
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, NamedTuple, Sequence
+import ctypes
+import numpy as np
+import os
+import uuid
+
+# directory where POSIX shared memory blocks appear on Linux
+SHM_DIRECTORY = '/dev/shm'
+
+
+class ResultHandle(NamedTuple):
+    """what a worker returns instead of the result itself
+    """
+    # name of the shared memory block holding the columns
+    name: str
+    # length of chess board
+    n: int
+    # small picklable data such as solved, duration_seconds and steps
+    metadata: Dict[str, Any]
+
+
+class ResultWriter():
+    """writer of results used in worker processes
+
+    It is picklable, so it can be passed to ProcessPoolExecutor.submit. Blocks are named with the prefix
+    of the channel and a random suffix, so the channel can find blocks whose handles never came back,
+    e.g. when the parent has stopped waiting, and a reused pid never gives the name of a live block.
+    """
+
+    def __init__(self, prefix: str) -> None:
+        """initialize instance
+
+        Args:
+            prefix (str): prefix of the names of blocks
+        """
+        self.prefix: str = prefix
+
+    def write(self, columns: Sequence[int], metadata: Dict[str, Any] = None) -> ResultHandle:
+        """write the columns into a new shared memory block
+
+        Args:
+            columns (Sequence[int]): column of the queen on each row
+            metadata (Dict[str, Any]): small picklable data returned with the handle
+        Returns:
+            (ResultHandle): handle to be returned to the parent
+        """
+        n = len(columns)
+        name = f'{self.prefix}_{uuid.uuid4().hex[:12]}'
+        block = shared_memory.SharedMemory(name=name, create=True, size=max(4 * n, 1))
+        try:
+            view = np.ndarray((n,), dtype=np.int32, buffer=block.buf)
+            view[:] = columns
+            del view
+        except BaseException:
+            block.close()
+            block.unlink()
+            raise
+        # the block lives on after the worker unmaps it, until the channel unlinks it. the channel owns it,
+        # so the resource tracker of the worker must not unlink it when the worker exits
+        block.close()
+        resource_tracker.unregister(block._name, 'shared_memory')
+        return ResultHandle(name=name, n=n, metadata=metadata if metadata is not None else {})
+
+
+class ResultChannel():
+    """receiver of results written by workers into shared memory
+
+    The parent maps the block of each handle and gets the columns as a NumPy view, so nothing of size n
+    is pickled or copied. The channel owns the blocks: release() or close() unlinks them, and close()
+    also removes blocks of this channel whose handles were never received. Views taken from a released
+    block stay readable until they are garbage collected, but the block can no longer be opened.
+
+    Usage:
+        with ResultChannel() as channel:
+            handle = executor.submit(solve_and_write, channel.writer(), 'v6', n).result()
+            board = channel.board(handle)
+    """
+
+    def __init__(self) -> None:
+        """initialize instance
+        """
+        # short enough for the limit of 31 characters of names on macOS
+        self.prefix: str = f'nq{uuid.uuid4().hex[:8]}'
+        self.blocks: Dict[str, shared_memory.SharedMemory] = {}
+
+    def __enter__(self) -> 'ResultChannel':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def writer(self) -> ResultWriter:
+        """get the writer to pass to workers
+
+        Returns:
+            (ResultWriter): writer
+        """
+        return ResultWriter(prefix=self.prefix)
+
+    def columns(self, handle: ResultHandle) -> np.ndarray:
+        """get the columns of the result without copying
+
+        Args:
+            handle (ResultHandle): handle returned by a worker
+        Returns:
+            (np.ndarray): int32 view of the block
+        """
+        if not handle.name.startswith(self.prefix):
+            raise ValueError(f'the block does not belong to this channel: {handle.name}')
+        block = self.blocks.get(handle.name)
+        if block is None:
+            block = attach_block(name=handle.name)
+            self.blocks[handle.name] = block
+        # a ctypes array holds an export of the mapping, which keeps it mapped after the block is released.
+        # NumPy alone would keep only the mmap object, which the block unmaps on close
+        return np.frombuffer((ctypes.c_int32 * handle.n).from_buffer(block.buf), dtype=np.int32)
+
+    def board(self, handle: ResultHandle) -> PermutationBoard:
+        """get the result as a board backed by the block
+
+        Args:
+            handle (ResultHandle): handle returned by a worker
+        Returns:
+            (PermutationBoard): board
+        """
+        return PermutationBoard(n=handle.n, columns=self.columns(handle))
+
+    def release(self, handle: ResultHandle) -> None:
+        """free the block of the handle
+
+        Args:
+            handle (ResultHandle): handle returned by a worker
+        """
+        block = self.blocks.pop(handle.name, None)
+        if block is None:
+            block = attach_block(name=handle.name)
+        release_block(block)
+
+    def close(self) -> None:
+        """free all blocks of this channel
+        """
+        for block in self.blocks.values():
+            release_block(block)
+        self.blocks = {}
+        for name in orphan_names(prefix=self.prefix):
+            try:
+                release_block(attach_block(name=name))
+            except FileNotFoundError:
+                pass
+
+
+def attach_block(name: str) -> shared_memory.SharedMemory:
+    """open the block written by a worker and take its ownership
+
+    The block is registered to the resource tracker of this process, so it is freed even if this process
+    dies before releasing it.
+
+    Args:
+        name (str): name of the block
+    Returns:
+        (shared_memory.SharedMemory): block
+    """
+    block = shared_memory.SharedMemory(name=name)
+    resource_tracker.register(block._name, 'shared_memory')
+    return block
+
+
+def release_block(block: shared_memory.SharedMemory) -> None:
+    """unlink the block and unmap it unless views of it are still alive
+
+    Args:
+        block (shared_memory.SharedMemory): block
+    """
+    block.unlink()
+    try:
+        block.close()
+    except BufferError:
+        # the mapping is unmapped with the last view. the block forgets it, so that closing the block again,
+        # e.g. on garbage collection, does not fail
+        block._mmap = None
+        block.close()
+
+
+def orphan_names(prefix: str) -> List[str]:
+    """get names of existing blocks with the prefix
+
+    Args:
+        prefix (str): prefix of names
+    Returns:
+        (List[str]): names. always empty where blocks are not listed as files
+    """
+    if not os.path.isdir(SHM_DIRECTORY):
+        return []
+    return [name for name in os.listdir(SHM_DIRECTORY) if name.startswith(prefix + '_')]
+
+
+def solve_and_write(writer: ResultWriter, engine_name: str, n: int, **kwargs: Any) -> ResultHandle:
+    """solve problem in a worker and write the solution to shared memory
+
+    Args:
+        writer (ResultWriter): writer of the channel
+        engine_name (str): name of an engine in the registry
+        n (int): length of chess board
+        kwargs (Any): keyword arguments of the engine
+    Returns:
+        (ResultHandle): handle whose metadata has solved, duration_seconds and steps
+    """
+    # imported here, so that the parent does not import the registry only to receive results
+    from engine.registry import create_engine
+    from utils.util import extract_columns
+
+    e = create_engine(engine_name, n=n, **kwargs)
+    boards = e.solve()
+    solved = e.has_solution() if hasattr(e, 'has_solution') else bool(boards)
+    columns = extract_columns(e) if solved else [-1] * n
+    return writer.write(columns=columns, metadata={
+        'engine': engine_name,
+        'solved': solved,
+        'duration_seconds': getattr(e, 'debug_duration_seconds', 0),
+        'steps': getattr(e, 'debug_steps', 0),
+    })
@@ -0,0 +1,79 @@
+from engine.minconflicts_engine_6 import MinConflictsEngine
+from utils.cache import CachedEngine, SolutionCache
+import os
+
+
+def test_get_and_put(tmp_path):
+    """test for get and put
+    """
+    c = SolutionCache(directory=str(tmp_path))
+    assert c.get(n=4, engine_name='v6') is None
+
+    c.put(columns=[1, 3, 0, 2], engine_name='v6')
+    assert list(c.get(n=4, engine_name='v6')) == [1, 3, 0, 2]
+
+    # keys are separated by engine and fixed placements
+    assert c.get(n=4, engine_name='v1') is None
+    assert c.get(n=4, engine_name='v6', fixed=[(0, 1)]) is None
+    c.put(columns=[1, 3, 0, 2], engine_name='v6', fixed=[(0, 1)])
+    assert list(c.get(n=4, engine_name='v6', fixed=[(0, 1)])) == [1, 3, 0, 2]
+
+
+def test_broken_entry(tmp_path):
+    """test that broken entries are rejected on load
+    """
+    c = SolutionCache(directory=str(tmp_path))
+
+    # not a solution
+    c.put(columns=[0, 1, 2, 3], engine_name='v6')
+    assert c.get(n=4, engine_name='v6') is None
+    assert not os.path.exists(c.path(n=4, engine_name='v6'))
+
+    # truncated
+    c.put(columns=[1, 3, 0, 2], engine_name='v6')
+    path = c.path(n=4, engine_name='v6')
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-1])
+    assert c.get(n=4, engine_name='v6') is None
+
+
+def test_evict(tmp_path):
+    """test that the least recently used entries are evicted
+    """
+    c = SolutionCache(directory=str(tmp_path), max_entries=2)
+    c.put(columns=[0], engine_name='a')
+    os.utime(c.path(n=1, engine_name='a'), (1, 1))
+    c.put(columns=[0], engine_name='b')
+    os.utime(c.path(n=1, engine_name='b'), (2, 2))
+
+    # 'a' is used recently, so 'b' is evicted
+    assert c.get(n=1, engine_name='a') is not None
+    c.put(columns=[0], engine_name='c')
+    assert c.get(n=1, engine_name='b') is None
+    assert c.get(n=1, engine_name='a') is not None
+    assert c.get(n=1, engine_name='c') is not None
+
+    # total size is limited
+    c = SolutionCache(directory=str(tmp_path / 'small'), max_bytes=100)
+    c.put(columns=[1, 3, 0, 2], engine_name='v6')
+    c.put(columns=[i for i in range(100)], engine_name='v6')
+    assert os.listdir(c.directory) == [os.path.basename(c.path(n=4, engine_name='v6'))]
+
+
+def test_cached_engine(tmp_path):
+    """test for CachedEngine
+    """
+    c = SolutionCache(directory=str(tmp_path))
+    e = CachedEngine(factory=lambda: MinConflictsEngine(n=30), n=30, engine_name='v6', cache=c)
+    e.solve()
+    assert not e.hit
+    assert e.has_solution()
+
+    e2 = CachedEngine(factory=lambda: MinConflictsEngine(n=30), n=30, engine_name='v6', cache=c)
+    boards = e2.solve(enable_print=True)
+    assert e2.hit
+    assert e2.engine is None
+    assert list(e2.columns) == list(e.columns)
+    assert boards[0].has_queen(at=(0, e.columns[0]))
@@ -0,0 +1,120 @@
+from engine.registry import create_engine
+from utils.metrics import MetricsRegistry, SolverMetrics, n_bucket
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import urllib.request
+import pytest
+
+
+def solve_in_worker(n):
+    metrics = SolverMetrics()
+    metrics.solve(create_engine('v6', n=n, seed=0), engine_name='v6', n=n)
+    return metrics.registry.snapshot()
+
+
+def test_exposition():
+    """test for exposition
+    """
+    registry = MetricsRegistry()
+    c = registry.counter('solves_total', 'solves', ['engine'])
+    c.inc(engine='v6')
+    c.inc(2, engine='v6')
+    c.inc(engine='dfs "1"')
+    h = registry.histogram('duration_seconds', 'time\nto solution', ['engine'], buckets=[0.1, 1])
+    h.observe(0.05, engine='v6')
+    h.observe(0.5, engine='v6')
+    h.observe(5, engine='v6')
+    registry.counter('empty_total', 'no labels').inc(1.5)
+    assert registry.exposition().splitlines() == [
+        '# HELP duration_seconds time\\nto solution',
+        '# TYPE duration_seconds histogram',
+        'duration_seconds_bucket{engine="v6",le="0.1"} 1',
+        'duration_seconds_bucket{engine="v6",le="1.0"} 2',
+        'duration_seconds_bucket{engine="v6",le="+Inf"} 3',
+        'duration_seconds_sum{engine="v6"} 5.55',
+        'duration_seconds_count{engine="v6"} 3',
+        '# HELP empty_total no labels',
+        '# TYPE empty_total counter',
+        'empty_total 1.5',
+        '# HELP solves_total solves',
+        '# TYPE solves_total counter',
+        'solves_total{engine="dfs \\"1\\""} 1',
+        'solves_total{engine="v6"} 3',
+    ]
+
+    # the same metric is shared, and conflicting ones are rejected
+    assert registry.counter('solves_total', 'solves', ['engine']) is c
+    with pytest.raises(ValueError):
+        registry.histogram('solves_total', 'solves', ['engine'])
+    with pytest.raises(ValueError):
+        c.inc(engine='v6', n=8)
+    with pytest.raises(ValueError):
+        c.inc(-1, engine='v6')
+
+
+def test_threads_and_processes():
+    """test for updates from threads and aggregation of processes
+    """
+    registry = MetricsRegistry()
+    c = registry.counter('steps_total', 'steps')
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(4):
+            executor.submit(lambda: [c.inc() for _ in range(10000)])
+    assert c.snapshot() == {(): 40000}
+
+    metrics = SolverMetrics()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for snapshot in executor.map(solve_in_worker, [8, 8, 200]):
+            metrics.registry.merge(snapshot)
+    assert metrics.started.snapshot() == {('v6',): 3}
+    assert metrics.finished.snapshot() == {('v6', 'true'): 3}
+    assert metrics.steps.snapshot()[('v6',)] > 0
+    assert metrics.duration.snapshot()[('v6', '10', 'true')][-1] == 2
+    assert metrics.duration.snapshot()[('v6', '1000', 'true')][-1] == 1
+
+
+def test_write_and_serve(tmp_path):
+    """test for write and serve
+    """
+    metrics = SolverMetrics()
+    e = create_engine('v6', n=8, seed=0)
+    result = metrics.solve(e, engine_name='v6', n=8)
+    assert result.is_solution()
+
+    path = str(tmp_path / 'solver.prom')
+    metrics.registry.write(path=path)
+    with open(path) as f:
+        text = f.read()
+    assert text == metrics.registry.exposition()
+    assert f'nqueens_steps_total{{engine="v6"}} {e.debug_steps}' in text
+
+    server = metrics.registry.serve()
+    try:
+        host, port = server.server_address
+        with urllib.request.urlopen(f'http://{host}:{port}/metrics') as response:
+            assert response.read().decode() == metrics.registry.exposition()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f'http://{host}:{port}/')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_n_bucket():
+    """test for n_bucket
+    """
+    assert [n_bucket(n) for n in [0, 1, 8, 10, 11, 1000, 1001]] == ['1', '1', '10', '10', '100', '1000', '10000']
+
+
+def test_record():
+    """test that solves are labelled by whether a solution was found
+    """
+    metrics = SolverMetrics()
+    for n in [2, 4]:
+        e = create_engine('count', n=n)
+        metrics.solve(e, engine_name='count', n=n)
+    e = create_engine('v6', n=8, seed=0)
+    metrics.record(engine=e, engine_name='v6', n=8, duration_seconds=0.5, solved=False)
+
+    # a count of 0 is not a solution
+    assert metrics.finished.snapshot() == {('count', 'false'): 1, ('count', 'true'): 1, ('v6', 'false'): 1}
+    assert set(metrics.duration.snapshot()) == {('count', '10', 'false'), ('count', '10', 'true'), ('v6', '10', 'false')}
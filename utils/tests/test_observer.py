@@ -0,0 +1,93 @@
+from engine.minconflicts_engine_6 import MinConflictsEngine
+from models.model import SolveStatus
+from utils.observer import Observer, ProgressReporter
+import io
+import pytest
+
+
+class Recorder(Observer):
+    def __init__(self, stop_at: int = None, **kwargs):
+        super().__init__(**kwargs)
+        self.statuses = []
+        self.stop_at = stop_at
+
+    def on_progress(self, status):
+        self.statuses.append(status)
+        return self.stop_at is not None and status.step >= self.stop_at
+
+
+def status(step, conflicts, elapsed_seconds):
+    return SolveStatus(phase=SolveStatus.SEARCHING, n=8, placed_rows=8, step=step, max_steps=800, random_walks=0,
+                       elapsed_seconds=elapsed_seconds, conflicts=conflicts)
+
+
+def test_observe(monkeypatch):
+    """test for observe
+    """
+    # a step per millisecond
+    clock = iter(range(1000))
+    monkeypatch.setattr('utils.observer.time.time', lambda: next(clock) / 1000)
+
+    # every_steps only
+    o = Recorder(every_steps=10)
+    assert o.observe(status(step=0, conflicts=5, elapsed_seconds=0)) == 10
+    assert o.observe(status(step=10, conflicts=5, elapsed_seconds=0)) == 20
+
+    # the interval starts from 1 and grows up to every_steps with the measured rate
+    o = Recorder(every_steps=8, every_seconds=100)
+    steps = [0]
+    for _ in range(6):
+        steps.append(o.observe(status(step=steps[-1], conflicts=5, elapsed_seconds=0)))
+    assert steps == [0, 1, 3, 7, 15, 23, 31]
+
+    # and is bounded by every_seconds, which is half a step here
+    o = Recorder(every_steps=1000, every_seconds=0.0005)
+    steps = [0]
+    for _ in range(5):
+        steps.append(o.observe(status(step=steps[-1], conflicts=5, elapsed_seconds=0)))
+    assert steps == [0, 1, 2, 3, 4, 5]
+    assert o.steps_per_second == pytest.approx(1000)
+
+    # invalid arguments
+    with pytest.raises(ValueError):
+        Observer(every_steps=0)
+    with pytest.raises(ValueError):
+        Observer(every_seconds=0)
+
+
+def test_solve_with_observer():
+    """test that the engine calls the observer and stops on its request
+    """
+    e = MinConflictsEngine(n=300, seed=0)
+    o = Recorder(every_steps=5)
+    result = e.solve(observer=o)
+    assert result.is_solution()
+    assert [s.step for s in o.statuses[:-1]] == list(range(0, e.debug_steps, 5))
+    assert o.statuses[-1].phase == SolveStatus.SOLVED
+    assert o.statuses[-1].conflicts == 0
+
+    # stop early
+    e = MinConflictsEngine(n=3, seed=0)
+    o = Recorder(every_steps=5, stop_at=20)
+    result = e.solve(observer=o)
+    assert not result.is_solution()
+    assert result.steps == 20
+    assert o.statuses[-1].phase == SolveStatus.FAILED
+
+
+def test_progress_reporter():
+    """test for ProgressReporter
+    """
+    stream = io.StringIO()
+    p = ProgressReporter(stream=stream)
+    p.on_progress(status(step=0, conflicts=10, elapsed_seconds=1.0))
+    assert p.eta_seconds(status(step=0, conflicts=10, elapsed_seconds=1.0)) is None
+    # 4 conflicts per second
+    assert p.eta_seconds(status(step=50, conflicts=6, elapsed_seconds=2.0)) == 1.5
+    assert p.eta_seconds(status(step=50, conflicts=12, elapsed_seconds=2.0)) is None
+
+    p.finish(status(step=100, conflicts=0, elapsed_seconds=3.0))
+    lines = stream.getvalue().split('\r')
+    assert lines[-1].startswith('searching n=8 step=100/800')
+    assert 'conflicts=0 eta=0.0s' in lines[-1]
+    assert stream.getvalue().endswith('\n')
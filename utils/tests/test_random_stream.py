@@ -0,0 +1,60 @@
+from utils.random_stream import RandomStream
+import random
+import pickle
+import pytest
+
+
+def test_draws():
+    """test for random, randrange, randint, choice, shuffle and sample
+    """
+    r = RandomStream(seed=0, buffer_size=16)
+    for _ in range(100):
+        assert 0 <= r.random() < 1
+        assert 0 <= r.randrange(7) < 7
+        assert 3 <= r.randint(3, 5) <= 5
+        assert r.choice('abc') in 'abc'
+
+    # every value is drawn
+    assert set([r.randrange(5) for _ in range(200)]) == {0, 1, 2, 3, 4}
+
+    x = [i for i in range(50)]
+    r.shuffle(x)
+    assert sorted(x) == [i for i in range(50)]
+    assert x != [i for i in range(50)]
+
+    for k in [0, 3, 40, 50]:
+        s = r.sample(range(50), k)
+        assert len(s) == len(set(s)) == k
+    with pytest.raises(ValueError):
+        r.sample(range(5), 6)
+    with pytest.raises(ValueError):
+        RandomStream(buffer_size=0)
+
+
+def test_seed_and_state():
+    """test that the same seed or state gives the same stream
+    """
+    r1 = RandomStream(seed=1, buffer_size=8)
+    r2 = RandomStream(seed=1, buffer_size=8)
+    assert [r1.randrange(100) for _ in range(20)] == [r2.randrange(100) for _ in range(20)]
+
+    # restore in the middle of the buffers
+    r1.random()
+    state = pickle.loads(pickle.dumps(r1.getstate()))
+    expected = [(r1.randrange(100), r1.random()) for _ in range(20)]
+    r3 = RandomStream(seed=2, buffer_size=8)
+    r3.setstate(state)
+    assert [(r3.randrange(100), r3.random()) for _ in range(20)] == expected
+
+
+def test_byte_order():
+    """test that words are read as little-endian and floats are those of random, on any host
+    """
+    r = RandomStream(seed=2, buffer_size=4)
+    g = random.Random(2)
+    bits = g.getrandbits(128)
+    assert [r.randrange(2 ** 32) for _ in range(4)] == [(bits >> (32 * i)) & 0xffffffff for i in range(4)]
+
+    r = RandomStream(seed=3, buffer_size=4)
+    g = random.Random(3)
+    assert [r.random() for _ in range(6)] == [g.random() for _ in range(6)]
@@ -0,0 +1,87 @@
+from utils.regression import bootstrap_ratio, compare, format_report, load_results, percentile
+import math
+
+
+def write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def test_load_results(tmp_path):
+    """test for load_results
+    """
+    # case 1: CSV of benchmark.py
+    path = str(tmp_path / 'candidate.csv')
+    write(path, 'engine,n,run,duration_seconds,steps,solved,count\n'
+                'v6,8,0,0.5,10,True,\n'
+                'v6,8,1,0.7,12,True,\n'
+                'v5,8,0,0.9,,True,\n')
+    assert load_results(path=path) == {
+        ('v6', 8): {'duration_seconds': [0.5, 0.7], 'steps': [10, 12]},
+        ('v5', 8): {'duration_seconds': [0.9], 'steps': []},
+    }
+    assert list(load_results(path=path, engine='v5')) == [('v5', 8)]
+
+    # case 2: CSV in analysis/ without engine and n
+    path = str(tmp_path / 'old_result.csv')
+    write(path, 'duration_sec,steps\n1.5,3\n2.5,4\n')
+    assert load_results(path=path) == {
+        ('old_result', 0): {'duration_seconds': [1.5], 'steps': [3]},
+        ('old_result', 1): {'duration_seconds': [2.5], 'steps': [4]},
+    }
+    assert load_results(path=path, engine='v1', n=100) == {('v1', 100): {'duration_seconds': [1.5, 2.5], 'steps': [3, 4]}}
+
+
+def test_percentile():
+    """test for percentile
+    """
+    values = [float(i) for i in range(101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 90) == 90
+    assert percentile(values, 99) == 99
+    assert percentile([1, 2], 50) == 1.5
+    assert percentile([3], 99) == 3
+    assert percentile([math.inf, math.inf], 50) == math.inf
+
+
+def test_bootstrap_ratio():
+    """test for bootstrap_ratio
+    """
+    # reproducible and containing the ratio of medians
+    baseline = [1.0, 1.1, 0.9, 1.2, 1.0]
+    candidate = [2.0, 2.2, 1.8, 2.1, 2.0]
+    low, high = bootstrap_ratio(baseline=baseline, candidate=candidate)
+    assert (low, high) == bootstrap_ratio(baseline=baseline, candidate=candidate)
+    assert low <= 2.0 <= high
+    assert low > 1
+
+    # a single run on each side
+    assert bootstrap_ratio(baseline=[2], candidate=[3]) == (1.5, 1.5)
+
+
+def test_compare():
+    """test for compare
+    """
+    baseline = {
+        ('v6', 100): {'duration_seconds': [1.0, 1.1, 0.9, 1.0, 1.05], 'steps': [100, 110, 90, 100, 105]},
+        ('v6', 200): {'duration_seconds': [1.0, 1.1, 0.9, 1.0, 1.05], 'steps': []},
+        ('v5', 100): {'duration_seconds': [1.0], 'steps': [1]},
+    }
+    candidate = {
+        # twice as slow, with the same steps
+        ('v6', 100): {'duration_seconds': [2.0, 2.2, 1.8, 2.0, 2.1], 'steps': [100, 110, 90, 100, 105]},
+        # noisy but not slower on the median
+        ('v6', 200): {'duration_seconds': [0.5, 3.0, 1.0, 0.9, 1.1], 'steps': [5]},
+    }
+    comparisons = compare(baseline=baseline, candidate=candidate, threshold=0.1)
+    assert [(c.engine, c.n, c.metric, c.regressed) for c in comparisons] == [
+        ('v6', 100, 'duration_seconds', True),
+        ('v6', 100, 'steps', False),
+        ('v6', 200, 'duration_seconds', False),
+    ]
+    assert comparisons[0].ratio == 2.0
+    assert comparisons[0].candidate_median == 2.0
+
+    report = format_report(comparisons=comparisons)
+    assert report.count('REGRESSED') == 1
+    assert report.endswith('1 of 3 metrics regressed')
@@ -0,0 +1,41 @@
+from utils.restart import GeometricRestarts, LubyRestarts, RestartPolicy, StagnationRestarts, create_policy, luby
+import pytest
+
+
+def test_luby():
+    """test for luby
+    """
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+    with pytest.raises(ValueError):
+        luby(0)
+
+
+def test_policies():
+    """test for restart policies
+    """
+    p = LubyRestarts(unit=10)
+    assert [p.run_steps(run) for run in range(7)] == [10, 10, 20, 10, 10, 20, 40]
+    assert p.window is None
+
+    p = GeometricRestarts(first=10, factor=1.5)
+    assert [p.run_steps(run) for run in range(4)] == [10, 15, 22, 33]
+
+    p = StagnationRestarts(window=5)
+    assert p.window == 5
+    assert p.run_steps(100) > 10 ** 9
+
+    assert isinstance(create_policy(name='luby', steps=3), LubyRestarts)
+    assert create_policy(name='stagnation', steps=3).window == 3
+
+    # invalid arguments
+    with pytest.raises(ValueError):
+        LubyRestarts(unit=0)
+    with pytest.raises(ValueError):
+        GeometricRestarts(first=1, factor=0.5)
+    with pytest.raises(ValueError):
+        StagnationRestarts(window=0)
+    with pytest.raises(ValueError):
+        create_policy(name='never', steps=1)
+    # the base class only declares run_steps
+    with pytest.raises(TypeError):
+        RestartPolicy()
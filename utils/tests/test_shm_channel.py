@@ -0,0 +1,95 @@
+from models.model import PermutationBoard
+from utils.shm_channel import ResultChannel, orphan_names, solve_and_write
+from utils.util import validate, validate_columns
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import gc
+import numpy as np
+import pytest
+
+
+def test_permutation_board():
+    """test for PermutationBoard
+    """
+    b = PermutationBoard(n=4)
+    assert list(b.columns) == [-1, -1, -1, -1]
+    for row, column in enumerate([1, 3, 0, 2]):
+        b.set_queen(at=(row, column))
+    assert b.has_queen(at=(0, 1))
+    assert not b.has_queen(at=(0, 0))
+    assert validate(board=b)
+
+    # a row has one queen at most
+    b.set_queen(at=(0, 0))
+    assert list(b.columns) == [0, 3, 0, 2]
+    assert not validate(board=b)
+    b.remove_queen(at=(0, 1))
+    assert b.has_queen(at=(0, 0))
+    b.remove_queen(at=(0, 0))
+    assert list(b.columns) == [-1, 3, 0, 2]
+    b.reset_board()
+    assert list(b.columns) == [-1, -1, -1, -1]
+
+    # the given columns are used without copying
+    columns = np.array([1, 3, 0, 2], dtype=np.int32)
+    b = PermutationBoard(n=4, columns=columns)
+    b.set_queen(at=(0, 2))
+    assert columns[0] == 2
+
+    with pytest.raises(ValueError):
+        PermutationBoard(n=3, columns=columns)
+
+
+def test_result_channel():
+    """test for ResultChannel in a single process
+    """
+    with ResultChannel() as channel:
+        writer = channel.writer()
+        h1 = writer.write(columns=[1, 3, 0, 2], metadata={'solved': True})
+        h2 = writer.write(columns=np.arange(5))
+        assert h1.name != h2.name
+        assert h1.metadata == {'solved': True}
+        assert h2.metadata == {}
+
+        assert channel.columns(h1).tolist() == [1, 3, 0, 2]
+        # views of the same block share memory
+        channel.columns(h1)[0] = 2
+        assert channel.board(h1).columns.tolist() == [2, 3, 0, 2]
+
+        view = channel.columns(h1)
+        channel.release(h1)
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=h1.name)
+        # views taken before the release stay readable
+        gc.collect()
+        assert view.tolist() == [2, 3, 0, 2]
+
+        # blocks of other channels are rejected
+        with ResultChannel() as other:
+            with pytest.raises(ValueError):
+                other.columns(h2)
+        prefix = channel.prefix
+
+    # blocks never opened are also freed
+    assert orphan_names(prefix=prefix) == []
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=h2.name)
+
+
+def test_solve_and_write():
+    """test for solve_and_write on a process pool
+    """
+    with ResultChannel() as channel:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(solve_and_write, channel.writer(), engine_name, 8) for engine_name in ['v6', 'dfs', 'simple']]
+            handles = [future.result() for future in futures]
+            handles.append(executor.submit(solve_and_write, channel.writer(), 'dfs', 3).result())
+        # blocks outlive the workers
+        for handle in handles[:3]:
+            assert handle.metadata['solved']
+            assert validate_columns(channel.columns(handle).tolist())
+            assert validate(board=channel.board(handle))
+        assert not handles[3].metadata['solved']
+        assert channel.columns(handles[3]).tolist() == [-1, -1, -1]
+        prefix = channel.prefix
+    assert orphan_names(prefix=prefix) == []
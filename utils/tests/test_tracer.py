@@ -0,0 +1,79 @@
+from engine.minconflicts_engine_6 import MinConflictsEngine
+from utils.tracer import Tracer, default_interval
+import json
+import pytest
+
+
+def test_record_and_decimate():
+    """test for record and decimate
+    """
+    t = Tracer(interval=1, capacity=4)
+    for step in range(4):
+        t.record(step=step, conflicts=10 - step, conflicted_rows=5, random_walks=step, elapsed_seconds=0.5 * step)
+    assert t.columns()['step'] == [0, 1, 2, 3]
+    assert t.columns()['elapsed_seconds'] == [0.0, 0.5, 1.0, 1.5]
+
+    # buffer is full, so every other record is dropped and interval is doubled
+    t.record(step=4, conflicts=6, conflicted_rows=5, random_walks=4, elapsed_seconds=2.0)
+    assert t.interval == 2
+    assert t.columns()['step'] == [0, 2, 4]
+    assert t.columns()['conflicts'] == [10, 8, 6]
+    assert len(t.steps) == 4
+
+    # invalid arguments
+    with pytest.raises(ValueError):
+        Tracer(interval=0)
+
+
+def test_flush(tmp_path):
+    """test for flush
+    """
+    t = Tracer()
+    t.record(step=0, conflicts=3, conflicted_rows=2, random_walks=0, elapsed_seconds=0.25)
+    t.record(step=1, conflicts=0, conflicted_rows=0, random_walks=1, elapsed_seconds=0.5, noise=0.25)
+
+    path = str(tmp_path / 'trace.jsonl')
+    t.flush(path)
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert records[1] == {'step': 1, 'conflicts': 0, 'conflicted_rows': 0, 'random_walks': 1, 'elapsed_seconds': 0.5, 'noise': 0.25}
+
+    path = str(tmp_path / 'trace.csv')
+    t.flush(path)
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert lines == ['step,conflicts,conflicted_rows,random_walks,elapsed_seconds,noise', '0,3,2,0,0.25,0.0', '1,0,0,1,0.5,0.25']
+
+
+def test_solve_with_tracer():
+    """test that the engine records its trajectory
+    """
+    e = MinConflictsEngine(n=50)
+    t = Tracer(interval=2)
+    e.solve(tracer=t)
+    columns = t.columns()
+
+    # the first record is taken right after initialization, and the last one when solved
+    assert columns['step'][0] == 0
+    assert columns['step'][-1] == e.debug_steps
+    assert columns['conflicts'][-1] == 0
+    assert columns['conflicted_rows'][-1] == 0
+    assert columns['elapsed_seconds'] == sorted(columns['elapsed_seconds'])
+    assert set(columns['noise']) == {0.0}
+
+    # the trajectory of the adaptive noise is recorded
+    e = MinConflictsEngine(n=8, seed=0, adaptive_noise=True)
+    t = Tracer(interval=1)
+    e.solve(tracer=t)
+    columns = t.columns()
+    assert columns['noise'][0] == 0
+    assert all(0 <= noise <= e.max_noise for noise in columns['noise'])
+
+
+def test_default_interval():
+    """test for default_interval
+    """
+    assert default_interval(n=0) == 1
+    assert default_interval(n=8) == 1
+    assert default_interval(n=10 ** 6) == 10 ** 4
+    assert default_interval(n=10 ** 6, cost_per_step=10) == 10 ** 5
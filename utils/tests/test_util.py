@@ -1,5 +1,5 @@
 from models.model import Board
-from utils.util import is_collided, validate
+from utils.util import is_collided, validate, validate_columns
 
 
 def test_is_collided():
@@ -37,3 +37,20 @@ def test_validate():
     b.set_queen(at=(1, 2))
     b.set_queen(at=(2, 1))
     assert not validate(board=b)
+
+
+def test_validate_columns():
+    """test for validate_columns
+    """
+    assert validate_columns([])
+    assert validate_columns([0])
+    assert validate_columns([1, 3, 0, 2])
+    assert validate_columns([0, 4, 7, 5, 2, 6, 1, 3])
+
+    # same column
+    assert not validate_columns([1, 3, 1, 2])
+    # same diagonal
+    assert not validate_columns([0, 1])
+    assert not validate_columns([1, 0])
+    # out of the board
+    assert not validate_columns([1, 3, 0, 4])
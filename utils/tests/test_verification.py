@@ -0,0 +1,106 @@
+from engine.registry import COMPLETE, COUNT, FIRST
+from utils.verification import Case, CaseResult, check_result, generate_cases, run_case, shrink, verify
+import time
+
+
+class FakeEngine():
+    """engine that returns the given columns as its solution
+    """
+
+    def __init__(self, columns, solution_count=None):
+        self.columns = columns
+        self.solution_count = solution_count
+
+    def has_solution(self):
+        return len(self.columns) != 0
+
+
+def test_run_case():
+    """test for run_case
+    """
+    for engine_name in ['v6', 'dfs', 'count']:
+        for n in [1, 2, 3, 8]:
+            result = run_case(Case(engine_name=engine_name, n=n, seed=0))
+            assert result.status == CaseResult.OK, result.detail
+            assert not result.failed()
+
+
+def test_check_result():
+    """test for check_result
+    """
+    # a valid solution
+    assert check_result(engine=FakeEngine(columns=[1, 3, 0, 2]), boards=None, n=4, modes=(FIRST,))[0] == CaseResult.OK
+    # collided queens
+    assert check_result(engine=FakeEngine(columns=[0, 1, 2, 3]), boards=None, n=4, modes=(FIRST,))[0] == CaseResult.WRONG
+    # a solution of the wrong size
+    assert check_result(engine=FakeEngine(columns=[1, 3, 0]), boards=None, n=4, modes=(FIRST,))[0] == CaseResult.WRONG
+    # a solution claimed for n without solutions
+    assert check_result(engine=FakeEngine(columns=[0, 2]), boards=None, n=2, modes=(FIRST,))[0] == CaseResult.WRONG
+    # no solution found
+    assert check_result(engine=FakeEngine(columns=[]), boards=None, n=4, modes=(FIRST,))[0] == CaseResult.UNSOLVED
+    assert check_result(engine=FakeEngine(columns=[]), boards=None, n=3, modes=(FIRST,))[0] == CaseResult.OK
+    # complete engines never miss a solution
+    assert check_result(engine=FakeEngine(columns=[]), boards=None, n=4, modes=(FIRST, COMPLETE))[0] == CaseResult.WRONG
+    assert check_result(engine=FakeEngine(columns=[]), boards=None, n=3, modes=(FIRST, COMPLETE))[0] == CaseResult.OK
+    # counts
+    assert check_result(engine=FakeEngine(columns=[], solution_count=92), boards=None, n=8, modes=(COUNT,))[0] == CaseResult.OK
+    assert check_result(engine=FakeEngine(columns=[], solution_count=91), boards=None, n=8, modes=(COUNT,))[0] == CaseResult.WRONG
+
+
+def test_generate_cases():
+    """test for generate_cases
+    """
+    cases = generate_cases(engine_names=['simple', 'v6'], cases_per_engine=5, seed=0)
+    assert cases == generate_cases(engine_names=['simple', 'v6'], cases_per_engine=5, seed=0)
+    simple_cases = [case for case in cases if case.engine_name == 'simple']
+    v6_cases = [case for case in cases if case.engine_name == 'v6']
+    assert len(simple_cases) == 8 + 5
+    assert len(v6_cases) == 10 + 5
+    # small n are always included, and n is up to max_n
+    assert [case.n for case in simple_cases[:8]] == list(range(1, 9))
+    assert all(1 <= case.n <= 8 for case in simple_cases)
+
+
+def test_shrink():
+    """test for shrink
+    """
+    # case 1: both n and seed are shrunk
+    fails = lambda case: case.n >= 5 and case.seed >= 3
+    assert shrink(case=Case(engine_name='v6', n=40, seed=70), fails=fails) == Case(engine_name='v6', n=5, seed=3)
+
+    # case 2: the seed is kept if smaller ones pass
+    fails = lambda case: case.seed == 70
+    assert shrink(case=Case(engine_name='v6', n=40, seed=70), fails=fails) == Case(engine_name='v6', n=1, seed=70)
+
+    # case 3: checked by chunks, the first failing candidate is still taken, and later chunks are not checked
+    checked = []
+
+    def fails(case):
+        checked.append(case)
+        return case.n >= 5 and case.seed >= 3
+
+    map_fn = lambda f, cases: [f(case) for case in cases]
+    shrunk = shrink(case=Case(engine_name='v6', n=40, seed=70), fails=fails, map_fn=map_fn, chunk_size=4)
+    assert shrunk == Case(engine_name='v6', n=5, seed=3)
+    assert len(checked) == 8 + 4
+
+    # nothing is checked after the deadline
+    checked.clear()
+    shrunk = shrink(case=Case(engine_name='v6', n=40, seed=70), fails=fails, deadline=time.time() - 1)
+    assert shrunk == Case(engine_name='v6', n=40, seed=70)
+    assert checked == []
+
+
+def test_verify():
+    """test for verify
+    """
+    cases = generate_cases(engine_names=['v6', 'count'], cases_per_engine=2, seed=0)
+    report = verify(cases=cases, max_workers=2)
+    assert len(report['results']) == len(cases)
+    assert report['failures'] == []
+    assert report['skipped'] == []
+
+    # all cases not started are skipped after the time budget
+    report = verify(cases=cases, max_workers=1, time_budget=0)
+    assert len(report['results']) + len(report['skipped']) == len(cases)
+    assert len(report['skipped']) != 0
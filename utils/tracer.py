@@ -0,0 +1,120 @@
+from array import array
+from typing import Dict, List, Union
+import json
+
+
+def default_interval(n: int, cost_per_step: int = 100) -> int:
+    """get the interval of tracing a board of n, which keeps tracing O(1) per step on average
+
+    each record counts conflicted rows in O(n), so recording every n / cost_per_step steps adds about
+    cost_per_step operations to each step. the tracer decimates the records if the run is long
+
+    Args:
+        n (int): length of chess board
+        cost_per_step (int): the average number of operations added to each step
+    Returns:
+        (int): interval
+    """
+    return max(1, n // cost_per_step)
+
+
+class Tracer():
+    """record the trajectory of a solve every `interval` steps
+
+    Records are stored in preallocated typed arrays so that recording does not allocate
+    Python objects in the step loop. When the buffer becomes full, every other record is
+    dropped and the interval is doubled, so a long run keeps an evenly sampled trajectory
+    without growing the buffer.
+    """
+    FIELDS = ('step', 'conflicts', 'conflicted_rows', 'random_walks', 'elapsed_seconds', 'noise')
+
+    def __init__(self, interval: int = 1, capacity: int = 4096) -> None:
+        """initialize instance
+
+        Args:
+            interval (int): record every `interval` steps
+            capacity (int): the maximum number of records kept in the buffer
+        """
+        if interval < 1:
+            raise ValueError(f'interval must be positive: {interval}')
+        if capacity < 2:
+            raise ValueError(f'capacity must be larger than 1: {capacity}')
+        self.interval: int = interval
+        self.capacity: int = capacity
+        self.size: int = 0
+
+        # preallocated buffers, one for each field
+        self.steps: array = array('q', bytes(8 * capacity))
+        self.conflicts: array = array('q', bytes(8 * capacity))
+        self.conflicted_rows: array = array('q', bytes(8 * capacity))
+        self.random_walks: array = array('q', bytes(8 * capacity))
+        self.elapsed_seconds: array = array('d', bytes(8 * capacity))
+        self.noise: array = array('d', bytes(8 * capacity))
+
+    def record(self, step: int, conflicts: int, conflicted_rows: int, random_walks: int, elapsed_seconds: float,
+               noise: float = 0.0) -> None:
+        """append a record
+
+        Args:
+            step (int): the current step
+            conflicts (int): the total number of conflicts on the board
+            conflicted_rows (int): the number of rows whose queen has conflicts
+            random_walks (int): the number of random moves made so far
+            elapsed_seconds (float): seconds elapsed from the start of the solve
+            noise (float): the current probability of a random move
+        """
+        if self.size == self.capacity:
+            self.decimate()
+        i = self.size
+        self.steps[i] = step
+        self.conflicts[i] = conflicts
+        self.conflicted_rows[i] = conflicted_rows
+        self.random_walks[i] = random_walks
+        self.elapsed_seconds[i] = elapsed_seconds
+        self.noise[i] = noise
+        self.size = i + 1
+
+    def decimate(self) -> None:
+        """drop every other record and double the interval to make room in the buffer
+        """
+        kept = (self.size + 1) // 2
+        for buffer in self.buffers():
+            buffer[:kept] = buffer[0:self.size:2]
+        self.size = kept
+        self.interval *= 2
+
+    def buffers(self) -> List[array]:
+        """get buffers in the order of FIELDS
+
+        Returns:
+            (List[array]): buffers
+        """
+        return [self.steps, self.conflicts, self.conflicted_rows, self.random_walks, self.elapsed_seconds, self.noise]
+
+    def columns(self) -> Dict[str, List[Union[int, float]]]:
+        """get recorded values column by column
+
+        Returns:
+            (Dict[str, List[Union[int, float]]]): {field: values}
+        """
+        return {field: buffer[:self.size].tolist() for field, buffer in zip(Tracer.FIELDS, self.buffers())}
+
+    def flush(self, path: str) -> None:
+        """write records to the file
+
+        The format is decided by the extension: `.jsonl` for JSON lines, otherwise CSV,
+        which can be read by `pandas.read_csv` in the notebook.
+
+        Args:
+            path (str): path of the output file
+        """
+        columns = self.columns()
+        rows = zip(*[columns[field] for field in Tracer.FIELDS])
+        with open(path, 'w') as f:
+            if path.endswith('.jsonl'):
+                for row in rows:
+                    f.write(json.dumps(dict(zip(Tracer.FIELDS, row))) + '\n')
+            else:
+                f.write(','.join(Tracer.FIELDS) + '\n')
+                for row in rows:
+                    f.write(','.join([str(v) for v in row]) + '\n')
@@ -1,6 +1,6 @@
 import datetime
 from models.model import Board
-from typing import Tuple
+from typing import Any, List, Sequence, Tuple
 from functools import wraps
 
 # make True if measure how long each function takes time
@@ -22,6 +22,52 @@ def validate(board: Board) -> bool:
     return True
 
 
+def validate_columns(columns: Sequence[int]) -> bool:
+    """validate result given as the column of the queen on each row in O(n)
+
+    Args:
+        columns (Sequence[int]): columns[row] is the column where the queen is placed
+    Returns:
+        (bool): True if it's valid else False
+    """
+    n = len(columns)
+    used_columns = bytearray(n)
+    used_diag_up = bytearray(2 * n)
+    used_diag_down = bytearray(2 * n)
+    for row, column in enumerate(columns):
+        if not 0 <= column < n:
+            return False
+        diag_up = row + column
+        diag_down = row - column + n
+        if used_columns[column] or used_diag_up[diag_up] or used_diag_down[diag_down]:
+            return False
+        used_columns[column] = 1
+        used_diag_up[diag_up] = 1
+        used_diag_down[diag_down] = 1
+    return True
+
+
+def extract_columns(engine: Any) -> List[int]:
+    """get the column of the queen on each row from a solved engine
+
+    Args:
+        engine (Any): engine after solve()
+    Returns:
+        columns (List[int]): columns[row] is the column where the queen is placed
+    """
+    if hasattr(engine, 'queen_is'):
+        return [engine.queen_is[row] for row in range(engine.n)]
+    if hasattr(engine, 'current_state'):
+        return [engine.current_state[row].index(True) for row in range(engine.n)]
+    if hasattr(engine, 'columns'):
+        return list(engine.columns)
+    # engines that return boards only
+    if len(engine.results) == 0:
+        return []
+    board = engine.results[0]
+    return [next(column for column in range(engine.n) if board.has_queen(at=(row, column))) for row in range(engine.n)]
+
+
 def is_collided(at: Tuple[int, int], board: Board) -> bool:
     """check collision for the given queen
     Args:
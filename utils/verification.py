@@ -0,0 +1,217 @@
+from engine.registry import COMPLETE, COUNT, SEEDED, create_engine, get_engine_info
+from models.model import KNOWN_COUNTS
+from utils.util import extract_columns, validate_columns
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import os
+import random
+import time
+
+
+class Case(NamedTuple):
+    """a pair of (n, seed) solved by an engine
+    """
+    engine_name: str
+    n: int
+    seed: int
+
+
+class CaseResult(NamedTuple):
+    """result of a case
+    """
+    OK = 'ok'
+    # the engine gave up without a solution, which is allowed for local search but not for complete engines
+    UNSOLVED = 'unsolved'
+    # the engine returned a wrong answer
+    WRONG = 'wrong'
+    # the engine raised an exception
+    ERROR = 'error'
+
+    case: Case
+    # one of the statuses above
+    status: str
+    # why the status is not ok
+    detail: str
+    duration_seconds: float
+
+    def failed(self) -> bool:
+        """check if the engine is incorrect on the case
+
+        Returns:
+            (bool): True if the status is wrong or error
+        """
+        return self.status in [CaseResult.WRONG, CaseResult.ERROR]
+
+
+def run_case(case: Case) -> CaseResult:
+    """solve the case and check the result
+
+    Solutions are checked by the O(n) validator, not by the engine itself.
+    Counts are checked against KNOWN_COUNTS.
+
+    Args:
+        case (Case): case
+    Returns:
+        (CaseResult): result
+    """
+    info = get_engine_info(case.engine_name)
+    start_time = time.time()
+    try:
+        # engines without their own random source use the global one
+        random.seed(case.seed)
+        kwargs = {'seed': case.seed} if SEEDED in info.modes else {}
+        e = create_engine(case.engine_name, n=case.n, **kwargs)
+        boards = e.solve()
+        status, detail = check_result(engine=e, boards=boards, n=case.n, modes=info.modes)
+    except Exception as ex:
+        status, detail = CaseResult.ERROR, f'{type(ex).__name__}: {ex}'
+    return CaseResult(case=case, status=status, detail=detail, duration_seconds=time.time() - start_time)
+
+
+def check_result(engine: Any, boards: Any, n: int, modes: Tuple[str, ...]) -> Tuple[str, str]:
+    """check the result of the solved engine
+
+    Args:
+        engine (Any): engine after solve()
+        boards (Any): return value of solve()
+        n (int): length of chess board
+        modes (Tuple[str, ...]): modes of the engine
+    Returns:
+        status (str): status of CaseResult
+        detail (str): why the status is not ok
+    """
+    if COUNT in modes:
+        expected = KNOWN_COUNTS[n] if n < len(KNOWN_COUNTS) else None
+        if expected is not None and engine.solution_count != expected:
+            return CaseResult.WRONG, f'counted {engine.solution_count} solutions, expected {expected}'
+        return CaseResult.OK, ''
+
+    has_solutions = n >= len(KNOWN_COUNTS) or KNOWN_COUNTS[n] != 0
+    claimed = engine.has_solution() if hasattr(engine, 'has_solution') else bool(boards)
+    columns = extract_columns(engine) if claimed else []
+    if claimed and not has_solutions:
+        return CaseResult.WRONG, 'claimed a solution though there is none'
+    if claimed and (len(columns) != n or not validate_columns(columns)):
+        return CaseResult.WRONG, f'claimed an invalid solution {columns}'
+    if not claimed and has_solutions:
+        if COMPLETE in modes:
+            return CaseResult.WRONG, 'no solution found by a complete search'
+        return CaseResult.UNSOLVED, 'no solution found'
+    return CaseResult.OK, ''
+
+
+def generate_cases(engine_names: List[str], cases_per_engine: int, seed: int = 0) -> List[Case]:
+    """generate random cases for each engine
+
+    Small n, where edge cases gather, are always included. The others are random n up to max_n of the engine.
+
+    Args:
+        engine_names (List[str]): engine names
+        cases_per_engine (int): the number of random cases for each engine
+        seed (int): seed to generate cases
+    Returns:
+        (List[Case]): cases
+    """
+    r = random.Random(seed)
+    cases = []
+    for engine_name in engine_names:
+        max_n = get_engine_info(engine_name).max_n
+        for n in range(1, min(max_n, 10) + 1):
+            cases.append(Case(engine_name=engine_name, n=n, seed=r.randrange(1 << 31)))
+        for _ in range(cases_per_engine):
+            cases.append(Case(engine_name=engine_name, n=r.randint(1, max_n), seed=r.randrange(1 << 31)))
+    return cases
+
+
+def case_fails(case: Case) -> bool:
+    """check if the engine is incorrect on the case, which can be sent to worker processes
+
+    Args:
+        case (Case): case
+    Returns:
+        (bool): True if the case fails
+    """
+    return run_case(case).failed()
+
+
+def first_failing(candidates: List[Case], fails: Callable[[Case], bool], map_fn: Callable[..., Iterable[bool]],
+                  chunk_size: int, deadline: float = None) -> Optional[Case]:
+    """find the first failing candidate, checking chunk_size candidates at once
+
+    Args:
+        candidates (List[Case]): cases in the order of preference
+        fails (Callable[[Case], bool]): function that checks if the case fails
+        map_fn (Callable[..., Iterable[bool]]): map to run the checks of a chunk, such as executor.map
+        chunk_size (int): the number of candidates checked at once
+        deadline (float): time.time() after which no more chunk is started
+    Returns:
+        (Optional[Case]): the first failing candidate, or None
+    """
+    for i in range(0, len(candidates), chunk_size):
+        if deadline is not None and time.time() > deadline:
+            return None
+        chunk = candidates[i:i + chunk_size]
+        for candidate, failed in zip(chunk, map_fn(fails, chunk)):
+            if failed:
+                return candidate
+    return None
+
+
+def shrink(case: Case, fails: Callable[[Case], bool], max_seeds: int = 100,
+           map_fn: Callable[..., Iterable[bool]] = map, chunk_size: int = 1, deadline: float = None) -> Case:
+    """find a smaller case that still fails
+
+    n is minimized first with the same seed, and then the seed is minimized with the minimal n.
+    Candidates are checked chunk_size at a time by map_fn, so they run in parallel with executor.map,
+    and the chunks after the first failing one are not checked. After the deadline, the smallest case found so far
+    is returned.
+
+    Args:
+        case (Case): failing case
+        fails (Callable[[Case], bool]): function that checks if the case fails
+        max_seeds (int): the maximum number of seeds tried
+        map_fn (Callable[..., Iterable[bool]]): map to run the checks. Default the builtin map, one by one
+        chunk_size (int): the number of candidates checked at once
+        deadline (float): time.time() after which no more check is started
+    Returns:
+        (Case): the minimal failing case found
+    """
+    smaller = first_failing(candidates=[case._replace(n=n) for n in range(1, case.n)], fails=fails, map_fn=map_fn,
+                            chunk_size=chunk_size, deadline=deadline)
+    case = smaller or case
+    smaller = first_failing(candidates=[case._replace(seed=seed) for seed in range(min(case.seed, max_seeds))],
+                            fails=fails, map_fn=map_fn, chunk_size=chunk_size, deadline=deadline)
+    return smaller or case
+
+
+def verify(cases: List[Case], max_workers: int = None, time_budget: float = None) -> Dict[str, Any]:
+    """run cases in parallel and shrink failing ones
+
+    Args:
+        cases (List[Case]): cases
+        max_workers (int): the number of worker processes. Default the number of CPUs
+        time_budget (float): seconds after which cases not started yet are skipped, and shrinking stops
+    Returns:
+        (Dict[str, Any]): results, failures (pairs of the failing result and the shrunk case) and skipped cases
+    """
+    deadline = time.time() + time_budget if time_budget is not None else None
+    results = []
+    skipped = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_case, case): case for case in cases}
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            results.append(future.result())
+            # cases already running are finished, and the others are skipped
+            if deadline is not None and time.time() > deadline and len(skipped) == 0:
+                skipped = [case for f, case in futures.items() if f.cancel()]
+
+        # shrink failing cases also in parallel, checking as many candidates at once as the workers
+        failures = []
+        chunk_size = max_workers or os.cpu_count() or 1
+        for result in [result for result in results if result.failed()]:
+            shrunk = shrink(case=result.case, fails=case_fails, map_fn=executor.map, chunk_size=chunk_size,
+                            deadline=deadline)
+            failures.append((result, shrunk))
+    return {'results': results, 'failures': failures, 'skipped': skipped}
@@ -0,0 +1,28 @@
+from engine.registry import get_engine_names
+from utils.verification import generate_cases, verify
+import argparse
+import sys
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='verify engines on random (n, seed) pairs')
+    parser.add_argument('--engine', nargs='+', default=get_engine_names(), help='engine names')
+    parser.add_argument('--cases', type=int, default=20, help='the number of random cases for each engine')
+    parser.add_argument('--seed', type=int, default=0, help='seed to generate cases')
+    parser.add_argument('--workers', type=int, default=None, help='the number of worker processes')
+    parser.add_argument('--time-budget', type=float, default=None, help='seconds after which remaining cases are skipped')
+    args = parser.parse_args()
+
+    cases = generate_cases(engine_names=args.engine, cases_per_engine=args.cases, seed=args.seed)
+    report = verify(cases=cases, max_workers=args.workers, time_budget=args.time_budget)
+
+    for engine_name in args.engine:
+        results = [r for r in report['results'] if r.case.engine_name == engine_name]
+        statuses = {}
+        for r in results:
+            statuses[r.status] = statuses.get(r.status, 0) + 1
+        duration_seconds = max([r.duration_seconds for r in results], default=0)
+        print(f'{engine_name} cases: {len(results)} {statuses} max_duration_seconds: {duration_seconds:.3f}')
+    for result, shrunk in report['failures']:
+        print(f'FAILED {result.case} {result.status}: {result.detail} -> minimal case: {shrunk}')
+    print(f'skipped: {len(report["skipped"])}')
+    sys.exit(1 if len(report['failures']) != 0 else 0)